@@ -0,0 +1,213 @@
+from concurrent.futures import ProcessPoolExecutor
+import glob
+import json
+import os
+import re
+import time
+from typing import Any, Dict, List
+
+from api_generator import CORE_MANIFEST_FILE, CORE_PACKAGE, KotlinCodeGenerator, ProfileHooks, render_dto_class, write_file_atomically
+from api_ir import ContractIR, GeneratorOptions, is_builtin_type
+from api_spec import iter_features, load_spec
+from api_templates import TEMPLATES
+from kotlin_dtos import Shape, TypeIndex
+from kotlin_templates import TemplateRegistry
+
+
+def derive_feature_name(contract_path: str) -> str:
+    """Derive a feature name from a contract file name, e.g. user-profile_contract.yaml -> UserProfile"""
+    stem = os.path.splitext(os.path.basename(contract_path))[0]
+    words = [word for word in re.split(r"[^0-9A-Za-z]+", stem) if word]
+    if len(words) > 1 and words[-1].lower() == "contract":
+        words.pop()
+    return "".join(word[0].upper() + word[1:] for word in words) or "Contract"
+
+
+def find_contracts(pattern: str) -> List[str]:
+    """Expand a directory or glob pattern into a sorted list of YAML contracts"""
+    if os.path.isdir(pattern):
+        pattern = os.path.join(pattern, "*.y*ml")
+    return sorted(
+        path for path in glob.glob(pattern, recursive=True)
+        if path.endswith((".yaml", ".yml")) and os.path.isfile(path)
+    )
+
+
+def contract_root(pattern: str) -> str:
+    """Directory a --batch directory or glob pattern is anchored at, e.g. contracts/**/*.yaml -> contracts"""
+    if os.path.isdir(pattern):
+        return pattern
+    parts = []
+    for part in re.split(r"[\\/]", pattern)[:-1]:
+        if glob.has_magic(part):
+            break
+        parts.append(part)
+    return os.sep.join(parts) or "."
+
+
+def contract_output_dirs(contract_paths: List[str], output_dir: str, root: str = None) -> List[str]:
+    """Output directory of each contract: its path below root without the extension.
+    
+    root defaults to the deepest directory holding every contract. Two
+    contracts mapping to one directory (user.yaml next to user.yml) would
+    overwrite each other's files and manifest, so that raises ValueError.
+    """
+    if not contract_paths:
+        return []
+    if root is None:
+        root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in contract_paths])
+    output_dirs = [
+        os.path.join(output_dir, os.path.splitext(os.path.relpath(os.path.abspath(path), os.path.abspath(root)))[0])
+        for path in contract_paths
+    ]
+    claimed = {}
+    for path, contract_output in zip(contract_paths, output_dirs):
+        if contract_output in claimed:
+            raise ValueError(f"{claimed[contract_output]} and {path} would both generate into {contract_output}")
+        claimed[contract_output] = path
+    return output_dirs
+
+
+def generate_contract(contract_path: str, feature_name: str, output_dir: str, force: bool = False,
+                      cache_dir: str = None, profile: bool = False,
+                      options: GeneratorOptions = None, template_dir: str = None,
+                      shared_types: Dict[Shape, str] = None) -> Dict[str, Any]:
+    """Generate one contract and summarize the outcome; runs inside batch workers"""
+    summary = {"contract": contract_path, "feature": feature_name, "output": output_dir, "error": None}
+    hooks = ProfileHooks() if profile else None
+    start = time.perf_counter()
+    try:
+        with open(contract_path, "r") as file:
+            yaml_content = file.read()
+        templates = TemplateRegistry(TEMPLATES, template_dir)
+        generator = KotlinCodeGenerator(yaml_content, feature_name, cache_dir, hooks, options, templates, shared_types)
+        changes = generator.generate_all(output_dir, force=force)["changes"]
+        summary.update({kind: len(files) for kind, files in changes.items()})
+    except Exception as e:
+        summary["error"] = f"{type(e).__name__}: {e}"
+    summary["seconds"] = round(time.perf_counter() - start, 4)
+    if hooks:
+        summary["profile"] = hooks.report()
+    return summary
+
+
+def generate_batch(contract_paths: List[str], output_dir: str, workers: int = None, force: bool = False,
+                   cache_dir: str = None, profile: bool = False,
+                   options: GeneratorOptions = None, template_dir: str = None,
+                   shared_types: Dict[Shape, str] = None, root: str = None) -> Dict[str, Any]:
+    """Generate many contracts across a process pool, one output directory per contract.
+    
+    Each contract generates into its path below root (see contract_output_dirs),
+    so contracts sharing a file name in different directories stay apart.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = [
+        (path, derive_feature_name(path), contract_output, force, cache_dir, profile, options, template_dir, shared_types)
+        for path, contract_output in zip(contract_paths, contract_output_dirs(contract_paths, output_dir, root))
+    ]
+    
+    start = time.perf_counter()
+    if workers == 1 or len(jobs) <= 1:
+        results = [generate_contract(*job) for job in jobs]
+    else:
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(generate_contract, *zip(*jobs), chunksize=chunksize))
+    
+    totals = {kind: sum(result.get(kind, 0) for result in results) for kind in ("added", "changed", "skipped", "removed")}
+    summary = {
+        "contracts": len(results),
+        "failed": sum(1 for result in results if result["error"]),
+        "workers": workers,
+        "seconds": round(time.perf_counter() - start, 4),
+        "totals": totals,
+        "results": results
+    }
+    if profile:
+        summary["profile"] = merge_profiles([result["profile"] for result in results if "profile" in result])
+    return summary
+
+
+def contract_shapes(contract_path: str, cache_dir: str = None) -> List[tuple]:
+    """(shape, class name) of every DTO class a contract generates on its own.
+    
+    Shapes with a property typed by a nested class of the contract are left out,
+    a core class could not refer to it.
+    """
+    if contract_path.endswith(".jsonl"):
+        spec = {"features": list(iter_features(contract_path))}
+    else:
+        with open(contract_path, "r") as file:
+            spec = load_spec(file.read(), cache_dir)
+    return [(shape, name) for shape, name in ContractIR(spec, derive_feature_name(contract_path)).dto_table.classes.items()
+            if all(is_builtin_type(kotlin_type) for _, kotlin_type in shape)]
+
+
+def update_type_index(index_path: str, contract_paths: List[str], core_dir: str, cache_dir: str = None,
+                      templates: TemplateRegistry = None, prune: bool = True) -> Dict[Shape, str]:
+    """Bring the type index up to date, regenerate the shared core DTOs and return them by shape"""
+    index = TypeIndex.load(index_path)
+    changed = index.update(contract_paths, lambda path: contract_shapes(path, cache_dir), prune)
+    if changed or not os.path.exists(index_path):
+        index.save()
+    shared = index.shared()
+    changes = write_core_dtos(shared, core_dir, templates or TemplateRegistry(TEMPLATES))
+    print(f"Type index: {len(index.contracts)} contracts, {len(changed)} re-read, {len(shared)} shared DTOs, "
+          + ", ".join(f"{len(files)} {kind}" for kind, files in changes.items()) + f" in {core_dir}")
+    return {shape: f"{CORE_PACKAGE}.dtos.{name}" for shape, name in shared.items()}
+
+
+def write_core_dtos(shared: Dict[Shape, str], core_dir: str, templates: TemplateRegistry) -> Dict[str, List[str]]:
+    """Write one class per shared shape into core_dir/dtos and remove classes no longer shared.
+    
+    Only files listed in the CORE_MANIFEST_FILE of an earlier run are removed,
+    anything else in the directory was not written from the type index.
+    """
+    dto_dir = os.path.join(core_dir, "dtos")
+    os.makedirs(dto_dir, exist_ok=True)
+    manifest_path = os.path.join(dto_dir, CORE_MANIFEST_FILE)
+    try:
+        with open(manifest_path, "r") as f:
+            previous = json.load(f).get("files", [])
+    except (OSError, ValueError):
+        previous = []
+    changes = {"added": [], "changed": [], "skipped": [], "removed": []}
+    current = []
+    for shape, name in shared.items():
+        file_name = f"{name}.kt"
+        file_path = os.path.join(dto_dir, file_name)
+        current.append(file_name)
+        content = render_dto_class(templates, CORE_PACKAGE, "Shared by several contracts, generated from the type index",
+                                   name, list(shape))
+        if os.path.exists(file_path):
+            with open(file_path, "r") as f:
+                if f.read() == content:
+                    changes["skipped"].append(file_path)
+                    continue
+            changes["changed"].append(file_path)
+        else:
+            changes["added"].append(file_path)
+        write_file_atomically(file_path, content)
+    for file_name in sorted(set(previous) - set(current)):
+        file_path = os.path.join(dto_dir, os.path.basename(file_name))
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:
+            continue
+        changes["removed"].append(file_path)
+    if sorted(current) != sorted(previous) or not os.path.exists(manifest_path):
+        write_file_atomically(manifest_path, json.dumps({"files": sorted(current)}, indent=2) + "\n")
+    return changes
+
+
+def merge_profiles(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Sum ProfileHooks reports of several contracts into one"""
+    merged = {"stages": {}, "counters": {}}
+    for report in reports:
+        for key, value in report.items():
+            if isinstance(value, dict):
+                for name, amount in value.items():
+                    merged[key][name] = round(merged[key].get(name, 0) + amount, 6)
+            else:
+                merged[key] = round(merged.get(key, 0) + value, 6)
+    return merged
@@ -0,0 +1,873 @@
+from contextlib import contextmanager
+import glob
+import hashlib
+import json
+import os
+import re
+import time
+from typing import Any, Callable, Dict, Iterable, List
+
+from api_ir import DEFAULT_VALIDATOR_ENTRIES, ContractIR, DtoIR, FeatureIR, GeneratorOptions, kotlin_type, ParamIR, parse_network
+from api_spec import load_spec
+from api_templates import TEMPLATES
+from kotlin_dtos import dto_base_name, enum_constant, property_name, Shape
+from kotlin_templates import generation_timestamp, TemplateRegistry
+
+
+# Bump whenever the rendered output changes for the same contract, so stale
+# manifests stop matching and every file is rendered again.
+GENERATOR_VERSION = "8"
+# One manifest per feature, so several features can share an output directory
+MANIFEST_FILE = ".codegen-manifest.{feature}.json"
+# Package of the DTOs shared by several contracts of a --type-index workspace
+CORE_PACKAGE = "com.example.api.core"
+# Lists the core DTO files written from the type index, the only ones ever removed from core/dtos
+CORE_MANIFEST_FILE = ".codegen-manifest.core.json"
+
+
+class GenerationHooks:
+    """Instrumentation callbacks of a generator; the base class ignores everything"""
+    
+    def stage_finished(self, stage: str, seconds: float):
+        pass
+    
+    def file_written(self, file_path: str, size: int, seconds: float):
+        pass
+    
+    def io_finished(self, seconds: float):
+        pass
+    
+    def count(self, name: str, amount: int = 1):
+        pass
+
+
+class ProfileHooks(GenerationHooks):
+    """Collects stage timings and counters into a JSON-serializable report"""
+    
+    # Stages that only parse or compile the contract, reported apart from rendering
+    LOAD_STAGES = ("load", "compile")
+    
+    def __init__(self):
+        self.stages = {}
+        self.counters = {}
+        self.files_written = 0
+        self.bytes_written = 0
+        self.io_seconds = 0.0
+    
+    def stage_finished(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds
+    
+    def file_written(self, file_path: str, size: int, seconds: float):
+        self.files_written += 1
+        self.bytes_written += size
+        self.io_seconds += seconds
+    
+    def io_finished(self, seconds: float):
+        self.io_seconds += seconds
+    
+    def count(self, name: str, amount: int = 1):
+        self.counters[name] = self.counters.get(name, 0) + amount
+    
+    def report(self) -> Dict[str, Any]:
+        generate_seconds = sum(seconds for stage, seconds in self.stages.items() if stage not in self.LOAD_STAGES)
+        return {
+            "stages": {stage: round(seconds, 6) for stage, seconds in self.stages.items()},
+            "features": self.counters.get("features", 0),
+            "files_written": self.files_written,
+            "bytes_written": self.bytes_written,
+            "yaml_load_seconds": round(self.stages.get("load", 0.0), 6),
+            "compile_seconds": round(self.stages.get("compile", 0.0), 6),
+            "render_seconds": round(max(0.0, generate_seconds - self.io_seconds), 6),
+            "io_seconds": round(self.io_seconds, 6),
+            "counters": dict(self.counters)
+        }
+
+
+class KotlinCodeGenerator:
+    def __init__(self, yaml_content: str, feature_name: str, cache_dir: str = None,
+                 hooks: GenerationHooks = None, options: GeneratorOptions = None,
+                 templates: TemplateRegistry = None, shared_types: Dict[Shape, str] = None):
+        self.hooks = hooks or GenerationHooks()
+        self.options = options or GeneratorOptions()
+        self.templates = templates or TemplateRegistry(TEMPLATES)
+        self.feature_name = feature_name
+        self.cache_dir = cache_dir
+        # DTO shapes generated once into the core package, from a TypeIndex
+        self.shared_types = shared_types
+        self.base_package = "com.example.api"
+        self.timestamp = generation_timestamp()
+        self._load(yaml_content)
+        self._output_dir = None
+        self._previous_files = {}
+        self._files = {}
+        self._changes = {}
+        # (stage, feature fingerprint) -> rendered methods, kept across runs
+        self._fragments = {}
+        self._cached_fragments = {}
+    
+    def reload(self, yaml_content: str) -> Dict[str, List[str]]:
+        """Replace the contract in place and return the actions that were added, changed or removed"""
+        previous = {feature.action: feature.fingerprint for feature in self.ir.features}
+        self._load(yaml_content)
+        current = {feature.action: feature.fingerprint for feature in self.ir.features}
+        return {
+            "added": [action for action in current if action not in previous],
+            "changed": [action for action in current if action in previous and previous[action] != current[action]],
+            "removed": [action for action in previous if action not in current]
+        }
+        
+    def _load(self, yaml_content: str):
+        # Nothing is replaced until the whole contract compiled, so a bad edit keeps the previous one
+        with self._stage("load"):
+            spec = load_spec(yaml_content, self.cache_dir)
+        with self._stage("compile"):
+            ir = ContractIR(spec, self.feature_name, self.shared_types)
+            network = parse_network(spec.get("network"), self.options.network)
+        self.spec, self.ir, self.network = spec, ir, network
+    
+    @contextmanager
+    def _stage(self, stage: str):
+        """Report the wall time of a block to the hooks"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.hooks.stage_finished(stage, time.perf_counter() - start)
+    
+    def generate_all(self, output_dir: str, force: bool = False):
+        """Generate all Kotlin files, leaving outputs of unchanged features untouched"""
+        os.makedirs(output_dir, exist_ok=True)
+        self.hooks.count("features", len(self.ir.features))
+        with self._stage("manifest"):
+            self._begin_manifest(output_dir, force)
+        
+        # Generate files in order of dependency
+        with self._stage("endpoints"):
+            endpoint_constants_file = self.generate_endpoint_constants(output_dir)
+        with self._stage("dtos"):
+            dto_files = self.generate_dtos(output_dir)
+        with self._stage("mappers"):
+            mapper_files = self.generate_mappers(output_dir)
+        with self._stage("datasources"):
+            remote_datasource_files = self.generate_remote_datasources(output_dir)
+        with self._stage("repositories"):
+            repository_files = self.generate_repositories(output_dir)
+        with self._stage("coalescing"):
+            coalescing_files = self.generate_coalescing_datasource(output_dir)
+        with self._stage("conditional"):
+            conditional_files = self.generate_conditional_datasource(output_dir)
+        with self._stage("caching"):
+            caching_files = self.generate_caching_repository(output_dir)
+        with self._stage("paging"):
+            paging_files = self.generate_paging(output_dir)
+        with self._stage("network"):
+            network_files = self.generate_network_module(output_dir)
+        with self._stage("manifest"):
+            changes = self._finish_manifest()
+        for kind, files in changes.items():
+            self.hooks.count(f"files_{kind}", len(files))
+        
+        return {
+            "endpoint_constants": endpoint_constants_file,
+            "dtos": dto_files,
+            "mappers": mapper_files,
+            "remote_datasources": remote_datasource_files,
+            "repositories": repository_files,
+            "coalescing": coalescing_files,
+            "conditional": conditional_files,
+            "caching": caching_files,
+            "paging": paging_files,
+            "network": network_files,
+            "changes": changes
+        }
+    
+    def _begin_manifest(self, output_dir: str, force: bool = False):
+        """Load the manifest of the previous run and reset the change report"""
+        self._cached_fragments.update(self._fragments)
+        self._fragments = {}
+        self._files = {}
+        self._changes = {"added": [], "changed": [], "skipped": [], "removed": []}
+        if force:
+            self._cached_fragments = {}
+        elif output_dir == self._output_dir and self._previous_files:
+            # Manifest of the previous run of this generator is still in memory
+            return
+        self._output_dir = output_dir
+        self._previous_files = {}
+        
+        manifest_path = self._manifest_path(output_dir)
+        if force or not os.path.exists(manifest_path):
+            return
+        try:
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+        if manifest.get("generator") == GENERATOR_VERSION:
+            self._previous_files = manifest.get("files", {})
+    
+    def _finish_manifest(self) -> Dict[str, List[str]]:
+        """Remove outputs that are no longer generated and persist the new manifest"""
+        self._remove_stale_files()
+        self._write_manifest({
+            "generator": GENERATOR_VERSION,
+            "features": {feature.action: feature.fingerprint for feature in self.ir.features},
+            "files": self._files
+        })
+        
+        self._previous_files = self._files
+        live = {feature.fingerprint for feature in self.ir.features}
+        self._cached_fragments = {
+            key: fragment for key, fragment in {**self._cached_fragments, **self._fragments}.items()
+            if key[1] in live
+        }
+        self._fragments = {}
+        return self._changes
+    
+    def _remove_stale_files(self):
+        """Delete files of the previous run that this run did not generate and no other feature owns"""
+        stale = [rel_path for rel_path in self._previous_files if rel_path not in self._files]
+        if not stale:
+            return
+        owned = self._files_of_other_features()
+        for rel_path in stale:
+            file_path = os.path.join(self._output_dir, rel_path)
+            if rel_path not in owned and os.path.exists(file_path):
+                os.remove(file_path)
+                self._changes["removed"].append(file_path)
+    
+    def _files_of_other_features(self) -> set:
+        """Files recorded by the manifests of other features in the output directory"""
+        own_manifest = self._manifest_path(self._output_dir)
+        owned = set()
+        for manifest_path in glob.glob(os.path.join(glob.escape(self._output_dir), MANIFEST_FILE.format(feature="*"))):
+            if manifest_path == own_manifest:
+                continue
+            try:
+                with open(manifest_path, "r") as f:
+                    owned.update(json.load(f).get("files", {}))
+            except (OSError, ValueError):
+                continue
+        return owned
+    
+    def _manifest_path(self, output_dir: str) -> str:
+        return os.path.join(output_dir, MANIFEST_FILE.format(feature=self.feature_name))
+    
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        manifest_path = self._manifest_path(self._output_dir)
+        content = json.dumps(manifest, indent=2, sort_keys=True) + "\n"
+        if not os.path.exists(manifest_path) or self._file_digest(manifest_path) != hashlib.sha256(content.encode()).hexdigest():
+            self._write_file(manifest_path, content)
+    
+    def _emit(self, file_path: str, features: List[FeatureIR], render: Callable[[], str]) -> str:
+        """Write the output of render() unless the features it is built from are unchanged"""
+        if self._output_dir is None:
+            # Called outside generate_all, behave like a plain write
+            self._begin_manifest(os.path.dirname(file_path), force=True)
+        rel_path = os.path.relpath(file_path, self._output_dir)
+        key = hashlib.sha256()
+        key.update(f"{GENERATOR_VERSION}:{self.base_package}:{self.feature_name}:{rel_path}:".encode())
+        key.update(self.options.fingerprint().encode())
+        key.update(self.templates.fingerprint().encode())
+        for feature in features:
+            key.update(feature.fingerprint.encode())
+        inputs = key.hexdigest()
+        
+        previous = self._previous_files.get(rel_path)
+        if previous and previous["inputs"] == inputs and self._matches_disk(file_path, previous):
+            self._files[rel_path] = previous
+            self._changes["skipped"].append(file_path)
+            return file_path
+        
+        content = render()
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        existed = os.path.exists(file_path)
+        if existed and self._file_digest(file_path) == digest:
+            self._changes["skipped"].append(file_path)
+        else:
+            self._write_file(file_path, content)
+            self._changes["changed" if existed else "added"].append(file_path)
+        
+        stat = os.stat(file_path)
+        self._files[rel_path] = {
+            "inputs": inputs,
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        }
+        return file_path
+    
+    def _matches_disk(self, file_path: str, entry: Dict[str, Any]) -> bool:
+        """Check that a file still has the content recorded in the manifest"""
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+        if stat.st_size != entry.get("size"):
+            return False
+        if stat.st_mtime_ns == entry.get("mtime_ns"):
+            return True
+        return self._file_digest(file_path) == entry.get("sha256")
+    
+    def _file_digest(self, file_path: str) -> str:
+        start = time.perf_counter()
+        with open(file_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        self.hooks.io_finished(time.perf_counter() - start)
+        return digest
+    
+    def _write_file(self, file_path: str, content: str):
+        """Atomically replace file_path with content"""
+        start = time.perf_counter()
+        size = write_file_atomically(file_path, content)
+        self.hooks.file_written(file_path, size, time.perf_counter() - start)
+    
+    def generate_endpoint_constants(self, output_dir: str) -> str:
+        """Generate API endpoint constants object"""
+        features = self.ir.features
+        
+        def render() -> str:
+            constants = [self._render_constants(feature) for feature in features]
+            return self.templates.render("endpoint_constants", self, constants='\n'.join(constants))
+        
+        file_path = os.path.join(output_dir, f"{self.feature_name}ApiEndPoint.kt")
+        return self._emit(file_path, features, render)
+    
+    def _render_constants(self, feature: FeatureIR) -> str:
+        """Endpoint constant of a feature, followed by the one of its bulk endpoint"""
+        constant = self.templates.get("endpoint_constant")
+        rendered = constant.render(feature)
+        if feature.batch and feature.batch.bulk_endpoint:
+            rendered += "\n" + constant.render(endpoint_constant=feature.batch.bulk_constant,
+                                                endpoint=feature.batch.bulk_endpoint)
+        return rendered
+    
+    def generate_dtos(self, output_dir: str) -> List[str]:
+        """Generate Data Transfer Objects"""
+        generated_files = []
+        dto_dir = os.path.join(output_dir, "dtos")
+        os.makedirs(dto_dir, exist_ok=True)
+        
+        # The Json instance every data source method decodes with
+        json_file = os.path.join(dto_dir, f"{self.feature_name}Json.kt")
+        generated_files.append(self._emit(json_file, [], self._render_json))
+        
+        for dto_name, dto in self.ir.dtos.items():
+            file_path = os.path.join(dto_dir, f"{dto_name}.kt")
+            sources = self.ir.dto_sources[dto_name]
+            render = lambda dto=dto, sources=sources: self._generate_dto(dto, self._header(sources))
+            generated_files.append(self._emit(file_path, sources, render))
+        
+        return generated_files
+    
+    def generate_mappers(self, output_dir: str) -> List[str]:
+        """Generate mapper classes for DTO to Domain conversion"""
+        generated_files = []
+        mapper_dir = os.path.join(output_dir, "mappers")
+        os.makedirs(mapper_dir, exist_ok=True)
+        
+        for dto_class, features in self.ir.mappers.items():
+            mapper_name = f"{dto_class}Mapper"
+            file_path = os.path.join(mapper_dir, f"{mapper_name}.kt")
+            render = lambda dto_class=dto_class, mapper_name=mapper_name: self._render_mapper(dto_class, mapper_name)
+            generated_files.append(self._emit(file_path, features, render))
+        
+        return generated_files
+    
+    def _render_mapper(self, dto_class: str, mapper_name: str) -> str:
+        """Generate a mapper from a DTO class to the feature domain model"""
+        return self.templates.render(
+            "mapper", self,
+            dto_class=dto_class,
+            mapper_name=mapper_name,
+            receiver=dto_class.lower()[0] + dto_class[1:]
+        )
+    
+    def generate_remote_datasources(self, output_dir: str) -> List[str]:
+        """Generate remote data source interface and implementation"""
+        datasource_dir = os.path.join(output_dir, "datasources")
+        os.makedirs(datasource_dir, exist_ok=True)
+        generated_files = self._generate_layer(datasource_dir, "RemoteDataSource", "datasource", self._render_datasource_method)
+        return generated_files + self.generate_fan_out(output_dir)
+    
+    def _return_type(self, feature: FeatureIR) -> str:
+        # Bodies without a single schema fall back to the feature DTO
+        return feature.response_type or f"{self.feature_name}Dto"
+    
+    def generate_fan_out(self, output_dir: str) -> List[str]:
+        """Generate the fan-out helper shared by the batch methods without a bulk endpoint"""
+        features = [feature for feature in self.ir.features if feature.batch and not feature.batch.bulk_endpoint]
+        if not features:
+            return []
+        file_path = os.path.join(output_dir, "datasources", f"{self.feature_name}FanOut.kt")
+        return [self._emit(file_path, [], lambda: self.templates.render("fan_out", self))]
+    
+    def generate_coalescing_datasource(self, output_dir: str) -> List[str]:
+        """Generate a data source decorator sharing in-flight calls of the GETs flagged with coalesce"""
+        features = [feature for feature in self.ir.features if feature.coalesce]
+        if not features:
+            return []
+        
+        def render() -> str:
+            methods = [self._render_coalescing_method(feature) for feature in features]
+            return self.templates.render("coalescing_datasource", self, methods='\n\n'.join(methods))
+        
+        file_path = os.path.join(output_dir, "datasources", f"{self.feature_name}CoalescingRemoteDataSource.kt")
+        return [self._emit(file_path, features, render)]
+    
+    def _render_coalescing_method(self, feature: FeatureIR) -> str:
+        """Render the override of one GET keyed by its action and every param"""
+        params = feature.path_params + feature.query_params
+        names = [param.name for param in params]
+        return self.templates.render(
+            "coalescing_datasource_method", feature,
+            parameters=", ".join(f"{param.name}: {param.kotlin_type}{'' if param.in_path else '?'}" for param in params),
+            return_type=self._return_type(feature),
+            key_args="".join(f", {name}" for name in names),
+            call_args=", ".join(names)
+        )
+    
+    def generate_conditional_datasource(self, output_dir: str) -> List[str]:
+        """Generate a data source decorator sending the GETs flagged with conditional as conditional requests"""
+        features = [feature for feature in self.ir.features if feature.conditional]
+        if not features:
+            return []
+        
+        def render() -> str:
+            methods = [self._render_conditional_method(feature) for feature in features]
+            return self.templates.render("conditional_datasource", self, methods='\n\n'.join(methods))
+        
+        datasource_dir = os.path.join(output_dir, "datasources")
+        return [
+            self._emit(os.path.join(datasource_dir, f"{self.feature_name}ConditionalRemoteDataSource.kt"), features, render),
+            self._emit(os.path.join(datasource_dir, f"{self.feature_name}ValidatorStore.kt"), [], self._render_validator_store),
+        ]
+    
+    def _render_conditional_method(self, feature: FeatureIR) -> str:
+        """Render the override of one GET, stored under its action and every param"""
+        params = feature.path_params + feature.query_params
+        query = ", ".join(f'"{param.name}" to {param.name}' for param in feature.query_params)
+        return self.templates.render(
+            "conditional_datasource_method", feature,
+            feature_name=self.feature_name,
+            parameters=", ".join(f"{param.name}: {param.kotlin_type}{'' if param.in_path else '?'}" for param in params),
+            return_type=self._return_type(feature),
+            key_args="".join(f", {param.name}" for param in params),
+            path_substitutions="".join(
+                f'.replace("{{{param.name}}}", {param.name}.encodeURLPathPart())' for param in feature.path_params
+            ),
+            query=f"mapOf({query})" if query else "emptyMap()",
+            call_args=", ".join(param.name for param in params)
+        )
+    
+    def _render_validator_store(self) -> str:
+        return self.templates.render("validator_store", self, max_entries=DEFAULT_VALIDATOR_ENTRIES)
+    
+    def _variant(self, template: str, compact: bool = None) -> str:
+        """Name of the template to render for template, honouring --compact"""
+        compact = self.options.compact if compact is None else compact
+        return f"{template}_compact" if compact and f"{template}_compact" in self.templates.sources else template
+    
+    def _render_datasource_method(self, feature: FeatureIR, compact: bool = None):
+        """Render the data source interface and implementation method of one feature"""
+        call_params = [param.name for param in feature.path_params]
+        if feature.request_dto:
+            call_params.append("body = request")
+        
+        map_query_params = ""
+        if feature.declares_query_params and feature.method == "get":
+            query_params = ','.join(f"\"{param.name}\" to {param.name}" for param in feature.query_params)
+            map_query_params = f"queryParams = mapOf({query_params})"
+        
+        values = {
+            "feature_name": self.feature_name,
+            "return_type": self._return_type(feature),
+            "http_method": feature.method.lower(),
+            "call_params": ', '.join(call_params),
+            "query_params": map_query_params
+        }
+        method_template = self._variant("datasource_impl_method", compact)
+        if method_template != "datasource_impl_method":
+            endpoint = f"path = {self.feature_name}ApiEndPoint.{feature.endpoint_constant}"
+            values["call_arguments"] = ', '.join(filter(None, [endpoint, values["call_params"], map_query_params]))
+        interface_method = self.templates.render("datasource_interface_method", feature, **values)
+        impl_method = self.templates.render(method_template, feature, **values)
+        if feature.batch:
+            batch_values = self._batch_values(feature)
+            batch = feature.batch
+            if batch.bulk_endpoint:
+                if batch.bulk_method == "get":
+                    query_params = [f'"{batch.ids_param}" to {batch.ids_name}.joinToString(",")']
+                    query_params.extend(f'"{param.name}" to {param.name}' for param in feature.query_params)
+                    batch_values["bulk_params"] = f"queryParams = mapOf({', '.join(query_params)})"
+                else:
+                    batch_values["bulk_params"] = f'body = mapOf("{batch.ids_param}" to {batch.ids_name})'
+                batch_template = self._variant("datasource_bulk_impl_method", compact)
+            else:
+                single_call_params = [batch_values["id_name"]]
+                single_call_params.extend(f"{param.name} = {param.name}" for param in feature.query_params)
+                batch_values["single_call_params"] = ", ".join(single_call_params)
+                batch_values["concurrency"] = batch.concurrency or self.options.fanout_concurrency
+                batch_template = "datasource_batch_impl_method"
+            interface_method += "\n\n" + self.templates.render("datasource_batch_interface_method", feature, **batch_values)
+            impl_method += "\n\n" + self.templates.render(batch_template, feature, **batch_values)
+        return interface_method, impl_method
+    
+    def _domain_values(self, feature: FeatureIR) -> Dict[str, str]:
+        """Domain type a repository method returns and how its data is mapped to it; lists map item by item"""
+        if self._return_type(feature).startswith("List<"):
+            return {"domain_type": f"List<{self.feature_name}Model>", "to_domain": ".map { it.toDomain() }"}
+        return {"domain_type": f"{self.feature_name}Model", "to_domain": ".toDomain()"}
+    
+    def _batch_values(self, feature: FeatureIR) -> Dict[str, Any]:
+        """Template values shared by the batch methods of a data source and a repository"""
+        batch = feature.batch
+        ids = f"{batch.ids_name}: List<String>"
+        call_params = [batch.ids_name] + [f"{param.name} = {param.name}" for param in feature.query_params]
+        return {
+            "feature_name": self.feature_name,
+            "batch_action": batch.action,
+            "ids_name": batch.ids_name,
+            "id_name": feature.path_params[0].name,
+            "item_type": self._return_type(feature),
+            "bulk_method": batch.bulk_method,
+            "bulk_constant": batch.bulk_constant,
+            "batch_signature": ", ".join([ids] + [f"{param.name}: {param.kotlin_type}? = null" for param in feature.query_params]),
+            "batch_parameters": ", ".join([ids] + [f"{param.name}: {param.kotlin_type}?" for param in feature.query_params]),
+            "batch_call_params": ", ".join(call_params)
+        }
+    
+    def generate_repositories(self, output_dir: str) -> List[str]:
+        """Generate repository interface and implementation"""
+        repo_dir = os.path.join(output_dir, "repositories")
+        os.makedirs(repo_dir, exist_ok=True)
+        return self._generate_layer(repo_dir, "Repository", "repository", self._render_repository_method)
+    
+    def _render_repository_method(self, feature: FeatureIR, compact: bool = None):
+        """Render the repository interface and implementation method of one feature"""
+        call_params = [param.name for param in feature.path_params]
+        call_params.extend(f"{param.name} = {param.name}" for param in feature.query_params)
+        if feature.request_dto:
+            call_params.append("request = request")
+        
+        values = {"feature_name": self.feature_name, "call_params": ', '.join(call_params), **self._domain_values(feature)}
+        interface_method = self.templates.render("repository_interface_method", feature, **values)
+        impl_method = self.templates.render(self._variant("repository_impl_method", compact), feature, **values)
+        if feature.batch:
+            batch_values = self._batch_values(feature)
+            interface_method += "\n\n" + self.templates.render("repository_batch_interface_method", **batch_values)
+            impl_method += "\n\n" + self.templates.render(self._variant("repository_batch_impl_method", compact),
+                                                            **batch_values)
+        return interface_method, impl_method
+    
+    def _generate_layer(self, layer_dir: str, suffix: str, stage: str, render_method: Callable[[FeatureIR], tuple],
+                        features: List[FeatureIR] = None) -> List[str]:
+        """Emit the interface and implementation file of a layer built from one method pair per feature"""
+        features = self.ir.features if features is None else features
+        built = {}
+        
+        def methods():
+            # Both files share the per-feature rendering, build it at most once
+            if not built:
+                built["interface"], built["impl"] = self._build_methods(stage, features, render_method)
+            return built["interface"], built["impl"]
+        
+        def render_interface() -> str:
+            return self.templates.render(f"{stage}_interface", self, methods='\n\n'.join(methods()[0]))
+        
+        def render_impl() -> str:
+            return self.templates.render(self._variant(f"{stage}_impl"), self, methods='\n\n'.join(methods()[1]))
+        
+        interface_file = os.path.join(layer_dir, f"{self.feature_name}{suffix}.kt")
+        impl_file = os.path.join(layer_dir, f"{self.feature_name}{suffix}Impl.kt")
+        return [
+            self._emit(interface_file, features, render_interface),
+            self._emit(impl_file, features, render_impl)
+        ]
+    
+    def generate_caching_repository(self, output_dir: str) -> List[str]:
+        """Generate a repository decorator caching the GETs with a cache block, if the contract has any"""
+        if not any(feature.cache for feature in self.ir.features):
+            return []
+        pending = {}
+        features = [due for feature in self.ir.features for due in self._due_caching_overrides(feature, pending)]
+        
+        def render() -> str:
+            methods = [self._render_caching_method(feature) for feature in features]
+            return self.templates.render("caching_repository", self, methods='\n\n'.join(methods))
+        
+        file_path = os.path.join(output_dir, "repositories", f"{self.feature_name}CachingRepository.kt")
+        return [self._emit(file_path, features, render)]
+    
+    def _due_caching_overrides(self, feature: FeatureIR, pending: Dict[str, List[FeatureIR]]) -> List[FeatureIR]:
+        """Features whose caching repository override comes next, once feature has been seen.
+        
+        Invalidating a resource only matters when a GET of it is cached, and that
+        GET may come later in the contract. Until then its mutations wait in
+        pending, resource -> features; None marks a resource with a cached GET.
+        Those still waiting at the end are not overridden.
+        """
+        if feature.cache:
+            due = pending.get(feature.resource) or []
+            pending[feature.resource] = None
+            return due + [feature]
+        if feature.invalidates:
+            if feature.resource in pending and pending[feature.resource] is None:
+                return [feature]
+            pending.setdefault(feature.resource, []).append(feature)
+        return []
+    
+    def _caching_role(self, feature: FeatureIR) -> str:
+        """Template of the caching repository override of a feature, None when it is not overridden"""
+        if feature.cache:
+            return "caching_repository_cached_method"
+        if feature.invalidates:
+            return "caching_repository_invalidating_method"
+        return None
+    
+    def _render_caching_method(self, feature: FeatureIR) -> str:
+        """Render the caching or invalidating override of one repository method"""
+        params = [f"{param.name}: String" for param in feature.path_params]
+        params.extend(f"{param.name}: {param.kotlin_type}?" for param in feature.query_params)
+        call_args = [param.name for param in feature.path_params + feature.query_params]
+        if feature.request_dto:
+            params.append(f"request: {feature.request_dto}")
+            call_args.append("request")
+        values = {"feature_name": self.feature_name, "parameters": ", ".join(params), "call_args": ", ".join(call_args),
+                  **self._domain_values(feature)}
+        if feature.cache:
+            key_params = feature.cache.key_params
+            values["cache_key"] = f"listOf<Any?>({', '.join(key_params)})" if key_params else "Unit"
+            values["ttl_millis"] = int(feature.cache.ttl_seconds * 1000)
+            values["max_entries"] = feature.cache.max_entries
+        return self.templates.render(self._caching_role(feature), feature, **values)
+    
+    def generate_paging(self, output_dir: str) -> List[str]:
+        """Generate a PagingSource per paginated endpoint and a paging repository exposing them as Flows"""
+        features = [feature for feature in self.ir.features if feature.paging]
+        if not features:
+            return []
+        paging_dir = os.path.join(output_dir, "paging")
+        os.makedirs(paging_dir, exist_ok=True)
+        
+        generated_files = []
+        for feature in features:
+            file_path = os.path.join(paging_dir, f"{self._paging_source_class(feature)}.kt")
+            render = lambda feature=feature: self._render_paging_source(feature)
+            generated_files.append(self._emit(file_path, [feature], render))
+        repo_dir = os.path.join(output_dir, "repositories")
+        generated_files.extend(self._generate_layer(repo_dir, "PagingRepository", "paging_repository",
+                                                    self._render_paging_method, features))
+        return generated_files
+    
+    def _paging_source_class(self, feature: FeatureIR) -> str:
+        return f"{dto_base_name(feature.action)}PagingSource"
+    
+    def _paging_params(self, feature: FeatureIR) -> List[ParamIR]:
+        """Params of a paginated endpoint other than the page and page size"""
+        paging = feature.paging
+        query_params = [param for param in feature.query_params if param.name not in (paging.page_param, paging.size_param)]
+        return feature.path_params + query_params
+    
+    def _render_paging_source(self, feature: FeatureIR) -> str:
+        """Render the PagingSource loading one page of a paginated endpoint per call"""
+        paging = feature.paging
+        call_params = [param.name for param in feature.path_params]
+        for param in feature.query_params:
+            if param.name == paging.page_param:
+                call_params.append(f"{param.name} = page")
+            elif param.name == paging.size_param:
+                call_params.append(f"{param.name} = params.loadSize")
+            else:
+                call_params.append(f"{param.name} = {param.name}")
+        source_properties = "".join(
+            f"\n    private val {param.name}: {param.kotlin_type}{'' if param.in_path else '?'},"
+            for param in self._paging_params(feature)
+        )
+        return self.templates.render(
+            "paging_source", self,
+            header=self._header([feature]),
+            source_class=self._paging_source_class(feature),
+            source_properties=source_properties,
+            item_type=paging.item_type,
+            first_page=paging.first_page,
+            action=feature.action,
+            call_params=", ".join(call_params)
+        )
+    
+    def _render_paging_method(self, feature: FeatureIR, compact: bool = None):
+        """Render the paging repository interface and implementation method of one feature"""
+        paging = feature.paging
+        params = self._paging_params(feature)
+        values = {
+            "feature_name": self.feature_name,
+            "signature": ", ".join(f"{param.name}: String" if param.in_path else f"{param.name}: {param.kotlin_type}? = null"
+                                   for param in params),
+            "parameters": ", ".join(f"{param.name}: {param.kotlin_type}{'' if param.in_path else '?'}" for param in params),
+            "page_size": paging.page_size or self.options.page_size,
+            "prefetch_distance": self.options.prefetch_distance if paging.prefetch_distance is None else paging.prefetch_distance,
+            "source_class": self._paging_source_class(feature),
+            "source_args": ", ".join(["remoteDataSource"] + [param.name for param in params])
+        }
+        return (
+            self.templates.render("paging_repository_interface_method", feature, **values),
+            self.templates.render("paging_repository_impl_method", feature, **values)
+        )
+    
+    def generate_network_module(self, output_dir: str) -> List[str]:
+        """Generate the tuned Ktor client and the Koin module giving it to the data source"""
+        if self.network is None:
+            return []
+        return [self._emit(file_path, [self.network], render) for file_path, render in self._network_files(output_dir)]
+    
+    def _network_files(self, output_dir: str) -> List[tuple]:
+        """(file path, render) of each network module file; the Koin module goes to the di package"""
+        for name in ("network", "di"):
+            os.makedirs(os.path.join(output_dir, name), exist_ok=True)
+        return [
+            (os.path.join(output_dir, "network", f"{self.feature_name}HttpClient.kt"), self._render_network_client),
+            (os.path.join(output_dir, "di", f"{self.feature_name}NetworkModule.kt"), self._render_network_module),
+        ]
+    
+    def _render_network_client(self) -> str:
+        network = self.network
+        imports = ["io.ktor.client.HttpClient", "io.ktor.client.engine.okhttp.OkHttp", "io.ktor.client.plugins.HttpTimeout"]
+        if network.compression:
+            imports.append("io.ktor.client.plugins.compression.ContentEncoding")
+        imports += ["java.util.concurrent.TimeUnit", "okhttp3.ConnectionPool", "okhttp3.Dispatcher", "okhttp3.Protocol"]
+        return self.templates.render(
+            "network_client", network,
+            base_package=self.base_package,
+            feature_name=self.feature_name,
+            header=self._header([network]),
+            imports="\n".join(f"import {name}" for name in imports),
+            protocols="Protocol.HTTP_2, Protocol.HTTP_1_1" if network.http2 else "Protocol.HTTP_1_1",
+            compression=self.templates.render("network_client_compression") if network.compression else ""
+        )
+    
+    def _render_network_module(self) -> str:
+        return self.templates.render(
+            "network_module", self,
+            header=self._header([self.network]),
+            module_name=f"{self.feature_name[0].lower()}{self.feature_name[1:]}NetworkModule"
+        )
+    
+    def _build_methods(self, stage: str, features: List[FeatureIR], render: Callable[[FeatureIR], tuple]):
+        """Collect per-feature methods, reusing fragments rendered in earlier runs of this generator"""
+        interface_methods = []
+        impl_methods = []
+        
+        for feature in features:
+            key = (stage, feature.fingerprint)
+            fragment = self._fragments.get(key) or self._cached_fragments.get(key)
+            if fragment is None:
+                fragment = render(feature)
+            self._fragments[key] = fragment
+            interface_methods.append(fragment[0])
+            impl_methods.append(fragment[1])
+        
+        return interface_methods, impl_methods
+    
+    def compact_savings(self, features: Iterable[FeatureIR] = None) -> Dict[str, int]:
+        """Size of the data source and repository implementations in full and in compact emission"""
+        features = self.ir.features if features is None else features
+        totals = {"full_bytes": 0, "full_lines": 0, "compact_bytes": 0, "compact_lines": 0}
+        
+        def add(mode: str, text: str):
+            totals[f"{mode}_bytes"] += len(text.encode())
+            totals[f"{mode}_lines"] += text.count("\n")
+        
+        for mode, compact in (("full", False), ("compact", True)):
+            for stage in ("datasource", "repository"):
+                add(mode, self.templates.render(self._variant(f"{stage}_impl", compact), self, methods=""))
+        for index, feature in enumerate(features):
+            for mode, compact in (("full", False), ("compact", True)):
+                for render in (self._render_datasource_method, self._render_repository_method):
+                    # Methods after the first are preceded by a blank line
+                    add(mode, ("\n\n" if index else "") + render(feature, compact)[1])
+        return totals
+    
+    def _kotlin_type(self, type_str: str) -> str:
+        """Map YAML types to Kotlin types"""
+        return kotlin_type(type_str)
+    
+    def _header(self, features: List[FeatureIR]) -> str:
+        """Describe where a generated file comes from without breaking reproducible output"""
+        if self.options.provenance:
+            # Hash only the features the file is built from, so editing one
+            # endpoint does not restamp every other file
+            digest = hashlib.sha256("".join(feature.fingerprint for feature in features).encode())
+            return f"Generated from contract sha256:{digest.hexdigest()[:16]}"
+        if self.options.reproducible:
+            return "Generated code, do not edit"
+        return f"Generated on {self.timestamp}"
+    
+    def _render_json(self) -> str:
+        return self.templates.render("json", self, header=self._header([]))
+    
+    def _generate_dto(self, dto: DtoIR, header: str = None) -> str:
+        """Generate the data class of a DTO, or a typealias when its shape already has a class"""
+        if dto.values is not None:
+            return render_dto_enum(self.templates, self.base_package, header or f"Generated on {self.timestamp}",
+                                   dto.name, dto.values)
+        if dto.class_name != dto.name or dto.shared_class:
+            return self.templates.render(
+                "dto_alias", self,
+                header=header or f"Generated on {self.timestamp}",
+                name=dto.name,
+                class_name=dto.shared_class or dto.class_name
+            )
+        return self._generate_dto_class(dto.name, dto.properties, header)
+    
+    def _generate_dto_class(self, class_name: str, properties: List[tuple], header: str = None) -> str:
+        """Generate a Kotlin data class for DTO from (name, Kotlin type) pairs"""
+        return render_dto_class(self.templates, self.base_package, header or f"Generated on {self.timestamp}",
+                                class_name, properties)
+
+
+def write_file_atomically(file_path: str, content: str) -> int:
+    """Replace file_path with content through a temporary file, so readers never see half of it; returns the size"""
+    tmp_path = f"{file_path}.tmp"
+    with open(tmp_path, "w") as f:
+        size = f.write(content)
+    os.replace(tmp_path, file_path)
+    return size
+
+
+def render_dto_class(templates: TemplateRegistry, base_package: str, header: str, class_name: str,
+                     properties: List[tuple]) -> str:
+    """Render the @Serializable data class of a DTO from (name, Kotlin type) pairs"""
+    property_template = templates.get("dto_property")
+    properties_code = [
+        property_template.render(serial_name=name, name=property_name(name), kotlin_type=kotlin_type)
+        for name, kotlin_type in properties
+    ]
+    imports = ["kotlinx.serialization.SerialName", "kotlinx.serialization.Serializable"]
+    imports.extend(f"kotlinx.serialization.json.{json_type}" for json_type in ("JsonArray", "JsonObject")
+                   if any(re.search(rf"\b{json_type}\b", kotlin_type) for _, kotlin_type in properties))
+    return templates.render(
+        "dto",
+        base_package=base_package,
+        header=header,
+        imports='\n'.join(f"import {module}" for module in imports),
+        class_name=class_name,
+        properties=',\n'.join(properties_code)
+    )
+
+
+def render_dto_enum(templates: TemplateRegistry, base_package: str, header: str, class_name: str,
+                    values: tuple) -> str:
+    """Render the @Serializable enum class of an enum schema, one constant per wire value"""
+    constant_template = templates.get("dto_enum_constant")
+    constants = []
+    names = set()
+    for value in values:
+        name = base = enum_constant(value)
+        suffix = 2
+        while name in names:
+            name = f"{base}_{suffix}"
+            suffix += 1
+        names.add(name)
+        constants.append(constant_template.render(serial_name=value, name=name))
+    return templates.render("dto_enum", base_package=base_package, header=header, class_name=class_name,
+                            constants=',\n'.join(constants))
@@ -0,0 +1,392 @@
+import hashlib
+import json
+from typing import Any, Dict, List
+
+from kotlin_dtos import dto_base_name, DtoTable, Shape
+
+
+# Turns an endpoint path into the suffix of its endpoint constant name
+CONSTANT_TRANSLATION = str.maketrans({"/": "_", "-": "_", "{": None, "}": None})
+
+DEFAULT_PAGE_SIZE = 20
+DEFAULT_FANOUT_CONCURRENCY = 4
+DEFAULT_CACHE_TTL_SECONDS = 60
+DEFAULT_CACHE_ENTRIES = 100
+# Responses a generated validator store keeps for conditional GETs
+DEFAULT_VALIDATOR_ENTRIES = 100
+# Client settings of the generated network module, under their contract keys
+NETWORK_DEFAULTS = {
+    "poolSize": 5,
+    "keepAliveSeconds": 300,
+    "maxRequests": 64,
+    "maxRequestsPerHost": 5,
+    "connectTimeoutMillis": 10000,
+    "requestTimeoutMillis": 30000,
+    "socketTimeoutMillis": 30000,
+    "compression": True,
+    "http2": True,
+}
+# Methods whose success invalidates the cached GETs of the same resource, unless invalidates: false
+MUTATING_METHODS = ("post", "put", "patch", "delete")
+# Query params recognised as the page number and page size of a paginated list endpoint
+PAGE_PARAMS = ("page", "pageNumber", "pageIndex", "page_number")
+PAGE_SIZE_PARAMS = ("pageSize", "size", "limit", "perPage", "per_page", "page_size")
+
+
+class GeneratorOptions:
+    """Switches that change what KotlinCodeGenerator renders"""
+    __slots__ = ("reproducible", "provenance", "compact", "page_size", "prefetch_distance", "fanout_concurrency",
+                 "network")
+    
+    def __init__(self, reproducible: bool = False, provenance: bool = False, compact: bool = False,
+                 page_size: int = DEFAULT_PAGE_SIZE, prefetch_distance: int = None,
+                 fanout_concurrency: int = DEFAULT_FANOUT_CONCURRENCY, network: Dict[str, Any] = None):
+        # No wall-clock content, identical contracts give byte-identical output
+        self.reproducible = reproducible or provenance
+        # Stamp generated headers with a hash of the contract entries they come from
+        self.provenance = provenance
+        # Delegate every data source and repository method to one shared helper per file
+        self.compact = compact
+        # Paging defaults for paginated endpoints whose contract entry does not set them
+        self.page_size = page_size
+        self.prefetch_distance = page_size if prefetch_distance is None else prefetch_distance
+        # Calls in flight at once in generated batch methods without a bulk endpoint
+        self.fanout_concurrency = fanout_concurrency
+        # Network module settings under their contract keys, None unless asked for on the command line
+        self.network = network
+    
+    def fingerprint(self) -> str:
+        return json.dumps({slot: getattr(self, slot) for slot in self.__slots__}, sort_keys=True)
+
+
+KOTLIN_TYPES = {
+    "string": "String",
+    "integer": "Int",
+    "boolean": "Boolean",
+    "number": "Double",
+    # Free-form values stay undecoded JSON trees
+    "object": "JsonObject",
+    "array": "JsonArray"
+}
+
+
+def kotlin_type(type_str: str) -> str:
+    """Map YAML types to Kotlin types"""
+    return KOTLIN_TYPES.get(type_str.lower(), type_str.capitalize())
+
+
+def is_builtin_type(kotlin_type: str) -> bool:
+    """Whether a property type needs no class generated from the contract, e.g. List<String>"""
+    while kotlin_type.startswith("List<") and kotlin_type.endswith(">"):
+        kotlin_type = kotlin_type[5:-1]
+    return kotlin_type in KOTLIN_TYPES.values()
+
+
+class ParamIR:
+    """A path or query parameter of an endpoint"""
+    __slots__ = ("name", "kotlin_type", "in_path")
+    
+    def __init__(self, name: str, kotlin_type: str, in_path: bool):
+        self.name = name
+        self.kotlin_type = kotlin_type
+        self.in_path = in_path
+
+
+class PagingIR:
+    """How a paginated list endpoint is paged; sizes left as None use the generator options"""
+    __slots__ = ("page_param", "size_param", "item_type", "first_page", "page_size", "prefetch_distance")
+    
+    def __init__(self, page_param: str, size_param: str, item_type: str, first_page: int = 1,
+                 page_size: int = None, prefetch_distance: int = None):
+        self.page_param = page_param
+        self.size_param = size_param
+        self.item_type = item_type
+        self.first_page = first_page
+        self.page_size = page_size
+        self.prefetch_distance = prefetch_distance
+
+
+def detect_paging(feature: Dict[str, Any], query_params: List[ParamIR], item_type: str) -> PagingIR:
+    """Page a GET endpoint returning a list of objects when it takes page and page size params.
+    
+    A paging block in the contract entry names the params and sizes explicitly,
+    paging: false turns detection off.
+    """
+    config = feature.get("paging", {})
+    if config is False or feature["method"].lower() != "get" or item_type is None:
+        return None
+    config = config if isinstance(config, dict) else {}
+    int_params = [param.name for param in query_params if param.kotlin_type == "Int"]
+    page_param = config.get("pageParam") or next((name for name in PAGE_PARAMS if name in int_params), None)
+    size_param = config.get("sizeParam") or next((name for name in PAGE_SIZE_PARAMS if name in int_params), None)
+    if page_param not in int_params or size_param not in int_params:
+        return None
+    return PagingIR(page_param, size_param, item_type, config.get("firstPage", 1),
+                    config.get("pageSize"), config.get("prefetchDistance"))
+
+
+class BatchIR:
+    """Batch variant of a GET by id, fanning out over the ids or calling a bulk endpoint"""
+    __slots__ = ("action", "ids_name", "concurrency", "bulk_endpoint", "bulk_constant", "bulk_method", "ids_param")
+    
+    def __init__(self, action: str, ids_name: str, concurrency: int = None, bulk_endpoint: str = None,
+                 bulk_method: str = "get", ids_param: str = "ids"):
+        self.action = action
+        self.ids_name = ids_name
+        # None uses the generator options
+        self.concurrency = concurrency
+        self.bulk_endpoint = bulk_endpoint
+        self.bulk_constant = None
+        if bulk_endpoint:
+            self.bulk_constant = f"{bulk_method.upper()}_{bulk_endpoint.translate(CONSTANT_TRANSLATION).upper()}"
+        self.bulk_method = bulk_method
+        self.ids_param = ids_param
+
+
+def parse_batch(feature: Dict[str, Any], path_params: List[ParamIR]) -> BatchIR:
+    """Give GETs with a single path param, like /users/{userId}, a batch variant unless batch: false.
+    
+    Raises ValueError for a concurrency that is not a positive integer, a bulkMethod
+    other than get or post, or an idsParam that is not an identifier.
+    """
+    config = feature.get("batch", {})
+    if config is False or feature["method"].lower() != "get" or len(path_params) != 1:
+        return None
+    config = config if isinstance(config, dict) else {}
+    action = feature["action"]
+    concurrency = config.get("concurrency")
+    if concurrency is not None and (isinstance(concurrency, bool) or not isinstance(concurrency, int) or concurrency < 1):
+        raise ValueError(f"batch concurrency of {action} must be a positive integer, not {concurrency!r}")
+    bulk_method = config.get("bulkMethod", "get")
+    if not isinstance(bulk_method, str) or bulk_method.lower() not in ("get", "post"):
+        raise ValueError(f"batch bulkMethod of {action} must be get or post, not {bulk_method!r}")
+    ids_param = config.get("idsParam", "ids")
+    if not isinstance(ids_param, str) or not ids_param.isidentifier():
+        raise ValueError(f"batch idsParam of {action} must be an identifier, not {ids_param!r}")
+    batch_action = f"{action}s" if action.endswith("Id") else f"{action}Batch"
+    bulk_endpoint = config.get("bulkEndpoint")
+    return BatchIR(batch_action, f"{path_params[0].name}s", concurrency,
+                   bulk_endpoint.strip("/") if bulk_endpoint else None, bulk_method.lower(), ids_param)
+
+
+class CacheIR:
+    """Response cache of a GET endpoint, from the cache block of its contract entry"""
+    __slots__ = ("ttl_seconds", "max_entries", "key_params")
+    
+    def __init__(self, ttl_seconds: float, max_entries: int, key_params: List[str]):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.key_params = key_params
+
+
+def parse_cache(feature: Dict[str, Any], params: List[ParamIR]) -> CacheIR:
+    """Read the optional cache block of a contract entry, by default keyed by every param"""
+    config = feature.get("cache")
+    if not config:
+        return None
+    if feature["method"].lower() != "get":
+        raise ValueError(f"cache is only supported on GET endpoints, not on {feature['action']}")
+    config = config if isinstance(config, dict) else {}
+    names = [param.name for param in params]
+    key_params = config.get("keyParams", names)
+    unknown = [name for name in key_params if name not in names]
+    if unknown:
+        raise ValueError(f"cache keyParams of {feature['action']} are not params of the endpoint: {', '.join(unknown)}")
+    return CacheIR(config.get("ttlSeconds", DEFAULT_CACHE_TTL_SECONDS), config.get("maxEntries", DEFAULT_CACHE_ENTRIES),
+                   key_params)
+
+
+class NetworkIR:
+    """Ktor client settings of the generated network module"""
+    __slots__ = (
+        "pool_size", "keep_alive_seconds", "max_requests", "max_requests_per_host", "connect_timeout_ms",
+        "request_timeout_ms", "socket_timeout_ms", "compression", "http2", "fingerprint"
+    )
+    
+    def __init__(self, settings: Dict[str, Any]):
+        self.pool_size = settings["poolSize"]
+        self.keep_alive_seconds = settings["keepAliveSeconds"]
+        self.max_requests = settings["maxRequests"]
+        self.max_requests_per_host = settings["maxRequestsPerHost"]
+        self.connect_timeout_ms = settings["connectTimeoutMillis"]
+        self.request_timeout_ms = settings["requestTimeoutMillis"]
+        self.socket_timeout_ms = settings["socketTimeoutMillis"]
+        self.compression = settings["compression"]
+        self.http2 = settings["http2"]
+        # Stands in for feature fingerprints in manifest keys and provenance headers
+        self.fingerprint = hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()
+
+
+def parse_network(config: Any, cli_settings: Dict[str, Any] = None) -> NetworkIR:
+    """Merge the network block of a contract over the command line settings and the defaults.
+    
+    The module is generated when either asks for it, network: false in the contract turns it off.
+    """
+    if config is False or (not config and cli_settings is None):
+        return None
+    settings = dict(NETWORK_DEFAULTS)
+    settings.update(cli_settings or {})
+    if isinstance(config, dict):
+        settings.update(config)
+    unknown = [key for key in settings if key not in NETWORK_DEFAULTS]
+    if unknown:
+        raise ValueError(f"Unknown network settings: {', '.join(unknown)}")
+    for key, default in NETWORK_DEFAULTS.items():
+        value = settings[key]
+        if isinstance(default, bool):
+            if not isinstance(value, bool):
+                raise ValueError(f"network {key} must be true or false, not {value!r}")
+        elif isinstance(value, bool) or not isinstance(value, int) or value < 1:
+            raise ValueError(f"network {key} must be a positive integer, not {value!r}")
+    return NetworkIR(settings)
+
+
+class DtoIR:
+    """A data class generated from an object schema, or an enum class from enum values"""
+    __slots__ = ("name", "properties", "class_name", "shared_class", "values")
+    
+    def __init__(self, name: str, properties: List[tuple], class_name: str = None, shared_class: str = None,
+                 values: tuple = None):
+        self.name = name
+        # (property name, Kotlin type) pairs in contract order
+        self.properties = properties
+        # Class generated for this shape; differs from name when name is a typealias
+        self.class_name = class_name or name
+        # Fully qualified core class when other contracts share the shape; name then aliases it
+        self.shared_class = shared_class
+        # Wire values of an enum class, None for data classes
+        self.values = values
+
+
+class FeatureIR:
+    """A contract feature with every name the generators derive from it"""
+    __slots__ = (
+        "action", "method", "endpoint", "resource", "endpoint_constant", "path_params", "query_params",
+        "declares_query_params", "request_dto", "response_type", "paging", "cache", "coalesce", "conditional", "batch",
+        "invalidates", "dtos", "mapped_dtos", "signature", "fingerprint"
+    )
+    
+    def __init__(self, feature: Dict[str, Any], feature_name: str, dto_table: DtoTable = None):
+        method = feature["method"]
+        endpoint = feature["endpoint"].strip("/")
+        dto_prefix = dto_base_name(feature["action"])
+        # Shared by the features of a contract, so DTO names stay unique and shapes are interned
+        dto_table = dto_table if dto_table is not None else DtoTable()
+        
+        self.action = feature["action"]
+        self.method = method
+        self.endpoint = endpoint
+        # First path segment, e.g. users for /users/{userId}/status
+        self.resource = endpoint.split("/")[0]
+        self.endpoint_constant = f"{method.upper()}_{endpoint.translate(CONSTANT_TRANSLATION).upper()}"
+        self.path_params = [
+            ParamIR(part[1:-1], "String", True)
+            for part in endpoint.split("/")
+            if part.startswith("{") and part.endswith("}")
+        ]
+        self.declares_query_params = "queryParams" in feature
+        self.query_params = [
+            ParamIR(param["name"], kotlin_type(param["type"]), False)
+            for param in feature.get("queryParams", [])
+        ]
+        
+        # DTOs defined by this feature, and response DTOs that get a mapper
+        self.dtos = []
+        self.mapped_dtos = []
+        # Kotlin type the response body decodes into, None when it has no single type
+        self.response_type = None
+        item_type = None
+        response = feature.get("response")
+        if response is not None:
+            if response["type"] == "object":
+                self.response_type = self._add_dto(dto_table, f"{dto_prefix}Response", response["properties"], mapped=True)
+            elif response["type"] == "array" and "items" in response:
+                items = response["items"]
+                if isinstance(items, list):
+                    for i, item in enumerate(items):
+                        if item["type"] == "object":
+                            self._add_dto(dto_table, f"{dto_prefix}Item{i+1}", item["properties"], mapped=True)
+                        else:
+                            self.mapped_dtos.append(dto_table.unique_name(f"{dto_prefix}Item{i+1}"))
+                elif items["type"] == "object":
+                    item_type = self._add_dto(dto_table, f"{dto_prefix}Item", items["properties"], mapped=True)
+                    self.response_type = f"List<{item_type}>"
+                else:
+                    self.mapped_dtos.append(dto_table.unique_name(f"{dto_prefix}Item"))
+                    self.response_type = f"List<{kotlin_type(items['type'])}>"
+        
+        self.paging = detect_paging(feature, self.query_params, item_type)
+        self.cache = parse_cache(feature, self.path_params + self.query_params)
+        self.batch = parse_batch(feature, self.path_params)
+        # Share one in-flight call between concurrent callers with the same params
+        self.coalesce = bool(feature.get("coalesce"))
+        if self.coalesce and method.lower() != "get":
+            raise ValueError(f"coalesce is only supported on GET endpoints, not on {self.action}")
+        # Revalidate with ETag / Last-Modified and answer 304s from the stored response
+        self.conditional = bool(feature.get("conditional"))
+        if self.conditional and method.lower() != "get":
+            raise ValueError(f"conditional is only supported on GET endpoints, not on {self.action}")
+        # Clear the cached GETs of the resource on success; invalidates: false opts out, e.g. a POST that only validates
+        if "invalidates" in feature and method.lower() not in MUTATING_METHODS:
+            raise ValueError(f"invalidates is only supported on {', '.join(MUTATING_METHODS).upper()} endpoints, not on {self.action}")
+        self.invalidates = method.lower() in MUTATING_METHODS and bool(feature.get("invalidates", True))
+        
+        self.request_dto = None
+        request = feature.get("request")
+        if request is not None and request["type"] == "object":
+            self.request_dto = self._add_dto(dto_table, f"{dto_prefix}Request", request["properties"])
+        
+        params = [f"{param.name}: String" for param in self.path_params]
+        params.extend(f"{param.name}: {param.kotlin_type}? = null" for param in self.query_params)
+        if self.request_dto:
+            params.append(f"request: {self.request_dto}")
+        self.signature = ", ".join(params)
+        
+        canonical = json.dumps(feature, sort_keys=True, default=str)
+        fingerprint = hashlib.sha256(canonical.encode())
+        # Names depend on earlier features too, so outputs follow when interning changes
+        for dto in self.dtos:
+            fingerprint.update(f"\0{dto.name}={dto.class_name}:{dto.shared_class}:{dto.properties}:{dto.values}".encode())
+        for name in self.mapped_dtos:
+            fingerprint.update(f"\0{name}".encode())
+        self.fingerprint = fingerprint.hexdigest()
+    
+    def _add_dto(self, dto_table: DtoTable, name: str, properties: Dict[str, Any], mapped: bool = False) -> str:
+        """Add a DTO under a name unique in the contract, after the classes of its nested schemas, and return that name"""
+        name = dto_table.unique_name(name)
+        define = lambda class_name, nested, values: self._define_dto(dto_table, class_name, nested, values)
+        dto = self._define_dto(dto_table, name, dto_table.resolve_properties(name, properties, kotlin_type, define))
+        # Aliases share the mapper of their class
+        if mapped and dto.class_name not in self.mapped_dtos:
+            self.mapped_dtos.append(dto.class_name)
+        return name
+    
+    def _define_dto(self, dto_table: DtoTable, name: str, properties: List[tuple], values: tuple = None) -> DtoIR:
+        if values is not None:
+            dto = DtoIR(name, [], values=values)
+        else:
+            class_name = dto_table.intern(name, properties)
+            shared_class = dto_table.shared.get(tuple(properties)) if class_name == name else None
+            dto = DtoIR(name, properties, class_name, shared_class)
+        self.dtos.append(dto)
+        return dto
+
+
+class ContractIR:
+    """Compiled form of a contract, built in a single pass over its features"""
+    __slots__ = ("features", "dto_table", "dtos", "dto_sources", "mappers")
+    
+    def __init__(self, spec: Dict[str, Any], feature_name: str, shared_types: Dict[Shape, str] = None):
+        self.dto_table = DtoTable(shared_types)
+        self.features = [FeatureIR(feature, feature_name, self.dto_table) for feature in spec.get("features", [])]
+        # DTO name -> definition, classes and typealiases alike
+        self.dtos = {}
+        # DTO or mapped class name -> features it is generated from
+        self.dto_sources = {}
+        self.mappers = {}
+        for feature in self.features:
+            for dto in feature.dtos:
+                self.dtos[dto.name] = dto
+                self.dto_sources[dto.name] = [feature]
+            for name in feature.mapped_dtos:
+                self.mappers.setdefault(name, []).append(feature)
@@ -0,0 +1,140 @@
+import hashlib
+import json
+import os
+import pickle
+from typing import Any, Dict, Iterator
+
+import yaml
+
+# Bump to invalidate every cached parse, e.g. when the loader changes
+SPEC_CACHE_VERSION = "1"
+# Cached parses kept per cache directory; the least recently used are evicted beyond this
+SPEC_CACHE_ENTRIES = 64
+DEFAULT_CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME", os.path.join(os.path.expanduser("~"), ".cache")), "api_codegen"
+)
+
+# Top-level contract entries besides features that change the generated code
+CONTRACT_SETTINGS = ("network",)
+
+# libyaml's C loader is several times faster than the pure-Python one
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+if getattr(yaml, "__with_libyaml__", False):
+    from yaml.composer import Composer
+    from yaml.constructor import SafeConstructor
+    from yaml.cyaml import CParser
+    from yaml.resolver import Resolver
+    
+    class StreamLoader(CParser, Composer, SafeConstructor, Resolver):
+        """libyaml events with the Python composer, so one node can be loaded at a time"""
+        
+        def __init__(self, stream):
+            CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+else:
+    StreamLoader = yaml.SafeLoader
+
+
+def load_spec(yaml_content: str, cache_dir: str = None) -> Dict[str, Any]:
+    """Parse a contract, reusing the cached parse of identical content from cache_dir"""
+    if not cache_dir:
+        return parse_spec(yaml_content)
+    
+    key = hashlib.sha256(f"{SPEC_CACHE_VERSION}:{yaml.__version__}:".encode())
+    key.update(yaml_content.encode())
+    cache_path = os.path.join(cache_dir, f"{key.hexdigest()}.pickle")
+    try:
+        with open(cache_path, "rb") as f:
+            spec = pickle.load(f)
+        # The modification time orders entries for eviction
+        os.utime(cache_path)
+        return spec
+    except (OSError, EOFError, pickle.UnpicklingError):
+        pass
+    
+    spec = parse_spec(yaml_content)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(spec, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+        prune_spec_cache(cache_dir)
+    except OSError:
+        # The cache is an optimization only
+        pass
+    return spec
+
+
+def parse_spec(yaml_content: str) -> Dict[str, Any]:
+    """Parse a contract, which must be a mapping; an empty file is not"""
+    spec = yaml.load(yaml_content, Loader=SafeLoader)
+    if not isinstance(spec, dict):
+        raise ValueError(f"Contract is not a mapping with a features list, found {type(spec).__name__}")
+    return spec
+
+
+def prune_spec_cache(cache_dir: str, max_entries: int = SPEC_CACHE_ENTRIES):
+    """Delete the least recently used parses beyond max_entries, e.g. earlier versions of an edited contract"""
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.name.endswith(".pickle"):
+                try:
+                    entries.append((entry.stat().st_mtime_ns, entry.path))
+                except OSError:
+                    continue
+    if len(entries) <= max_entries:
+        return
+    entries.sort(reverse=True)
+    for _, path in entries[max_entries:]:
+        try:
+            os.remove(path)
+        except OSError:
+            # Another process evicted it first
+            pass
+
+
+def iter_features(contract_path: str, settings: Dict[str, Any] = None) -> Iterator[Dict[str, Any]]:
+    """Yield the features of a contract one at a time without loading the whole file.
+    
+    YAML contracts are read as a stream of parser events and only one entry of
+    the top-level features sequence is built at a time. A .jsonl contract holds
+    one feature object per line. The top-level CONTRACT_SETTINGS entries are
+    stored in settings as they are read.
+    """
+    with open(contract_path, "r") as stream:
+        if contract_path.endswith(".jsonl"):
+            for line in stream:
+                if line.strip():
+                    yield json.loads(line)
+            return
+        
+        loader = StreamLoader(stream)
+        try:
+            loader.get_event()
+            if loader.check_event(yaml.StreamEndEvent):
+                return
+            loader.get_event()
+            if not loader.check_event(yaml.MappingStartEvent):
+                raise ValueError(f"{contract_path} is not a mapping with a features list")
+            loader.get_event()
+            while not loader.check_event(yaml.MappingEndEvent):
+                key = loader.construct_document(loader.compose_node(None, None))
+                if key != "features":
+                    node = loader.compose_node(None, None)
+                    # Other top-level entries are not needed for generation
+                    if settings is not None and key in CONTRACT_SETTINGS:
+                        settings[key] = loader.construct_document(node)
+                    continue
+                if not loader.check_event(yaml.SequenceStartEvent):
+                    raise ValueError(f"features in {contract_path} is not a list")
+                loader.get_event()
+                while not loader.check_event(yaml.SequenceEndEvent):
+                    yield loader.construct_document(loader.compose_node(None, None))
+                loader.get_event()
+        finally:
+            loader.dispose()
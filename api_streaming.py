@@ -0,0 +1,337 @@
+import hashlib
+import os
+import time
+from typing import Any, Dict, Iterable, Iterator, List
+
+from api_generator import GENERATOR_VERSION, GenerationHooks, KotlinCodeGenerator
+from api_ir import FeatureIR, GeneratorOptions, parse_network
+from api_spec import iter_features
+from api_templates import TEMPLATES
+from kotlin_dtos import DtoTable, Shape
+from kotlin_templates import generation_timestamp, TemplateRegistry
+
+
+class StreamedFile:
+    """An output file written piece by piece into a temporary file and moved into place when done"""
+    
+    def __init__(self, file_path: str, head: str, tail: str, separator: str):
+        self.file_path = file_path
+        self.size = 0
+        self.seconds = 0.0
+        self._tail = tail
+        self._separator = separator
+        self._empty = True
+        self._digest = hashlib.sha256()
+        self._tmp_path = f"{file_path}.tmp"
+        self._file = open(self._tmp_path, "w")
+        self._write(head)
+    
+    def _write(self, text: str):
+        start = time.perf_counter()
+        self.size += self._file.write(text)
+        self._digest.update(text.encode())
+        self.seconds += time.perf_counter() - start
+    
+    def write(self, piece: str):
+        if not self._empty:
+            self._write(self._separator)
+        self._empty = False
+        self._write(piece)
+    
+    def finish(self) -> str:
+        """Write the tail and return the sha256 of the whole content"""
+        self._write(self._tail)
+        self._file.close()
+        return self._digest.hexdigest()
+    
+    def commit(self):
+        os.replace(self._tmp_path, self.file_path)
+    
+    def discard(self):
+        self._file.close()
+        if os.path.exists(self._tmp_path):
+            os.remove(self._tmp_path)
+
+
+class StreamingKotlinCodeGenerator(KotlinCodeGenerator):
+    """Generates a contract feature by feature, for contracts too large to load at once.
+    
+    Features are read lazily and each one is pushed through every stage before
+    the next is parsed. Files that collect all features are written
+    incrementally, so memory does not grow with the size of the contract.
+    """
+    
+    # Stands in for the collected snippets when splitting a template around them
+    SECTION_MARK = "\0"
+    
+    def __init__(self, contract_path: str, feature_name: str, hooks: GenerationHooks = None,
+                 options: GeneratorOptions = None, templates: TemplateRegistry = None,
+                 shared_types: Dict[Shape, str] = None):
+        self.hooks = hooks or GenerationHooks()
+        self.options = options or GeneratorOptions()
+        self.templates = templates or TemplateRegistry(TEMPLATES)
+        self.contract_path = contract_path
+        self.feature_name = feature_name
+        self.base_package = "com.example.api"
+        self.timestamp = generation_timestamp()
+        # Grows with the distinct DTO shapes, not with the number of features
+        self.dto_table = DtoTable(shared_types)
+        # Known once the whole contract has been read, the network block may follow the features
+        self.network = None
+        self._output_dir = None
+        self._previous_files = {}
+        self._files = {}
+        self._changes = {}
+        self._fragments = {}
+        self._cached_fragments = {}
+    
+    def features(self, dto_table: DtoTable = None, settings: Dict[str, Any] = None) -> Iterator[FeatureIR]:
+        dto_table = self.dto_table if dto_table is None else dto_table
+        for feature in iter_features(self.contract_path, settings):
+            yield FeatureIR(feature, self.feature_name, dto_table)
+    
+    def compact_savings(self, features: Iterable[FeatureIR] = None) -> Dict[str, int]:
+        # Another pass over the file; a table of its own keeps the DTO names of that pass identical
+        return super().compact_savings(self.features(DtoTable(self.dto_table.shared)) if features is None else features)
+    
+    def generate_all(self, output_dir: str, force: bool = False):
+        """Generate all Kotlin files in a single pass over the contract"""
+        dirs = {name: os.path.join(output_dir, name) for name in ("dtos", "mappers", "datasources", "repositories")}
+        for path in dirs.values():
+            os.makedirs(path, exist_ok=True)
+        self._begin_manifest(output_dir, force)
+        
+        constant_template = self.templates.get("endpoint_constant")
+        sections = {
+            "endpoints": self._open_section(os.path.join(output_dir, f"{self.feature_name}ApiEndPoint.kt"),
+                                            "endpoint_constants", "constants", "\n"),
+            "datasource_interface": self._open_section(os.path.join(dirs["datasources"], f"{self.feature_name}RemoteDataSource.kt"),
+                                                       "datasource_interface", "methods", "\n\n"),
+            "datasource_impl": self._open_section(os.path.join(dirs["datasources"], f"{self.feature_name}RemoteDataSourceImpl.kt"),
+                                                  self._variant("datasource_impl"), "methods", "\n\n"),
+            "repository_interface": self._open_section(os.path.join(dirs["repositories"], f"{self.feature_name}Repository.kt"),
+                                                       "repository_interface", "methods", "\n\n"),
+            "repository_impl": self._open_section(os.path.join(dirs["repositories"], f"{self.feature_name}RepositoryImpl.kt"),
+                                                  self._variant("repository_impl"), "methods", "\n\n"),
+        }
+        json_file = os.path.join(dirs["dtos"], f"{self.feature_name}Json.kt")
+        self._emit_streamed(json_file, self._render_json())
+        dto_files = {json_file: None}
+        mapper_files = {}
+        
+        def emit_constant(feature: FeatureIR):
+            sections["endpoints"].write(self._render_constants(feature))
+        
+        def emit_dtos(feature: FeatureIR):
+            for dto in feature.dtos:
+                file_path = os.path.join(dirs["dtos"], f"{dto.name}.kt")
+                self._emit_streamed(file_path, self._generate_dto(dto, self._header([feature])))
+                dto_files[file_path] = None
+        
+        def emit_mappers(feature: FeatureIR):
+            for dto_class in feature.mapped_dtos:
+                mapper_name = f"{dto_class}Mapper"
+                file_path = os.path.join(dirs["mappers"], f"{mapper_name}.kt")
+                if file_path not in mapper_files:
+                    self._emit_streamed(file_path, self._render_mapper(dto_class, mapper_name))
+                    mapper_files[file_path] = None
+        
+        fan_out_file = os.path.join(dirs["datasources"], f"{self.feature_name}FanOut.kt")
+        fan_out = []
+        
+        def emit_datasource(feature: FeatureIR):
+            if feature.batch and not feature.batch.bulk_endpoint and not fan_out:
+                self._emit_streamed(fan_out_file, self.templates.render("fan_out", self))
+                fan_out.append(fan_out_file)
+            interface_method, impl_method = self._render_datasource_method(feature)
+            sections["datasource_interface"].write(interface_method)
+            sections["datasource_impl"].write(impl_method)
+        
+        def emit_repository(feature: FeatureIR):
+            interface_method, impl_method = self._render_repository_method(feature)
+            sections["repository_interface"].write(interface_method)
+            sections["repository_impl"].write(impl_method)
+        
+        sections["coalescing_datasource"] = self._open_section(
+            os.path.join(dirs["datasources"], f"{self.feature_name}CoalescingRemoteDataSource.kt"),
+            "coalescing_datasource", "methods", "\n\n")
+        coalesced = []
+        
+        def emit_coalescing(feature: FeatureIR):
+            if feature.coalesce:
+                coalesced.append(feature.action)
+                sections["coalescing_datasource"].write(self._render_coalescing_method(feature))
+        
+        sections["conditional_datasource"] = self._open_section(
+            os.path.join(dirs["datasources"], f"{self.feature_name}ConditionalRemoteDataSource.kt"),
+            "conditional_datasource", "methods", "\n\n")
+        validator_store_file = os.path.join(dirs["datasources"], f"{self.feature_name}ValidatorStore.kt")
+        conditional = []
+        
+        def emit_conditional(feature: FeatureIR):
+            if not feature.conditional:
+                return
+            if not conditional:
+                self._emit_streamed(validator_store_file, self._render_validator_store())
+            conditional.append(feature.action)
+            sections["conditional_datasource"].write(self._render_conditional_method(feature))
+        
+        sections["caching_repository"] = self._open_section(
+            os.path.join(dirs["repositories"], f"{self.feature_name}CachingRepository.kt"),
+            "caching_repository", "methods", "\n\n")
+        cached = []
+        pending_invalidations = {}
+        
+        def emit_caching(feature: FeatureIR):
+            if feature.cache:
+                cached.append(feature.action)
+            for due in self._due_caching_overrides(feature, pending_invalidations):
+                sections["caching_repository"].write(self._render_caching_method(due))
+        
+        paging_files = {}
+        
+        def emit_paging(feature: FeatureIR):
+            if not feature.paging:
+                return
+            if not paging_files:
+                # Only contracts with a paginated endpoint get the paging files
+                os.makedirs(os.path.join(output_dir, "paging"), exist_ok=True)
+                for part, suffix in (("interface", ""), ("impl", "Impl")):
+                    file_path = os.path.join(dirs["repositories"], f"{self.feature_name}PagingRepository{suffix}.kt")
+                    sections[f"paging_repository_{part}"] = self._open_section(
+                        file_path, f"paging_repository_{part}", "methods", "\n\n")
+            file_path = os.path.join(output_dir, "paging", f"{self._paging_source_class(feature)}.kt")
+            self._emit_streamed(file_path, self._render_paging_source(feature))
+            paging_files[file_path] = None
+            interface_method, impl_method = self._render_paging_method(feature)
+            sections["paging_repository_interface"].write(interface_method)
+            sections["paging_repository_impl"].write(impl_method)
+        
+        stages = [
+            ("endpoints", emit_constant),
+            ("dtos", emit_dtos),
+            ("mappers", emit_mappers),
+            ("datasources", emit_datasource),
+            ("repositories", emit_repository),
+            ("coalescing", emit_coalescing),
+            ("conditional", emit_conditional),
+            ("caching", emit_caching),
+            ("paging", emit_paging),
+        ]
+        timings = dict.fromkeys(["load"] + [stage for stage, _ in stages], 0.0)
+        settings = {}
+        features = self.features(settings=settings)
+        count = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                feature = next(features, None)
+                timings["load"] += time.perf_counter() - start
+                if feature is None:
+                    break
+                count += 1
+                for stage, emit in stages:
+                    start = time.perf_counter()
+                    emit(feature)
+                    timings[stage] += time.perf_counter() - start
+            
+            # The network block may follow the features, so it is only complete now; an invalid one
+            # must discard the sections like any other contract error
+            start = time.perf_counter()
+            network_files = []
+            self.network = parse_network(settings.get("network"), self.options.network)
+            if self.network is not None:
+                for file_path, render in self._network_files(output_dir):
+                    self._emit_streamed(file_path, render())
+                    network_files.append(file_path)
+            timings["network"] = time.perf_counter() - start
+        except BaseException:
+            for section in sections.values():
+                section.discard()
+            raise
+        
+        start = time.perf_counter()
+        # Without a flagged endpoint there is nothing to decorate
+        if not coalesced:
+            sections.pop("coalescing_datasource").discard()
+        if not conditional:
+            sections.pop("conditional_datasource").discard()
+        if not cached:
+            sections.pop("caching_repository").discard()
+        for section in sections.values():
+            self._finish_section(section)
+        timings["manifest"] = time.perf_counter() - start
+        with self._stage("manifest"):
+            changes = self._finish_manifest()
+        
+        self.hooks.count("features", count)
+        for stage, seconds in timings.items():
+            self.hooks.stage_finished(stage, seconds)
+        for kind, files in changes.items():
+            self.hooks.count(f"files_{kind}", len(files))
+        
+        return {
+            "endpoint_constants": sections["endpoints"].file_path,
+            "dtos": list(dto_files),
+            "mappers": list(mapper_files),
+            "remote_datasources": [sections["datasource_interface"].file_path, sections["datasource_impl"].file_path] + fan_out,
+            "repositories": [sections["repository_interface"].file_path, sections["repository_impl"].file_path],
+            "coalescing": [sections["coalescing_datasource"].file_path] if coalesced else [],
+            "conditional": [sections["conditional_datasource"].file_path, validator_store_file] if conditional else [],
+            "caching": [sections["caching_repository"].file_path] if cached else [],
+            "paging": list(paging_files) + [sections[name].file_path for name in ("paging_repository_interface",
+                                                                                  "paging_repository_impl") if name in sections],
+            "network": network_files,
+            "changes": changes
+        }
+    
+    def _open_section(self, file_path: str, template: str, placeholder: str, separator: str) -> StreamedFile:
+        """Start a file whose placeholder is filled with snippets as features stream in"""
+        rendered = self.templates.render(template, self, **{placeholder: self.SECTION_MARK})
+        head, _, tail = rendered.partition(self.SECTION_MARK)
+        return StreamedFile(file_path, head, tail, separator)
+    
+    def _finish_section(self, section: StreamedFile):
+        digest = section.finish()
+        existed = os.path.exists(section.file_path)
+        unchanged = self._unchanged(section.file_path, digest)
+        if unchanged:
+            section.discard()
+        else:
+            section.commit()
+            self.hooks.file_written(section.file_path, section.size, section.seconds)
+        self._record(section.file_path, digest, "skipped" if unchanged else "changed" if existed else "added")
+    
+    def _emit_streamed(self, file_path: str, content: str):
+        digest = hashlib.sha256(content.encode()).hexdigest()
+        if self._unchanged(file_path, digest):
+            kind = "skipped"
+        else:
+            kind = "changed" if os.path.exists(file_path) else "added"
+            self._write_file(file_path, content)
+        self._record(file_path, digest, kind)
+    
+    def _unchanged(self, file_path: str, digest: str) -> bool:
+        """Check the manifest of the previous run to avoid rewriting identical files"""
+        previous = self._previous_files.get(os.path.relpath(file_path, self._output_dir))
+        return bool(previous) and previous["sha256"] == digest and self._matches_disk(file_path, previous)
+    
+    def _record(self, file_path: str, digest: str, kind: str):
+        """Add a file to the manifest and the change report"""
+        rel_path = os.path.relpath(file_path, self._output_dir)
+        self._changes[kind].append(file_path)
+        stat = os.stat(file_path)
+        # No inputs key, the next incremental run renders these files once and compares content
+        self._files[rel_path] = {
+            "inputs": None,
+            "sha256": digest,
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns
+        }
+    
+    def _finish_manifest(self) -> Dict[str, List[str]]:
+        """Remove outputs that are no longer generated and persist the new manifest"""
+        self._remove_stale_files()
+        self._write_manifest({"generator": GENERATOR_VERSION, "files": self._files})
+        self._previous_files = self._files
+        return self._changes
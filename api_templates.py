@@ -0,0 +1,666 @@
+TEMPLATES = {
+    "endpoint_constants": """package ${base_package}.endpoint
+
+internal object ${feature_name}ApiEndPoint {
+${constants}
+}
+""",
+    "endpoint_constant": '    const val ${endpoint_constant} = "${endpoint}"',
+    "dto": """package ${base_package}.dtos
+
+${imports}
+
+/**
+ * ${header}
+ */
+@Serializable
+data class ${class_name}(
+${properties}
+)
+""",
+    "dto_property": '    @SerialName("${serial_name}") val ${name}: ${kotlin_type}',
+    "dto_enum": """package ${base_package}.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * ${header}
+ */
+@Serializable
+enum class ${class_name} {
+${constants}
+}
+""",
+    "dto_enum_constant": '    @SerialName("${serial_name}") ${name}',
+    "json": """package ${base_package}.dtos
+
+import kotlinx.serialization.json.Json
+
+/**
+ * ${header}
+ */
+internal val ${feature_name}Json = Json {
+    ignoreUnknownKeys = true
+}
+""",
+    "dto_alias": """package ${base_package}.dtos
+
+/**
+ * ${header}
+ */
+typealias ${name} = ${class_name}
+""",
+    "mapper": """package ${base_package}.mappers
+
+import ${base_package}.dtos.${dto_class}
+import ${base_package}.domain.models.${feature_name}Model
+
+internal class ${mapper_name} {
+    fun ${receiver}.toDomain(): ${feature_name}Model {
+        return ${feature_name}Model(
+            // TODO: Map DTO properties to domain model properties
+        )
+    }
+}
+""",
+    "datasource_interface": """package ${base_package}.datasources
+
+import ${base_package}.dtos.*
+import ${base_package}.network.ApiResponse
+
+internal interface ${feature_name}RemoteDataSource {
+${methods}
+}
+""",
+    "datasource_impl": """package ${base_package}.datasources
+
+import ${base_package}.dtos.*
+import ${base_package}.endpoint.${feature_name}ApiEndPoint
+import ${base_package}.network.ApiResponse
+import ${base_package}.network.HttpException
+import ${base_package}.network.HttpService
+
+internal class ${feature_name}RemoteDataSourceImpl(
+    private val httpService: HttpService,
+) : ${feature_name}RemoteDataSource {
+${methods}
+}
+""",
+    "datasource_interface_method": "    suspend fun ${action}(${signature}): ApiResponse<${return_type}>",
+    "datasource_impl_method": """    override suspend fun ${action}(${signature}): ApiResponse<${return_type}> {
+        return try {
+            httpService.${http_method}(
+                path = ${feature_name}ApiEndPoint.${endpoint_constant},
+                ${call_params},
+                ${query_params}
+            ).transformResult { response ->
+                ApiResponse.Success(${feature_name}Json.decodeFromString<${return_type}>(response))
+            }
+        } catch (e: HttpException) {
+            e.toApiResponse()
+        } catch (e: Exception) {
+            ApiResponse.Error(e)
+        }
+    }""",
+    "repository_interface": """package ${base_package}.repositories
+
+import ${base_package}.domain.models.${feature_name}Model
+import com.example.core.State
+
+interface ${feature_name}Repository {
+${methods}
+}
+""",
+    "repository_impl": """package ${base_package}.repositories
+
+import ${base_package}.datasources.${feature_name}RemoteDataSource
+import ${base_package}.domain.models.${feature_name}Model
+import ${base_package}.network.ApiResponse
+import com.example.core.State
+
+internal class ${feature_name}RepositoryImpl(
+    private val remoteDataSource: ${feature_name}RemoteDataSource,
+    private val userDataStore: UserDataStore,
+) : ${feature_name}Repository {
+${methods}
+}
+""",
+    "repository_interface_method": "    suspend fun ${action}(${signature}): State<${domain_type}, Nothing, Nothing>",
+    "repository_impl_method": """    override suspend fun ${action}(${signature}): State<${domain_type}, Nothing, Nothing> {
+        return try {
+            when (val result = remoteDataSource.${action}(${call_params})) {
+                is ApiResponse.Error -> {
+                    State.Error(message = result.exception.message.orEmpty())
+                }
+                is ApiResponse.Failed -> {
+                    State.Error(
+                        message = result.errorDetail.message,
+                        messageTitle = result.errorDetail.messageTitle,
+                        iconCode = result.errorDetail.iconCode
+                    )
+                }
+                is ApiResponse.Success -> {
+                    State.Success(data = result.data${to_domain})
+                }
+            }
+        } catch (e: Exception) {
+            State.Error(e.message.orEmpty())
+        }
+    }""",
+    # --compact: the try/catch and result handling live in one helper per file
+    "datasource_impl_compact": """package ${base_package}.datasources
+
+import ${base_package}.dtos.*
+import ${base_package}.endpoint.${feature_name}ApiEndPoint
+import ${base_package}.network.ApiResponse
+import ${base_package}.network.HttpException
+import ${base_package}.network.HttpService
+
+internal class ${feature_name}RemoteDataSourceImpl(
+    private val httpService: HttpService,
+) : ${feature_name}RemoteDataSource {
+${methods}
+
+    private inline fun <T> safeCall(call: () -> ApiResponse<T>): ApiResponse<T> = try {
+        call()
+    } catch (e: HttpException) {
+        e.toApiResponse()
+    } catch (e: Exception) {
+        ApiResponse.Error(e)
+    }
+
+    private inline fun <reified T> decode(response: String): ApiResponse<T> =
+        ApiResponse.Success(${feature_name}Json.decodeFromString(response))
+}
+""",
+    "datasource_impl_method_compact": """    override suspend fun ${action}(${signature}): ApiResponse<${return_type}> =
+        safeCall { httpService.${http_method}(${call_arguments}).transformResult { decode(it) } }""",
+    "repository_impl_compact": """package ${base_package}.repositories
+
+import ${base_package}.datasources.${feature_name}RemoteDataSource
+import ${base_package}.domain.models.${feature_name}Model
+import ${base_package}.network.ApiResponse
+import com.example.core.State
+
+internal class ${feature_name}RepositoryImpl(
+    private val remoteDataSource: ${feature_name}RemoteDataSource,
+    private val userDataStore: UserDataStore,
+) : ${feature_name}Repository {
+${methods}
+
+    private inline fun <T, R> toState(
+        call: () -> ApiResponse<T>,
+        toDomain: (T) -> R
+    ): State<R, Nothing, Nothing> = try {
+        when (val result = call()) {
+            is ApiResponse.Error -> State.Error(message = result.exception.message.orEmpty())
+            is ApiResponse.Failed -> State.Error(
+                message = result.errorDetail.message,
+                messageTitle = result.errorDetail.messageTitle,
+                iconCode = result.errorDetail.iconCode
+            )
+            is ApiResponse.Success -> State.Success(data = toDomain(result.data))
+        }
+    } catch (e: Exception) {
+        State.Error(e.message.orEmpty())
+    }
+}
+""",
+    "repository_impl_method_compact": """    override suspend fun ${action}(${signature}): State<${domain_type}, Nothing, Nothing> =
+        toState({ remoteDataSource.${action}(${call_params}) }) { data -> data${to_domain} }""",
+    "paging_source": """package ${base_package}.paging
+
+import androidx.paging.PagingSource
+import androidx.paging.PagingState
+import ${base_package}.datasources.${feature_name}RemoteDataSource
+import ${base_package}.dtos.${item_type}
+import ${base_package}.network.ApiResponse
+
+/**
+ * ${header}
+ */
+internal class ${source_class}(
+    private val remoteDataSource: ${feature_name}RemoteDataSource,${source_properties}
+) : PagingSource<Int, ${item_type}>() {
+
+    override fun getRefreshKey(state: PagingState<Int, ${item_type}>): Int? =
+        state.anchorPosition?.let { anchor ->
+            state.closestPageToPosition(anchor)?.let { page -> page.prevKey?.plus(1) ?: page.nextKey?.minus(1) }
+        }
+
+    override suspend fun load(params: LoadParams<Int>): LoadResult<Int, ${item_type}> {
+        val page = params.key ?: ${first_page}
+        return when (val result = remoteDataSource.${action}(${call_params})) {
+            is ApiResponse.Success -> LoadResult.Page(
+                data = result.data,
+                prevKey = if (page == ${first_page}) null else page - 1,
+                nextKey = if (result.data.size < params.loadSize) null else page + 1
+            )
+            is ApiResponse.Error -> LoadResult.Error(result.exception)
+            is ApiResponse.Failed -> LoadResult.Error(IllegalStateException(result.errorDetail.message))
+        }
+    }
+}
+""",
+    "paging_repository_interface": """package ${base_package}.repositories
+
+import androidx.paging.PagingData
+import ${base_package}.domain.models.${feature_name}Model
+import kotlinx.coroutines.flow.Flow
+
+interface ${feature_name}PagingRepository {
+${methods}
+}
+""",
+    "paging_repository_impl": """package ${base_package}.repositories
+
+import androidx.paging.Pager
+import androidx.paging.PagingConfig
+import androidx.paging.PagingData
+import androidx.paging.map
+import ${base_package}.datasources.${feature_name}RemoteDataSource
+import ${base_package}.domain.models.${feature_name}Model
+import ${base_package}.paging.*
+import kotlinx.coroutines.flow.Flow
+import kotlinx.coroutines.flow.map
+
+internal class ${feature_name}PagingRepositoryImpl(
+    private val remoteDataSource: ${feature_name}RemoteDataSource,
+) : ${feature_name}PagingRepository {
+${methods}
+}
+""",
+    "datasource_batch_interface_method": "    suspend fun ${batch_action}(${batch_signature}): ApiResponse<List<${item_type}>>",
+    "datasource_batch_impl_method": """    override suspend fun ${batch_action}(${batch_parameters}): ApiResponse<List<${item_type}>> =
+        ${feature_name}FanOut.map(${ids_name}, concurrency = ${concurrency}) { ${id_name} -> ${action}(${single_call_params}) }""",
+    "datasource_bulk_impl_method": """    override suspend fun ${batch_action}(${batch_parameters}): ApiResponse<List<${item_type}>> {
+        return try {
+            httpService.${bulk_method}(
+                path = ${feature_name}ApiEndPoint.${bulk_constant},
+                ${bulk_params}
+            ).transformResult { response ->
+                ApiResponse.Success(${feature_name}Json.decodeFromString<List<${item_type}>>(response))
+            }
+        } catch (e: HttpException) {
+            e.toApiResponse()
+        } catch (e: Exception) {
+            ApiResponse.Error(e)
+        }
+    }""",
+    "datasource_bulk_impl_method_compact": """    override suspend fun ${batch_action}(${batch_parameters}): ApiResponse<List<${item_type}>> =
+        safeCall { httpService.${bulk_method}(path = ${feature_name}ApiEndPoint.${bulk_constant}, ${bulk_params}).transformResult { decode(it) } }""",
+    "fan_out": """package ${base_package}.datasources
+
+import ${base_package}.network.ApiResponse
+import kotlinx.coroutines.async
+import kotlinx.coroutines.awaitAll
+import kotlinx.coroutines.coroutineScope
+import kotlinx.coroutines.sync.Semaphore
+import kotlinx.coroutines.sync.withPermit
+
+internal object ${feature_name}FanOut {
+    /**
+     * Calls once per id, at most concurrency calls at a time. Succeeds with the
+     * results in id order when every call succeeds, otherwise returns the first failure.
+     */
+    @Suppress("UNCHECKED_CAST")
+    suspend fun <T> map(
+        ids: List<String>,
+        concurrency: Int,
+        call: suspend (String) -> ApiResponse<T>
+    ): ApiResponse<List<T>> = coroutineScope {
+        val permits = Semaphore(concurrency)
+        val responses = ids.map { id -> async { permits.withPermit { call(id) } } }.awaitAll()
+        val failure = responses.firstOrNull { it !is ApiResponse.Success }
+        if (failure != null) {
+            failure as ApiResponse<List<T>>
+        } else {
+            ApiResponse.Success(responses.map { (it as ApiResponse.Success<T>).data })
+        }
+    }
+}
+""",
+    "repository_batch_interface_method": "    suspend fun ${batch_action}(${batch_signature}): State<List<${feature_name}Model>, Nothing, Nothing>",
+    "repository_batch_impl_method": """    override suspend fun ${batch_action}(${batch_parameters}): State<List<${feature_name}Model>, Nothing, Nothing> {
+        return try {
+            when (val result = remoteDataSource.${batch_action}(${batch_call_params})) {
+                is ApiResponse.Error -> {
+                    State.Error(message = result.exception.message.orEmpty())
+                }
+                is ApiResponse.Failed -> {
+                    State.Error(
+                        message = result.errorDetail.message,
+                        messageTitle = result.errorDetail.messageTitle,
+                        iconCode = result.errorDetail.iconCode
+                    )
+                }
+                is ApiResponse.Success -> {
+                    State.Success(data = result.data.map { it.toDomain() })
+                }
+            }
+        } catch (e: Exception) {
+            State.Error(e.message.orEmpty())
+        }
+    }""",
+    "repository_batch_impl_method_compact": """    override suspend fun ${batch_action}(${batch_parameters}): State<List<${feature_name}Model>, Nothing, Nothing> =
+        toState({ remoteDataSource.${batch_action}(${batch_call_params}) }) { data -> data.map { it.toDomain() } }""",
+    "coalescing_datasource": """package ${base_package}.datasources
+
+import ${base_package}.dtos.*
+import ${base_package}.network.ApiResponse
+import kotlinx.coroutines.CoroutineScope
+import kotlinx.coroutines.Deferred
+import kotlinx.coroutines.async
+import kotlinx.coroutines.sync.Mutex
+import kotlinx.coroutines.sync.withLock
+
+internal class ${feature_name}CoalescingRemoteDataSource(
+    private val delegate: ${feature_name}RemoteDataSource,
+    private val scope: CoroutineScope,
+) : ${feature_name}RemoteDataSource by delegate {
+    private val mutex = Mutex()
+    private val inFlight = HashMap<Any, Deferred<ApiResponse<*>>>()
+
+${methods}
+
+    // Callers with the same key await one call; it runs in scope, so a cancelled caller does not cancel the others
+    @Suppress("UNCHECKED_CAST")
+    private suspend fun <T> coalesce(key: Any, call: suspend () -> ApiResponse<T>): ApiResponse<T> {
+        val deferred = mutex.withLock {
+            inFlight.getOrPut(key) {
+                scope.async {
+                    try {
+                        call()
+                    } finally {
+                        mutex.withLock { inFlight.remove(key) }
+                    }
+                }
+            }
+        }
+        return deferred.await() as ApiResponse<T>
+    }
+}
+""",
+    "coalescing_datasource_method": """    override suspend fun ${action}(${parameters}): ApiResponse<${return_type}> =
+        coalesce(listOf<Any?>("${action}"${key_args})) { delegate.${action}(${call_args}) }""",
+    "conditional_datasource": """package ${base_package}.datasources
+
+import ${base_package}.dtos.*
+import ${base_package}.endpoint.${feature_name}ApiEndPoint
+import ${base_package}.network.ApiResponse
+import io.ktor.client.HttpClient
+import io.ktor.client.request.get
+import io.ktor.client.request.header
+import io.ktor.client.request.parameter
+import io.ktor.client.statement.HttpResponse
+import io.ktor.client.statement.bodyAsText
+import io.ktor.http.HttpHeaders
+import io.ktor.http.HttpStatusCode
+import io.ktor.http.encodeURLPathPart
+import io.ktor.http.isSuccess
+
+/**
+ * Sends GETs with the validators of their last response, so a 304 Not Modified is
+ * answered from store without downloading or decoding the body again. Paths are
+ * relative to the default request URL of client.
+ *
+ * Other error statuses are passed to mapError without a second request. Give it the
+ * mapping the HttpService of delegate applies to failed calls, so both report errors
+ * alike, e.g. { response -> HttpException(...).toApiResponse() } with the constructor
+ * of your HttpException. Only a 304 arriving with nothing stored, which this client
+ * never asked for, is sent again through delegate.
+ */
+internal class ${feature_name}ConditionalRemoteDataSource(
+    private val delegate: ${feature_name}RemoteDataSource,
+    private val client: HttpClient,
+    private val store: ${feature_name}ValidatorStore,
+    private val mapError: suspend (HttpResponse) -> ApiResponse<*>,
+) : ${feature_name}RemoteDataSource by delegate {
+${methods}
+
+    @Suppress("UNCHECKED_CAST")
+    private suspend inline fun <reified T : Any> conditionalGet(
+        key: String,
+        path: String,
+        query: Map<String, Any?>,
+        fallback: () -> ApiResponse<T>,
+    ): ApiResponse<T> {
+        val stored = store.get(key)
+        val response = try {
+            client.get(path) {
+                query.forEach { (name, value) -> if (value != null) parameter(name, value) }
+                stored?.etag?.let { header(HttpHeaders.IfNoneMatch, it) }
+                stored?.lastModified?.let { header(HttpHeaders.IfModifiedSince, it) }
+            }
+        } catch (e: Exception) {
+            return ApiResponse.Error(e)
+        }
+        return try {
+            when {
+                response.status == HttpStatusCode.NotModified -> if (stored != null) {
+                    ApiResponse.Success(
+                        stored.value as T? ?: ${feature_name}Json.decodeFromString<T>(stored.body).also { stored.value = it }
+                    )
+                } else {
+                    fallback()
+                }
+                response.status.isSuccess() -> {
+                    val body = response.bodyAsText()
+                    val value = ${feature_name}Json.decodeFromString<T>(body)
+                    val etag = response.headers[HttpHeaders.ETag]
+                    val lastModified = response.headers[HttpHeaders.LastModified]
+                    if (etag != null || lastModified != null) {
+                        store.put(key, ${feature_name}ValidatorStore.Entry(etag, lastModified, body).also { it.value = value })
+                    }
+                    ApiResponse.Success(value)
+                }
+                else -> mapError(response) as ApiResponse<T>
+            }
+        } catch (e: Exception) {
+            ApiResponse.Error(e)
+        }
+    }
+}
+""",
+    "conditional_datasource_method": """    override suspend fun ${action}(${parameters}): ApiResponse<${return_type}> =
+        conditionalGet(
+            key = listOf<Any?>("${action}"${key_args}).toString(),
+            path = ${feature_name}ApiEndPoint.${endpoint_constant}${path_substitutions},
+            query = ${query},
+        ) { delegate.${action}(${call_args}) }""",
+    "validator_store": """package ${base_package}.datasources
+
+import ${base_package}.dtos.*
+import kotlinx.coroutines.sync.Mutex
+import kotlinx.coroutines.sync.withLock
+import kotlinx.serialization.Serializable
+import kotlinx.serialization.Transient
+import kotlinx.serialization.encodeToString
+import okio.ByteString.Companion.encodeUtf8
+import okio.FileSystem
+import okio.IOException
+import okio.Path
+
+/**
+ * ETag and Last-Modified validators of conditional GETs, each with the body it validates.
+ * At most maxEntries responses are kept in memory, least recently used dropped first, and
+ * as files under directory, least recently written dropped first. A body read back from
+ * disk is decoded once; later 304s reuse the decoded value.
+ */
+internal class ${feature_name}ValidatorStore(
+    private val directory: Path,
+    private val maxEntries: Int = ${max_entries},
+    private val fileSystem: FileSystem = FileSystem.SYSTEM,
+) {
+    @Serializable
+    class Entry(val etag: String?, val lastModified: String?, val body: String) {
+        @Transient
+        var value: Any? = null
+    }
+
+    private val mutex = Mutex()
+    private val entries = LinkedHashMap<String, Entry>(16, 0.75f, true)
+
+    suspend fun get(key: String): Entry? = mutex.withLock {
+        entries[key] ?: read(key)?.also { remember(key, it) }
+    }
+
+    suspend fun put(key: String, entry: Entry) = mutex.withLock {
+        remember(key, entry)
+        // The store only saves bandwidth, a failed write loses nothing else
+        try {
+            fileSystem.createDirectories(directory)
+            fileSystem.write(file(key)) { writeUtf8(${feature_name}Json.encodeToString(entry)) }
+            prune()
+        } catch (e: IOException) {
+        }
+    }
+
+    private fun remember(key: String, entry: Entry) {
+        entries[key] = entry
+        val eldest = entries.keys.iterator()
+        while (entries.size > maxEntries) {
+            eldest.next()
+            eldest.remove()
+        }
+    }
+
+    private fun read(key: String): Entry? = try {
+        fileSystem.read(file(key)) { ${feature_name}Json.decodeFromString<Entry>(readUtf8()) }
+    } catch (e: Exception) {
+        null
+    }
+
+    private fun prune() {
+        val files = fileSystem.list(directory)
+        if (files.size <= maxEntries) return
+        files.sortedBy { fileSystem.metadataOrNull(it)?.lastModifiedAtMillis ?: 0L }
+            .take(files.size - maxEntries)
+            .forEach { fileSystem.delete(it) }
+    }
+
+    private fun file(key: String): Path = directory / "$${key.encodeUtf8().sha256().hex()}.json"
+}
+""",
+    "caching_repository": """package ${base_package}.repositories
+
+import ${base_package}.domain.models.${feature_name}Model
+import ${base_package}.dtos.*
+import com.example.core.State
+import kotlinx.coroutines.sync.Mutex
+import kotlinx.coroutines.sync.withLock
+
+internal class ${feature_name}CachingRepository(
+    private val delegate: ${feature_name}Repository,
+    private val clock: () -> Long = { System.currentTimeMillis() },
+) : ${feature_name}Repository by delegate {
+    private val caches = mutableListOf<ResponseCache<*>>()
+
+${methods}
+
+    private fun <T> cache(resource: String, ttlMillis: Long, maxEntries: Int) =
+        ResponseCache<T>(resource, ttlMillis, maxEntries).also { caches += it }
+
+    private suspend fun invalidate(resource: String) {
+        caches.filter { it.resource == resource }.forEach { it.clear() }
+    }
+
+    private class ResponseCache<T>(val resource: String, private val ttlMillis: Long, private val maxEntries: Int) {
+        private val mutex = Mutex()
+        // Access ordered, so the first entry is the least recently used
+        private val entries = LinkedHashMap<Any, Pair<Long, State<T, Nothing, Nothing>>>(16, 0.75f, true)
+
+        suspend fun get(key: Any, now: Long): State<T, Nothing, Nothing>? = mutex.withLock {
+            val (storedAt, value) = entries[key] ?: return@withLock null
+            if (now - storedAt < ttlMillis) value else {
+                entries.remove(key)
+                null
+            }
+        }
+
+        suspend fun put(key: Any, now: Long, value: State<T, Nothing, Nothing>) = mutex.withLock {
+            entries[key] = now to value
+            if (entries.size > maxEntries) entries.remove(entries.keys.first())
+        }
+
+        suspend fun clear() = mutex.withLock { entries.clear() }
+    }
+}
+""",
+    "caching_repository_cached_method": """    private val ${action}Cache = cache<${domain_type}>("${resource}", ttlMillis = ${ttl_millis}L, maxEntries = ${max_entries})
+
+    override suspend fun ${action}(${parameters}): State<${domain_type}, Nothing, Nothing> {
+        val key = ${cache_key}
+        ${action}Cache.get(key, clock())?.let { return it }
+        return delegate.${action}(${call_args}).also { result ->
+            if (result is State.Success) ${action}Cache.put(key, clock(), result)
+        }
+    }""",
+    "caching_repository_invalidating_method": """    override suspend fun ${action}(${parameters}): State<${domain_type}, Nothing, Nothing> =
+        delegate.${action}(${call_args}).also { result ->
+            if (result is State.Success) invalidate("${resource}")
+        }""",
+    "paging_repository_interface_method": "    fun ${action}Paged(${signature}): Flow<PagingData<${feature_name}Model>>",
+    # Initial load is one page, so page numbers and loadSize stay in step
+    "paging_repository_impl_method": """    override fun ${action}Paged(${parameters}): Flow<PagingData<${feature_name}Model>> = Pager(
+        config = PagingConfig(pageSize = ${page_size}, prefetchDistance = ${prefetch_distance}, initialLoadSize = ${page_size}),
+        pagingSourceFactory = { ${source_class}(${source_args}) }
+    ).flow.map { page -> page.map { it.toDomain() } }""",
+    "network_client": """package ${base_package}.network
+
+${imports}
+
+/**
+ * ${header}
+ *
+ * Ktor client of the ${feature_name} endpoints. Up to ${pool_size} idle connections are kept
+ * alive for ${keep_alive_seconds}s; at most ${max_requests} calls run at once, ${max_requests_per_host} per host.
+ */
+internal fun create${feature_name}HttpClient(): HttpClient = HttpClient(OkHttp) {
+    engine {
+        config {
+            connectionPool(ConnectionPool(${pool_size}, ${keep_alive_seconds}, TimeUnit.SECONDS))
+            dispatcher(Dispatcher().apply {
+                maxRequests = ${max_requests}
+                maxRequestsPerHost = ${max_requests_per_host}
+            })
+            protocols(listOf(${protocols}))
+            retryOnConnectionFailure(true)
+        }
+    }
+    install(HttpTimeout) {
+        connectTimeoutMillis = ${connect_timeout_ms}
+        requestTimeoutMillis = ${request_timeout_ms}
+        socketTimeoutMillis = ${socket_timeout_ms}
+    }${compression}
+}
+""",
+    "network_client_compression": """
+    install(ContentEncoding) {
+        gzip()
+        deflate()
+    }""",
+    "network_module": """package ${base_package}.di
+
+import ${base_package}.datasources.${feature_name}RemoteDataSource
+import ${base_package}.datasources.${feature_name}RemoteDataSourceImpl
+import ${base_package}.network.HttpService
+import ${base_package}.network.create${feature_name}HttpClient
+import org.koin.core.qualifier.named
+import org.koin.dsl.module
+
+/**
+ * ${header}
+ *
+ * Gives the ${feature_name} data source an HttpService of its own, on the client
+ * configured by create${feature_name}HttpClient. The client is closed with the Koin scope.
+ */
+val ${module_name} = module {
+    single(named("${feature_name}")) { create${feature_name}HttpClient() } onClose { it?.close() }
+    single<${feature_name}RemoteDataSource> {
+        ${feature_name}RemoteDataSourceImpl(HttpService(get(named("${feature_name}"))))
+    }
+}
+""",
+}
@@ -0,0 +1,67 @@
+"""Entry point for every generator; a subcommand imports its generator only when it runs"""
+import os
+import sys
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Subcommand -> (module name, script relative to ROOT, summary)
+COMMANDS = {
+    "module": ("generate_module", "generate-module.py", "Scaffold KMP feature modules"),
+    "datalayer": ("api_codegen", os.path.join("test", "api_codegen.py"),
+                  "Generate the data layer from a YAML API contract"),
+    "retrofit": ("generate_data_layer", os.path.join("test", "generate-data-layer.py"),
+                 "Generate a Retrofit data layer from a YAML API contract"),
+    "openapi": ("openapi_import", os.path.join("test", "openapi_import.py"),
+                "Convert an OpenAPI 3 document into a YAML API contract"),
+    "client": ("codegen_client", os.path.join("test", "codegen_client.py"),
+               "Generate through a running codegen server"),
+    "bench": ("benchmark_codegen", os.path.join("test", "benchmark_codegen.py"),
+              "Benchmark the generators on synthetic contracts"),
+}
+
+
+def usage() -> str:
+    width = max(len(name) for name in COMMANDS)
+    lines = [f"usage: {os.path.basename(sys.argv[0])} <command> [options]", "", "commands:"]
+    for name, (_, _, summary) in COMMANDS.items():
+        lines.append(f"  {name:<{width}}  {summary}")
+    lines.append("")
+    lines.append("Run '<command> --help' for the options of a command.")
+    return "\n".join(lines)
+
+
+def load_command(name: str):
+    """Import the generator behind a subcommand.
+
+    Registered under its module name so worker processes can unpickle functions
+    from it. The shared modules next to this file are importable because its
+    directory is the first entry of sys.path.
+    """
+    module_name, script, _ = COMMANDS[name]
+    module = sys.modules.get(module_name)
+    if module is None:
+        import importlib.util
+        path = os.path.join(ROOT, script)
+        spec = importlib.util.spec_from_file_location(module_name, path)
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[module_name] = module
+        spec.loader.exec_module(module)
+    return module
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0 if argv else 2
+    command = argv[0]
+    if command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        print(f"\nerror: unknown command '{command}'", file=sys.stderr)
+        return 2
+    load_command(command).main(argv[1:], prog=f"{os.path.basename(sys.argv[0])} {command}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,179 @@
+import json
+import os
+import threading
+import time
+import traceback
+from typing import Any, Dict
+
+import yaml
+
+from api_generator import GENERATOR_VERSION, KotlinCodeGenerator
+from api_ir import DEFAULT_FANOUT_CONCURRENCY, DEFAULT_PAGE_SIZE, GeneratorOptions
+from api_spec import DEFAULT_CACHE_DIR
+from api_templates import TEMPLATES
+from kotlin_templates import TemplateRegistry
+
+
+DEFAULT_SERVER_PORT = 8765
+# What a bad contract or output path raises while generating; reported, not fatal
+CONTRACT_ERRORS = (OSError, yaml.YAMLError, KeyError, TypeError, ValueError, AttributeError)
+# Host headers a server bound to one address accepts besides that address
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+# Bind addresses that listen on every interface, where any Host header is accepted
+WILDCARD_HOSTS = ("", "0.0.0.0", "::")
+
+
+class CodegenService:
+    """Generates contracts on request, keeping the generators of recent requests warm.
+    
+    A repeated request reuses the parsed contract, compiled templates, in-memory
+    manifest and rendered fragments of the previous one; the contract file is
+    re-read every time and only reloaded when its content changed. Template
+    override directories are read once, restart the service after editing them.
+    """
+    
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, max_sessions: int = 32):
+        self.cache_dir = cache_dir
+        self.max_sessions = max_sessions
+        self.started = time.time()
+        self.requests = 0
+        # Session key -> [generator, contract content, lock], least recently used first
+        self._sessions = {}
+        self._templates = {}
+        self._lock = threading.Lock()
+    
+    def generate(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Handle {"contract", "feature", "output", "force", "reproducible", "provenance", "templates"}"""
+        start = time.perf_counter()
+        contract_path = os.path.abspath(request["contract"])
+        feature_name = request["feature"]
+        output_dir = os.path.abspath(request.get("output") or "generated")
+        options = GeneratorOptions(bool(request.get("reproducible")), bool(request.get("provenance")),
+                                   bool(request.get("compact")), int(request.get("page_size") or DEFAULT_PAGE_SIZE),
+                                   request.get("prefetch_distance"),
+                                   int(request.get("fanout_concurrency") or DEFAULT_FANOUT_CONCURRENCY),
+                                   request.get("network"))
+        template_dir = os.path.abspath(request["templates"]) if request.get("templates") else None
+        key = (contract_path, feature_name, output_dir, options.fingerprint(), template_dir)
+        
+        with self._lock:
+            self.requests += 1
+            session = self._sessions.pop(key, None) or [None, None, threading.Lock()]
+            self._sessions[key] = session
+            while len(self._sessions) > self.max_sessions:
+                del self._sessions[next(iter(self._sessions))]
+            templates = self._templates.get(template_dir)
+            if templates is None:
+                templates = self._templates[template_dir] = TemplateRegistry(TEMPLATES, template_dir)
+        
+        # Requests for different outputs run in parallel, the same output one at a time
+        with session[2]:
+            with open(contract_path, "r") as file:
+                yaml_content = file.read()
+            generator = session[0]
+            if generator is None:
+                generator = KotlinCodeGenerator(yaml_content, feature_name, self.cache_dir, options=options,
+                                                templates=templates)
+            elif yaml_content != session[1]:
+                generator.reload(yaml_content)
+            session[0], session[1] = generator, yaml_content
+            files = generator.generate_all(output_dir, force=bool(request.get("force")))
+        
+        changes = files.pop("changes")
+        return {
+            "contract": contract_path,
+            "feature": feature_name,
+            "output": output_dir,
+            "files": files,
+            "changes": changes,
+            "seconds": round(time.perf_counter() - start, 6)
+        }
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pid": os.getpid(),
+            "generator": GENERATOR_VERSION,
+            "uptime_seconds": round(time.time() - self.started, 3),
+            "requests": self.requests,
+            "sessions": len(self._sessions)
+        }
+
+
+def make_server(service: CodegenService, host: str = "127.0.0.1", port: int = DEFAULT_SERVER_PORT, verbose: bool = False):
+    """HTTP front end of a CodegenService: POST /generate, GET /status, POST /shutdown.
+    
+    Requests a web page could send are refused: POST bodies must be
+    application/json, which a browser only sends cross-origin after a CORS
+    preflight this server never answers; requests carrying an Origin header
+    are refused outright; and the Host header must name this server, so a
+    DNS rebinding page cannot reach it through a host name of its own.
+    """
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+    from urllib.parse import urlsplit
+    
+    allowed_hosts = None if host in WILDCARD_HOSTS else {host, *LOOPBACK_HOSTS}
+    
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self._refused():
+                return
+            if self.path == "/status":
+                self._reply(200, service.status())
+            else:
+                self._reply(404, {"error": f"Unknown path {self.path}"})
+        
+        def do_POST(self):
+            if self._refused():
+                return
+            if self.headers.get_content_type() != "application/json":
+                self._reply(415, {"error": "Expected a request body of type application/json"})
+                return
+            if self.path == "/shutdown":
+                self._reply(200, {"stopping": True})
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+            if self.path != "/generate":
+                self._reply(404, {"error": f"Unknown path {self.path}"})
+                return
+            try:
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+                request["contract"], request["feature"]
+            except (ValueError, TypeError, KeyError) as e:
+                self._reply(400, {"error": f"Expected a JSON object with contract and feature: {e}"})
+                return
+            try:
+                result = service.generate(request)
+            except Exception as e:
+                # Any failure, not only CONTRACT_ERRORS, must reach the client as JSON rather than a dropped connection
+                if verbose and not isinstance(e, CONTRACT_ERRORS):
+                    traceback.print_exc()
+                self._reply(500, {"error": f"{type(e).__name__}: {e}"})
+                return
+            self._reply(200, result)
+        
+        def _refused(self) -> bool:
+            """Reply 403 to browser requests from other origins and to foreign Host headers"""
+            if self.headers.get("Origin") is not None:
+                self._reply(403, {"error": "Requests from web pages are not accepted"})
+                return True
+            request_host = urlsplit(f"//{self.headers.get('Host', '')}").hostname
+            if allowed_hosts is not None and request_host not in allowed_hosts:
+                self._reply(403, {"error": f"Unexpected Host {self.headers.get('Host')}"})
+                return True
+            return False
+        
+        def _reply(self, status: int, body: Dict[str, Any]):
+            content = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(content)))
+            self.end_headers()
+            self.wfile.write(content)
+        
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+    
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    return server
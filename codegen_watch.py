@@ -0,0 +1,111 @@
+import os
+import select
+import struct
+import time
+from typing import List
+
+
+class PollingWatcher:
+    """Detects changes to a set of files by polling their size and mtime"""
+    
+    def __init__(self, paths: List[str], interval: float = 0.5):
+        self.paths = [os.path.abspath(path) for path in paths]
+        self.interval = interval
+        self._stats = {path: self._stat(path) for path in self.paths}
+    
+    def _stat(self, path: str):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+    
+    def wait(self, timeout: float = None) -> List[str]:
+        """Block until at least one file changed and return the changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = []
+            for path in self.paths:
+                stat = self._stat(path)
+                if stat != self._stats[path]:
+                    self._stats[path] = stat
+                    changed.append(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+    
+    def close(self):
+        pass
+
+
+class InotifyWatcher:
+    """Detects changes to a set of files with Linux inotify, watching their parent directories
+    so editors that save by renaming a temporary file are picked up too"""
+    
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    EVENT_HEADER = struct.Struct("iIII")
+    
+    def __init__(self, paths: List[str], debounce: float = 0.05):
+        import ctypes
+        import ctypes.util
+        
+        self.paths = {os.path.abspath(path) for path in paths}
+        self.debounce = debounce
+        self._libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        
+        self._directories = {}
+        mask = self.IN_CLOSE_WRITE | self.IN_MOVED_TO | self.IN_CREATE
+        for directory in {os.path.dirname(path) for path in self.paths}:
+            wd = self._libc.inotify_add_watch(self._fd, directory.encode(), mask)
+            if wd < 0:
+                error = ctypes.get_errno()
+                self.close()
+                raise OSError(error, f"inotify_add_watch failed for {directory}")
+            self._directories[wd] = directory
+    
+    def _read_events(self) -> set:
+        changed = set()
+        data = os.read(self._fd, 64 * 1024)
+        offset = 0
+        while offset < len(data):
+            wd, _mask, _cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b"\0").decode()
+            offset += length
+            path = os.path.join(self._directories.get(wd, ""), name)
+            if path in self.paths:
+                changed.add(path)
+        return changed
+    
+    def wait(self, timeout: float = None) -> List[str]:
+        """Block until at least one file changed and return the changed paths"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        changed = set()
+        while not changed:
+            remaining = None if deadline is None else max(0, deadline - time.monotonic())
+            ready, _, _ = select.select([self._fd], [], [], remaining)
+            if not ready:
+                return []
+            changed |= self._read_events()
+        # Collect the burst of events a single save usually produces
+        while select.select([self._fd], [], [], self.debounce)[0]:
+            changed |= self._read_events()
+        return sorted(changed)
+    
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+
+def make_watcher(paths: List[str], interval: float = 0.5):
+    """Watch paths with inotify where available, otherwise by polling"""
+    try:
+        return InotifyWatcher(paths)
+    except (OSError, AttributeError, TypeError):
+        return PollingWatcher(paths, interval)
@@ -0,0 +1 @@
+# Puts this directory on sys.path for the tests in test/, as codegen.py does for the generators
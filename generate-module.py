@@ -1,7 +1,128 @@
+import json
 import os
+import re
 from datetime import datetime
 
-def create_kmp_module(module_name, package_name, base_path="."):
+from kotlin_templates import TemplateRegistry
+
+LAYERS = ("data", "domain", "presentation")
+
+# Source directories of each layer; {package} is the package name as a path
+LAYER_DIRECTORIES = {
+    "data": [
+        "data/src/androidMain/kotlin/{package}/data",
+        "data/src/commonMain/kotlin/{package}/data/di",
+        "data/src/commonMain/kotlin/{package}/data/model",
+        "data/src/commonMain/kotlin/{package}/data/remote",
+        "data/src/commonMain/kotlin/{package}/data/repository",
+        "data/src/commonMain/kotlin/{package}/data/sources",
+        "data/src/commonMain/kotlin/{package}/data/mapper",
+        "data/src/iosMain/kotlin/{package}/data",
+    ],
+    "domain": [
+        "domain/src/androidMain/kotlin/{package}/domain",
+        "domain/src/commonMain/kotlin/{package}/domain/model",
+        "domain/src/commonMain/kotlin/{package}/domain/repository",
+        "domain/src/iosMain/kotlin/{package}/domain",
+    ],
+    "presentation": [
+        "presentation/androidMain/kotlin/{package}/presentation",
+        "presentation/commonMain/kotlin/{package}/presentation/di",
+        "presentation/commonMain/kotlin/{package}/presentation/navigation",
+        "presentation/commonMain/kotlin/{package}/presentation/utility",
+        "presentation/commonMain/kotlin/{package}/presentation/components",
+        "presentation/iosMain/kotlin/{package}/presentation",
+    ],
+}
+
+# Gradle path of a generated layer, matching the project() references in the build templates
+GRADLE_PROJECT = ":features:{module_name}:{layer}"
+
+# Characters Gradle does not allow in a project name; a module is one project, not a nested path
+INVALID_MODULE_NAME = re.compile(r'[/\\:<>"?*|]')
+
+# Project paths named by include(...) lines of a settings.gradle.kts
+INCLUDED_PROJECT = re.compile(r"""["'](:[^"']+)["']""")
+
+def plan_module(module_name, package_name, layers=LAYERS, registry=None):
+    """
+    Lists the directories and files of a KMP module without touching the disk.
+    
+    Args:
+        module_name (str): Name of the module (e.g., "feature_login")
+        package_name (str): Base package name (e.g., "com.yourpay")
+        layers (iterable): Layers to include, any of LAYERS
+        registry (TemplateRegistry): Templates to render the files from, the built-in ones by default
+    
+    Returns:
+        tuple: (directories relative to the module, {relative file path: content})
+    """
+    package_path = package_name.replace('.', '/')
+    directories = []
+    files = {}
+    for layer in layers:
+        directories.extend(directory.format(package=package_path) for directory in LAYER_DIRECTORIES[layer])
+        files[layer + "/.gitignore"] = "/build"
+    
+    if "data" in layers:
+        files["data/build.gradle.kts"] = get_data_build_gradle_template(module_name, registry)
+    if "domain" in layers:
+        files["domain/build.gradle.kts"] = get_domain_build_gradle_template(module_name, registry)
+    if "presentation" in layers:
+        files["presentation/build.gradle.kts"] = get_presentation_build_gradle_template(module_name, registry)
+        files["presentation/androidMain/AndroidManifest.xml"] = get_manifest_template(registry)
+    return directories, files
+
+def check_module_name(module_name):
+    """
+    Rejects names that are not a single Gradle project name.
+    
+    A nested name such as "features/login" would end up in the project paths
+    of GRADLE_PROJECT and the build templates as ":features:features/login:data".
+    
+    Raises:
+        ValueError: The name is empty, ".", ".." or contains a path separator or ':'
+    """
+    if not module_name or module_name in (".", "..") or INVALID_MODULE_NAME.search(module_name):
+        raise ValueError("Module name {!r} must be a single Gradle project name, "
+                         "without '/', '\\' or ':'; use --path for the parent directory".format(module_name))
+
+def make_directories(root, paths):
+    """
+    Creates directories below root with a single mkdir each, parents included.
+    
+    root must exist. Directories are not checked before they are created; one
+    that already exists, such as a shared parent of several modules, is
+    recognised by its mkdir failing.
+    
+    Args:
+        root (str): Existing directory every path lies under
+        paths (iterable): Directories to create
+    
+    Returns:
+        list: Every directory created, parents first
+    """
+    needed = set()
+    for path in paths:
+        while path not in needed and path != root:
+            parent = os.path.dirname(path)
+            if parent == path:
+                raise ValueError("{} is not below {}".format(path, root))
+            needed.add(path)
+            path = parent
+    created = []
+    # A parent is a prefix of its children, so it sorts before them
+    for path in sorted(needed):
+        try:
+            os.mkdir(path)
+        except FileExistsError:
+            if not os.path.isdir(path):
+                raise
+            continue
+        created.append(path)
+    return created
+
+def create_kmp_module(module_name, package_name, base_path=".", layers=LAYERS, verbose=True):
     """
     Creates a KMP module structure with template files.
     
@@ -9,118 +130,192 @@ def create_kmp_module(module_name, package_name, base_path="."):
         module_name (str): Name of the new module (e.g., "feature_login")
         package_name (str): Base package name (e.g., "com.yourpay")
         base_path (str): Base directory where module will be created
+        layers (iterable): Layers to create, any of LAYERS
+        verbose (bool): Print every created directory and file
+    
+    An existing module is completed: missing directories are created and
+    the template files are written again.
     """
+    summary = create_kmp_modules(
+        [{"name": module_name, "package": package_name, "layers": list(layers)}], base_path, verbose=verbose,
+        skip_existing=False
+    )
+    print("\nKMP module '{}' created successfully at {}".format(
+        module_name, os.path.abspath(summary["created"][0])))
+
+def create_kmp_modules(modules, base_path=".", settings_path=None, verbose=False, skip_existing=True,
+                       registry=None):
+    """
+    Creates many KMP modules at once, planning the whole tree before touching the disk.
     
-    # Define module structure
-    module_path = os.path.join(base_path, module_name)
-    
-    # Directory structure based on your requirements
-    directories = [
-        # Data layer
-        "data/src/androidMain/kotlin/" + package_name.replace('.', '/') + "/data",
-        "data/src/commonMain/kotlin/" + package_name.replace('.', '/') + "/data" + "/di",
-        "data/src/commonMain/kotlin/" + package_name.replace('.', '/') + "/data" + "/model",
-        "data/src/commonMain/kotlin/" + package_name.replace('.', '/') + "/data" + "/remote",
-        "data/src/commonMain/kotlin/" + package_name.replace('.', '/') + "/data" + "/repository",
-        "data/src/commonMain/kotlin/" + package_name.replace('.', '/') + "/data" + "/sources",
-        "data/src/commonMain/kotlin/" + package_name.replace('.', '/') + "/data" + "/mapper",
-        "data/src/iosMain/kotlin/" + package_name.replace('.', '/') + "/data",
-        
-        # Domain layer
-        "domain/src/androidMain/kotlin/" + package_name.replace('.', '/') + "/domain",
-        "domain/src/commonMain/kotlin/" + package_name.replace('.', '/') + "/domain" + "/model",
-        "domain/src/commonMain/kotlin/" + package_name.replace('.', '/') + "/domain" + "/repository",
-        "domain/src/iosMain/kotlin/" + package_name.replace('.', '/') + "/domain",
-        
-        # Presentation layer
-        "presentation/androidMain/kotlin/" + package_name.replace('.', '/') + "/presentation",
-        "presentation/commonMain/kotlin/" + package_name.replace('.', '/') + "/presentation" + "/di",
-        "presentation/commonMain/kotlin/" + package_name.replace('.', '/') + "/presentation" + "/navigation",
-        "presentation/commonMain/kotlin/" + package_name.replace('.', '/') + "/presentation" + "/utility",
-        "presentation/commonMain/kotlin/" + package_name.replace('.', '/') + "/presentation" + "/components",
-        "presentation/iosMain/kotlin/" + package_name.replace('.', '/') + "/presentation",
-    ]
-    
-    # Files to create with their template content
-    files = {
-        # Data layer files
-        "data/.gitignore": "/build",
-        "data/build.gradle.kts": get_data_build_gradle_template(module_name),
-        
-        # Domain layer files
-        "domain/.gitignore": "/build",
-        "domain/build.gradle.kts": get_domain_build_gradle_template(module_name),
-        
-        # Presentation layer files
-        "presentation/.gitignore": "/build",
-        "presentation/build.gradle.kts": get_presentation_build_gradle_template(module_name),
-        "presentation/androidMain/AndroidManifest.xml": get_manifest_template(),
-    }
+    Modules whose directory already exists are skipped, unless skip_existing is
+    False; then they are completed like new ones.
     
-    # Create directories
-    for directory in directories:
-        full_path = os.path.join(module_path, directory)
-        os.makedirs(full_path, exist_ok=True)
-        print("Created directory:", full_path)
+    Args:
+        modules (list): Dicts with "name", "package" and optionally "layers"
+        base_path (str): Base directory where modules will be created
+        settings_path (str): settings.gradle.kts to include the new layers in, if any
+        verbose (bool): Print every created directory and file
+        skip_existing (bool): Leave modules whose directory exists alone
+        registry (TemplateRegistry): Templates to render the files from, the built-in ones by default
     
-    # Create files
+    Returns:
+        dict: Created and skipped module paths, counts, and the projects added to settings
+    
+    Raises:
+        ValueError: A module name is not a single Gradle project name
+    """
+    for module in modules:
+        check_module_name(module["name"])
+    base_path = os.path.normpath(base_path)
+    os.makedirs(base_path, exist_ok=True)
+    directories = []
+    files = {}
+    created = []
+    skipped = []
+    projects = []
+    
+    for module in modules:
+        module_path = os.path.join(base_path, module["name"])
+        if skip_existing and os.path.exists(module_path):
+            skipped.append(module_path)
+            continue
+        layers = module.get("layers") or LAYERS
+        module_directories, module_files = plan_module(module["name"], module["package"], layers, registry)
+        directories.extend(os.path.join(module_path, directory) for directory in module_directories)
+        for file_path, content in module_files.items():
+            files[os.path.join(module_path, file_path)] = content
+        projects.extend(GRADLE_PROJECT.format(module_name=module["name"], layer=layer) for layer in layers)
+        created.append(module_path)
+    
+    # Layer roots hold files but may not be the parent of any source directory
+    new_directories = make_directories(base_path, directories + [os.path.dirname(file_path) for file_path in files])
     for file_path, content in files.items():
-        full_path = os.path.join(module_path, file_path)
-        with open(full_path, 'w') as f:
+        with open(file_path, 'w') as f:
             f.write(content)
-        print("Created file:", full_path)
     
-    print("\nKMP module '{}' created successfully at {}".format(
-        module_name, os.path.abspath(module_path)))
+    if verbose:
+        for directory in new_directories:
+            print("Created directory:", directory)
+        for file_path in files:
+            print("Created file:", file_path)
+    
+    return {
+        "created": created,
+        "skipped": skipped,
+        "directories": len(new_directories),
+        "files": len(files),
+        "includes": update_settings(settings_path, projects) if settings_path and projects else []
+    }
+
+def update_settings(settings_path, projects):
+    """
+    Adds include() lines for the Gradle projects settings.gradle.kts does not include yet.
+    
+    The file is read and written once however many projects are added.
+    
+    Args:
+        settings_path (str): Path to settings.gradle.kts, created if missing
+        projects (list): Gradle project paths (e.g., ":features:feature_login:data")
+    
+    Returns:
+        list: The projects that were added
+    """
+    content = ""
+    if os.path.exists(settings_path):
+        with open(settings_path, 'r') as f:
+            content = f.read()
+    
+    included = set()
+    for line in content.splitlines():
+        if line.lstrip().startswith("include"):
+            included.update(INCLUDED_PROJECT.findall(line))
+    missing = [project for project in dict.fromkeys(projects) if project not in included]
+    if missing:
+        if content and not content.endswith("\n"):
+            content += "\n"
+        content += "".join('include("{}")\n'.format(project) for project in missing)
+        with open(settings_path, 'w') as f:
+            f.write(content)
+    return missing
 
-def get_data_build_gradle_template(module_name):
-    return f"""
-plugins {{
+def load_manifest(manifest_path):
+    """
+    Reads a JSON manifest of modules to create.
+    
+    The manifest is a list of modules, or an object with "modules" and a default
+    "package" for modules that do not name their own. A module is a name or an
+    object with "name" and optionally "package" and "layers":
+    
+        {"package": "com.yourpay", "modules": ["feature_login", {"name": "feature_card", "layers": ["data", "domain"]}]}
+    
+    Returns:
+        list: Module dicts with "name", "package" and "layers"
+    """
+    with open(manifest_path, 'r') as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"modules": manifest}
+    
+    modules = []
+    for module in manifest.get("modules", []):
+        if isinstance(module, str):
+            module = {"name": module}
+        package_name = module.get("package") or manifest.get("package")
+        if not module.get("name") or not package_name:
+            raise ValueError("Module {} in {} needs a name and a package".format(module, manifest_path))
+        check_module_name(module["name"])
+        layers = module.get("layers") or list(LAYERS)
+        unknown = [layer for layer in layers if layer not in LAYERS]
+        if unknown:
+            raise ValueError("Module {} in {} has unknown layers {}".format(module["name"], manifest_path, unknown))
+        modules.append({"name": module["name"], "package": package_name, "layers": layers})
+    return modules
+
+TEMPLATES = {
+    "data_build_gradle": """
+plugins {
     alias(libs.plugins.yourpay.kmp)
-}}
+}
 
-kotlin {{
-    sourceSets {{
-        commonMain.dependencies {{
+kotlin {
+    sourceSets {
+        commonMain.dependencies {
             implementation(libs.koin.core)
             implementation(libs.kotlin.serialization.json)
             implementation(libs.kotlin.coroutines.core)
 
             implementation(project(":core:network"))
             implementation(project(":core:utility"))
-            implementation(project(":features:{module_name}:domain"))
-        }}
-    }}
-}}
-    """
-
-def get_domain_build_gradle_template(module_name):
-    return f"""
-plugins {{
+            implementation(project(":features:${module_name}:domain"))
+        }
+    }
+}
+    """,
+    "domain_build_gradle": """
+plugins {
     alias(libs.plugins.yourpay.kmp)
-}}
+}
 
-kotlin {{
-    sourceSets {{
-        commonMain.dependencies {{
+kotlin {
+    sourceSets {
+        commonMain.dependencies {
             implementation(libs.kotlin.serialization.json)
             implementation(libs.kotlin.coroutines.core)
             implementation(project(":core:model"))
             implementation(project(":core:domain"))
-        }}
-    }}
-}}
-    """
-
-def get_presentation_build_gradle_template(module_name):
-    return f"""
-plugins {{
+        }
+    }
+}
+    """,
+    "presentation_build_gradle": """
+plugins {
     alias(libs.plugins.yourpay.cmp)
-}}
+}
 
-kotlin {{
-    sourceSets {{
-        commonMain.dependencies {{
+kotlin {
+    sourceSets {
+        commonMain.dependencies {
             implementation(libs.jetbrains.lifecycle.viewmodel.compose)
             implementation(libs.koin.core)
             implementation(libs.koin.composeViewModel)
@@ -128,37 +323,93 @@ kotlin {{
             implementation(libs.kotlin.serialization.json)
             implementation(project(":core:presentation"))
             implementation(project(":core:utility"))
-            implementation(project(":features:{module_name}:domain"))
+            implementation(project(":features:${module_name}:domain"))
             implementation(project(":core:monitoring"))
-        }}
-        androidMain.dependencies {{
+        }
+        androidMain.dependencies {
             implementation(androidxLibs.fragment)
             implementation(project(":common:base"))
             implementation(project(":common:core"))
             implementation(project(":common:designsystem"))
             implementation(project(":common:utility"))
             implementation(project(":common:config"))
-        }}
-    }}
-}}
-    """
-
-def get_manifest_template():
-    return """
+        }
+    }
+}
+    """,
+    "android_manifest": """
 <?xml version="1.0" encoding="utf-8"?>
 <manifest xmlns:android="http://schemas.android.com/apk/res/android"
     xmlns:tools="http://schemas.android.com/tools">
 </manifest>
-    """
+    """,
+}
 
-if __name__ == "__main__":
+# The built-in templates; main() builds its own registry when --templates points at overrides
+templates = TemplateRegistry(TEMPLATES)
+
+def get_data_build_gradle_template(module_name, registry=None):
+    return (registry or templates).render("data_build_gradle", module_name=module_name)
+
+def get_domain_build_gradle_template(module_name, registry=None):
+    return (registry or templates).render("domain_build_gradle", module_name=module_name)
+
+def get_presentation_build_gradle_template(module_name, registry=None):
+    return (registry or templates).render("presentation_build_gradle", module_name=module_name)
+
+def get_manifest_template(registry=None):
+    return (registry or templates).render("android_manifest")
+
+def main(argv=None, prog=None):
+    """Command line entry point; argv defaults to sys.argv[1:]"""
     import argparse
+    import time
     
-    parser = argparse.ArgumentParser(description='Create a KMP module structure')
-    parser.add_argument('module_name', help='Name of the module to create (e.g., feature_login)')
-    parser.add_argument('package_name', help='Base package name (e.g., com.yourpay)')
+    parser = argparse.ArgumentParser(prog=prog, description='Create a KMP module structure')
+    parser.add_argument('module_name', nargs='?', help='Name of the module to create (e.g., feature_login)')
+    parser.add_argument('package_name', nargs='?', help='Base package name (e.g., com.yourpay)')
     parser.add_argument('--path', default='.', help='Base path where module will be created (default: current directory)')
+    parser.add_argument('--manifest', help='JSON manifest of modules to create in one run')
+    parser.add_argument('--layers', help='Comma separated layers to create (default: data,domain,presentation)')
+    parser.add_argument('--settings', help='settings.gradle.kts to add include() lines for the new layers to')
+    parser.add_argument('--verbose', action='store_true', help='Print every created directory and file')
+    parser.add_argument('--templates', help='Directory of <name>.tmpl files overriding the built-in templates')
     
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
+    registry = TemplateRegistry(TEMPLATES, args.templates) if args.templates else templates
+    layers = args.layers.split(',') if args.layers else list(LAYERS)
+    if any(layer not in LAYERS for layer in layers):
+        parser.error("--layers must be a subset of " + ",".join(LAYERS))
     
-    create_kmp_module(args.module_name, args.package_name, args.path)
\ No newline at end of file
+    if args.manifest:
+        try:
+            modules = load_manifest(args.manifest)
+        except (OSError, ValueError) as e:
+            parser.error(str(e))
+        start = time.perf_counter()
+        summary = create_kmp_modules(modules, args.path, args.settings, args.verbose, registry=registry)
+        for module_path in summary["skipped"]:
+            print("Skipped existing module:", module_path)
+        print("Created {} modules ({} directories, {} files), skipped {} in {:.3f}s".format(
+            len(summary["created"]), summary["directories"], summary["files"], len(summary["skipped"]),
+            time.perf_counter() - start))
+    elif args.module_name and args.package_name:
+        try:
+            check_module_name(args.module_name)
+        except ValueError as e:
+            parser.error(str(e))
+        summary = create_kmp_modules(
+            [{"name": args.module_name, "package": args.package_name, "layers": layers}],
+            args.path, args.settings, args.verbose, skip_existing=False, registry=registry
+        )
+        print("\nKMP module '{}' created successfully at {}".format(
+            args.module_name, os.path.abspath(summary["created"][0])))
+    else:
+        parser.error("module_name and package_name are required unless --manifest is given")
+    
+    if summary["includes"]:
+        print("Added {} include(s) to {}".format(len(summary["includes"]), args.settings))
+
+
+if __name__ == "__main__":
+    main()
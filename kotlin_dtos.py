@@ -0,0 +1,191 @@
+import hashlib
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Tuple
+
+# Ordered (property name, Kotlin type) pairs of an object schema
+Shape = Tuple[Tuple[str, str], ...]
+# Schema of a contract property: a type name such as "string", or a mapping with a type
+# and the properties, items or enum values of that type
+Schema = Any
+# Called with (class name, properties, enum values) for each nested class a schema needs
+DefineClass = Callable[[str, List[Tuple[str, str]], Tuple[str, ...]], None]
+
+# Hard keywords that cannot name a property without backticks
+KOTLIN_KEYWORDS = frozenset({
+    "as", "break", "class", "continue", "do", "else", "false", "for", "fun", "if", "in", "interface",
+    "is", "null", "object", "package", "return", "super", "this", "throw", "true", "try", "typealias",
+    "typeof", "val", "var", "when", "while",
+})
+
+
+def dto_base_name(*words: str) -> str:
+    """Join contract words into a class name, e.g. ("getUsersById", "Response") -> GetUsersByIdResponse"""
+    return "".join(word[0].upper() + word[1:] for word in words if word)
+
+
+def property_name(wire_name: str) -> str:
+    """Kotlin property for a JSON key, e.g. "created_at" -> createdAt; @SerialName keeps the key"""
+    words = [word for word in re.split(r"[^0-9A-Za-z]+", wire_name) if word]
+    if not words:
+        return f"`{wire_name}`"
+    name = words[0][0].lower() + words[0][1:] + dto_base_name(*words[1:])
+    return f"`{name}`" if name[0].isdigit() or name in KOTLIN_KEYWORDS else name
+
+
+def enum_constant(value: str) -> str:
+    """Kotlin enum constant for a wire value, e.g. "inReview" or "in-review" -> IN_REVIEW"""
+    words = re.findall(r"[A-Z]+(?![a-z])|[A-Z]?[a-z]+|[0-9]+[a-z]*", value)
+    name = "_".join(word.upper() for word in words) or "EMPTY"
+    return f"_{name}" if name[0].isdigit() else name
+
+
+class DtoTable:
+    """Names the DTOs of a contract and keeps one class per distinct property shape.
+
+    Every endpoint DTO gets a name of its own. When its properties match a DTO
+    interned earlier, the name becomes a typealias of that class instead of a
+    second class with the same body.
+    """
+
+    def __init__(self, shared: Dict[Shape, str] = None):
+        # (property name, Kotlin type) tuple -> class generated for that shape
+        self.classes: Dict[Shape, str] = {}
+        # Shape -> fully qualified class generated once for the whole workspace
+        self.shared: Dict[Shape, str] = shared or {}
+        # Alias name -> class name, in contract order
+        self.aliases: Dict[str, str] = {}
+        # Canonical nested schema -> its Kotlin type, so a sub-schema used again is not resolved again
+        self.types: Dict[str, str] = {}
+        # Enum values -> enum class generated for them
+        self.enums: Dict[Tuple[str, ...], str] = {}
+        self._names = set()
+
+    def unique_name(self, name: str) -> str:
+        """Reserve name, or name with the lowest numeric suffix that is still free"""
+        candidate = name
+        suffix = 2
+        while candidate in self._names:
+            candidate = f"{name}{suffix}"
+            suffix += 1
+        self._names.add(candidate)
+        return candidate
+
+    def resolve(self, name: str, schema: Schema, scalar_type: Callable[[str], str], define: DefineClass) -> str:
+        """Kotlin type of a property schema.
+
+        Nested objects and enums become classes named after name and are passed to
+        define, nested classes before the classes using them. Each distinct
+        sub-schema is resolved once per table and reuses its class afterwards.
+        """
+        if isinstance(schema, str):
+            return scalar_type(schema)
+        key = json.dumps(schema, sort_keys=True, default=str)
+        kotlin_type = self.types.get(key)
+        if kotlin_type is None:
+            kotlin_type = self.types[key] = self._resolve_nested(name, schema, scalar_type, define)
+        return kotlin_type
+
+    def resolve_properties(self, class_name: str, properties: Dict[str, Schema], scalar_type: Callable[[str], str],
+                           define: DefineClass) -> List[Tuple[str, str]]:
+        """(property name, Kotlin type) pairs of an object schema; nested classes are named <class_name><Property>"""
+        return [
+            (prop, self.resolve(class_name + dto_base_name(*re.split(r"[^0-9A-Za-z]+", prop)), schema, scalar_type, define))
+            for prop, schema in properties.items()
+        ]
+
+    def _resolve_nested(self, name: str, schema: Dict[str, Any], scalar_type: Callable[[str], str],
+                        define: DefineClass) -> str:
+        if "enum" in schema:
+            values = tuple(dict.fromkeys(str(value) for value in schema["enum"]))
+            class_name = self.enums.get(values)
+            if class_name is None:
+                class_name = self.enums[values] = self.unique_name(name)
+                define(class_name, [], values)
+            return class_name
+        schema_type = schema.get("type", "object")
+        if schema_type == "array" and schema.get("items") is not None:
+            return f"List<{self.resolve(f'{name}Item', schema['items'], scalar_type, define)}>"
+        if schema_type == "object" and schema.get("properties"):
+            class_name = self.unique_name(name)
+            define(class_name, self.resolve_properties(class_name, schema["properties"], scalar_type, define), None)
+            return class_name
+        # Free-form objects and arrays stay whatever the generator maps them to
+        return scalar_type(schema_type)
+
+    def intern(self, name: str, properties: List[Tuple[str, str]]) -> str:
+        """Register the DTO called name and return the class it is generated as"""
+        class_name = self.classes.setdefault(tuple(properties), name)
+        if class_name != name:
+            self.aliases[name] = class_name
+        return class_name
+
+
+class TypeIndex:
+    """DTO shapes of every contract in a workspace, persisted as JSON.
+
+    A contract is only read again when its content changed since the index
+    was saved, so keeping the index current after editing one contract is
+    cheap. Shapes found in more than one contract are the shared types.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: str):
+        self.path = path
+        # Contract path relative to the index -> {"sha256": ..., "shapes": [[shape, name], ...]}
+        self.contracts: Dict[str, Dict] = {}
+
+    @classmethod
+    def load(cls, path: str) -> "TypeIndex":
+        index = cls(path)
+        if os.path.exists(path):
+            with open(path, "r") as f:
+                data = json.load(f)
+            if data.get("version") == cls.VERSION:
+                index.contracts = data["contracts"]
+        return index
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({"version": self.VERSION, "contracts": self.contracts}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def update(self, contract_paths: List[str], extract: Callable[[str], List[Tuple[Shape, str]]],
+               prune: bool = True) -> List[str]:
+        """Index the given contracts and return the ones that had to be read again.
+
+        extract(contract_path) lists the (shape, class name) pairs of a contract.
+        With prune, contracts not in contract_paths are dropped from the index.
+        """
+        base_dir = os.path.dirname(os.path.abspath(self.path))
+        keys = {}
+        changed = []
+        for contract_path in contract_paths:
+            key = os.path.relpath(os.path.abspath(contract_path), base_dir)
+            keys[key] = None
+            with open(contract_path, "rb") as f:
+                digest = hashlib.sha256(f.read()).hexdigest()
+            entry = self.contracts.get(key)
+            if entry is None or entry["sha256"] != digest:
+                shapes = [[[list(prop) for prop in shape], name] for shape, name in extract(contract_path)]
+                self.contracts[key] = {"sha256": digest, "shapes": shapes}
+                changed.append(contract_path)
+        if prune:
+            self.contracts = {key: entry for key, entry in self.contracts.items() if key in keys}
+        return changed
+
+    def shared(self) -> Dict[Shape, str]:
+        """Shapes defined by more than one contract, named after their first definition in path order"""
+        owners: Dict[Shape, set] = {}
+        names: Dict[Shape, str] = {}
+        for key in sorted(self.contracts):
+            for shape, name in self.contracts[key]["shapes"]:
+                shape = tuple(tuple(prop) for prop in shape)
+                owners.setdefault(shape, set()).add(key)
+                names.setdefault(shape, name)
+        table = DtoTable()
+        return {shape: table.unique_name(names[shape]) for shape in names if len(owners[shape]) > 1}
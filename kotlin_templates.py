@@ -0,0 +1,141 @@
+import ast
+from datetime import datetime, timezone
+import hashlib
+import os
+from string import Template
+from types import FunctionType
+from typing import Any, Dict, Mapping
+
+TEMPLATE_SUFFIX = ".tmpl"
+
+# (name, source) -> CompiledTemplate, shared by every registry in the process
+_compiled = {}
+
+
+class CompiledTemplate:
+    """A string.Template compiled once into a Python f-string function.
+
+    The function is built as a syntax tree: template text only ever becomes
+    string constants and placeholder names dictionary keys, so no part of a
+    template is parsed as Python.
+    """
+    __slots__ = ("name", "source", "names", "_function")
+
+    def __init__(self, name: str, source: str):
+        self.name = name
+        self.source = source
+
+        # Literal text between placeholders; literals[i] precedes placeholders[i]
+        literals = []
+        placeholders = []
+        literal = []
+        position = 0
+        for match in Template.pattern.finditer(source):
+            literal.append(source[position:match.start()])
+            position = match.end()
+            if match.group("escaped") is not None:
+                literal.append("$")
+                continue
+            placeholder = match.group("named") or match.group("braced")
+            if placeholder is None:
+                line = source.count("\n", 0, match.start()) + 1
+                raise ValueError(f"Invalid placeholder in template {name} on line {line}")
+            literals.append("".join(literal))
+            placeholders.append(placeholder)
+            literal = []
+        literal.append(source[position:])
+        literals.append("".join(literal))
+        self.names = tuple(dict.fromkeys(placeholders))
+
+        # lambda _values: f"<literal>{_values['<placeholder>']}...<literal>"
+        parts = []
+        for literal, placeholder in zip(literals, placeholders):
+            if literal:
+                parts.append(ast.Constant(literal))
+            value = ast.Subscript(ast.Name("_values", ast.Load()), ast.Constant(placeholder), ast.Load())
+            parts.append(ast.FormattedValue(value, -1, None))
+        if literals[-1]:
+            parts.append(ast.Constant(literals[-1]))
+        arguments = ast.arguments(posonlyargs=[], args=[ast.arg("_values")], kwonlyargs=[], kw_defaults=[],
+                                  defaults=[])
+        tree = ast.fix_missing_locations(ast.Expression(ast.Lambda(arguments, ast.JoinedStr(parts))))
+        code = compile(tree, f"<template {name}>", "eval")
+        # The lambda's code object is the only code constant of the expression
+        function_code = next(const for const in code.co_consts if hasattr(const, "co_code"))
+        self._function = FunctionType(function_code, {})
+
+    def render(self, source: Any = None, /, **values) -> str:
+        """Fill placeholders from values, then from source (a mapping or any object with attributes)"""
+        if source is not None:
+            is_mapping = isinstance(source, Mapping)
+            for name in self.names:
+                if name not in values:
+                    values[name] = source[name] if is_mapping else getattr(source, name)
+        try:
+            return self._function(values)
+        except KeyError as e:
+            raise KeyError(f"Template {self.name} needs a value for ${e.args[0]}") from None
+
+
+def compile_template(name: str, source: str) -> CompiledTemplate:
+    """Compile a template, reusing an earlier compilation of the same template.
+
+    Keyed by name too: two templates with one source would otherwise share the
+    first one's name in their error messages.
+    """
+    key = (name, source)
+    template = _compiled.get(key)
+    if template is None:
+        template = _compiled[key] = CompiledTemplate(name, source)
+    return template
+
+
+class TemplateRegistry:
+    """Named string.Template sources, compiled on first use and cached.
+
+    Templates in override_dir named <template name>.tmpl replace the defaults.
+    The directory is read once when the registry is created.
+    """
+
+    def __init__(self, defaults: Dict[str, str], override_dir: str = None):
+        self.sources = dict(defaults)
+        self.overrides = {}
+        if override_dir:
+            for file_name in sorted(os.listdir(override_dir)):
+                name, suffix = os.path.splitext(file_name)
+                if suffix == TEMPLATE_SUFFIX and name in self.sources:
+                    with open(os.path.join(override_dir, file_name), "r") as f:
+                        self.overrides[name] = f.read()
+            self.sources.update(self.overrides)
+        self._templates = {}
+
+    def get(self, name: str) -> CompiledTemplate:
+        template = self._templates.get(name)
+        if template is None:
+            template = self._templates[name] = compile_template(name, self.sources[name])
+        return template
+
+    def render(self, name: str, source: Any = None, /, **values) -> str:
+        template = self._templates.get(name) or self.get(name)
+        if source is not None:
+            return template.render(source, **values)
+        # Without a source the values are complete; skip repacking them for CompiledTemplate.render
+        try:
+            return template._function(values)
+        except KeyError as e:
+            raise KeyError(f"Template {name} needs a value for ${e.args[0]}") from None
+
+    def fingerprint(self) -> str:
+        """Identify the overrides in use, so outputs rendered from them can be told apart"""
+        digest = hashlib.sha256()
+        for name, source in sorted(self.overrides.items()):
+            digest.update(f"{name}\0{source}\0".encode())
+        return digest.hexdigest()
+
+
+def generation_timestamp() -> str:
+    """Wall-clock time for generated headers, pinned by SOURCE_DATE_EPOCH when it is set"""
+    epoch = os.environ.get("SOURCE_DATE_EPOCH")
+    if epoch:
+        return datetime.fromtimestamp(int(epoch), timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    return datetime.now().strftime("%Y-%m-%d %H:%M:%S")
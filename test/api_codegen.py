@@ -1,400 +1,280 @@
-import yaml
 import argparse
-from datetime import datetime
+import json
 import os
-from typing import Dict, List, Any
+import time
+from typing import Any, Dict
 
+from api_batch import contract_output_dirs, contract_root, derive_feature_name, find_contracts, generate_batch, update_type_index
+from api_generator import KotlinCodeGenerator, ProfileHooks
+from api_ir import DEFAULT_FANOUT_CONCURRENCY, DEFAULT_PAGE_SIZE, NETWORK_DEFAULTS, GeneratorOptions
+from api_spec import DEFAULT_CACHE_DIR
+from api_streaming import StreamingKotlinCodeGenerator
+from api_templates import TEMPLATES
+from codegen_server import CONTRACT_ERRORS, DEFAULT_SERVER_PORT, CodegenService, make_server
+from codegen_watch import make_watcher
+from kotlin_templates import TemplateRegistry
 
-class KotlinCodeGenerator:
-    def __init__(self, yaml_content: str, feature_name: str):
-        self.spec = yaml.safe_load(yaml_content)
-        self.feature_name = feature_name
-        self.base_package = "com.example.api"
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        
-    def generate_all(self, output_dir: str):
-        """Generate all Kotlin files"""
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Generate files in order of dependency
-        endpoint_constants_file = self.generate_endpoint_constants(output_dir)
-        dto_files = self.generate_dtos(output_dir)
-        mapper_files = self.generate_mappers(output_dir)
-        remote_datasource_files = self.generate_remote_datasources(output_dir)
-        repository_files = self.generate_repositories(output_dir)
-        
-        return {
-            "endpoint_constants": endpoint_constants_file,
-            "dtos": dto_files,
-            "mappers": mapper_files,
-            "remote_datasources": remote_datasource_files,
-            "repositories": repository_files
-        }
-    
-    def generate_endpoint_constants(self, output_dir: str) -> str:
-        """Generate API endpoint constants object"""
-        constants = []
-        
-        for feature in self.spec.get("features", []):
-            endpoint = feature["endpoint"].strip("/")
-            method = feature["method"].upper()
-            constant_name = f"{method}_{endpoint.replace('/', '_').replace('-', '_').replace('{', '').replace('}', '').upper()}"
-            constants.append(f"    const val {constant_name} = \"{endpoint}\"")
-        
-        file_path = os.path.join(output_dir, f"{self.feature_name}ApiEndPoint.kt")
-        newline = '\n'
-        with open(file_path, "w") as f:
-            f.write(f"""package {self.base_package}.endpoint
 
-internal object {self.feature_name}ApiEndPoint {{
-{newline.join(constants)}
-}}
-""")
-        return file_path
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description='Generate Kotlin code from YAML API specification')
+    parser.add_argument('--yaml', type=str, help='Path to YAML file')
+    parser.add_argument('--feature', type=str, help='Feature name for generated code')
+    parser.add_argument('--batch', type=str, help='Directory or glob of YAML contracts to generate in parallel')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for --batch (default: CPU count)')
+    parser.add_argument('--summary', type=str, help='Write the --batch summary as JSON to this path')
+    parser.add_argument('--output', type=str, default='generated', help='Output directory')
+    parser.add_argument('--force', action='store_true', help='Ignore the manifest and render every file again')
+    parser.add_argument('--cache-dir', type=str, default=DEFAULT_CACHE_DIR, help='Directory for cached contract parses')
+    parser.add_argument('--no-cache', action='store_true', help='Always parse contracts from YAML')
+    parser.add_argument('--stream', action='store_true', help='Read --yaml one feature at a time to bound memory on very large contracts (implied for .jsonl)')
+    parser.add_argument('--watch', action='store_true', help='Keep running and regenerate features whose contract changed')
+    parser.add_argument('--reproducible', action='store_true', help='Leave wall-clock timestamps out of generated files')
+    parser.add_argument('--provenance', action='store_true', help='Stamp generated files with a hash of their contract entries (implies --reproducible)')
+    parser.add_argument('--templates', type=str, help='Directory of <name>.tmpl files overriding the built-in templates')
+    parser.add_argument('--compact', action='store_true', help='Delegate data source and repository methods to one shared helper per file and report the size saved')
+    parser.add_argument('--page-size', type=int, default=DEFAULT_PAGE_SIZE, help='Default page size of generated paging sources')
+    parser.add_argument('--prefetch-distance', type=int, help='Default prefetch distance of generated paging sources (default: page size)')
+    parser.add_argument('--fanout-concurrency', type=int, default=DEFAULT_FANOUT_CONCURRENCY, help='Calls in flight at once in generated batch methods')
+    parser.add_argument('--network', action='store_true', help='Generate a tuned Ktor client and a Koin module wiring it into the data source (also enabled by a network block in the contract)')
+    parser.add_argument('--pool-size', type=int, help=f'Idle connections kept alive by the network module (default: {NETWORK_DEFAULTS["poolSize"]})')
+    parser.add_argument('--keep-alive-seconds', type=int, help=f'How long idle connections are kept (default: {NETWORK_DEFAULTS["keepAliveSeconds"]})')
+    parser.add_argument('--connect-timeout-ms', type=int, help=f'Connect timeout of the network module (default: {NETWORK_DEFAULTS["connectTimeoutMillis"]})')
+    parser.add_argument('--request-timeout-ms', type=int, help=f'Request timeout of the network module (default: {NETWORK_DEFAULTS["requestTimeoutMillis"]})')
+    parser.add_argument('--type-index', type=str, help='Workspace type index (JSON); DTO shapes shared across contracts are generated once into --core-output')
+    parser.add_argument('--core-output', type=str, help='Where --type-index writes the shared DTOs (default: <output>/core)')
+    parser.add_argument('--profile', type=str, help='Write a JSON report of time per stage, files and bytes written')
+    parser.add_argument('--cprofile', type=str, help='Also write a cProfile dump (pstats format) to this path')
+    parser.add_argument('--poll-interval', type=float, default=0.5, help='Seconds between checks when inotify is unavailable')
+    parser.add_argument('--serve', action='store_true', help='Run a local HTTP server that keeps generators warm between requests')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='Address for --serve')
+    parser.add_argument('--port', type=int, default=DEFAULT_SERVER_PORT, help='Port for --serve')
+    
+    args = parser.parse_args(argv)
+    if args.no_cache:
+        args.cache_dir = None
     
-    def generate_dtos(self, output_dir: str) -> List[str]:
-        """Generate Data Transfer Objects"""
-        generated_files = []
-        dto_dir = os.path.join(output_dir, "dtos")
-        os.makedirs(dto_dir, exist_ok=True)
-        
-        dto_specs = {}
-        
-        for feature in self.spec.get("features", []):
-            # Response DTOs
-            if "response" in feature:
-                response = feature["response"]
-                if response["type"] == "object":
-                    dto_name = f"{self.feature_name}{feature['method'].capitalize()}Response"
-                    dto_specs[dto_name] = response["properties"]
-                elif response["type"] == "array" and "items" in response:
-                    if isinstance(response["items"], list):
-                        for i, item in enumerate(response["items"]):
-                            if item["type"] == "object":
-                                dto_name = f"{self.feature_name}{feature['method'].capitalize()}Item{i+1}"
-                                dto_specs[dto_name] = item["properties"]
-                    elif response["items"]["type"] == "object":
-                        dto_name = f"{self.feature_name}{feature['method'].capitalize()}Item"
-                        dto_specs[dto_name] = response["items"]["properties"]
-            
-            # Request DTOs
-            if "request" in feature and feature["request"]["type"] == "object":
-                dto_name = f"{self.feature_name}{feature['method'].capitalize()}Request"
-                dto_specs[dto_name] = feature["request"]["properties"]
-        
-        for dto_name, properties in dto_specs.items():
-            file_path = os.path.join(dto_dir, f"{dto_name}.kt")
-            with open(file_path, "w") as f:
-                f.write(self._generate_dto_class(dto_name, properties))
-            generated_files.append(file_path)
-        
-        return generated_files
+    if args.stream and (args.batch or args.watch):
+        parser.error("--stream works with a single --yaml contract only")
+    if args.type_index and (args.watch or args.serve):
+        parser.error("--type-index works with --yaml or --batch")
+    if args.serve:
+        run_serve(args)
+        return
+    if args.watch:
+        run_watch(args, parser)
+        return
+    if not args.batch and (not args.yaml or not args.feature):
+        parser.error("--yaml and --feature are required unless --batch is given")
     
-    def generate_mappers(self, output_dir: str) -> List[str]:
-        """Generate mapper classes for DTO to Domain conversion"""
-        generated_files = []
-        mapper_dir = os.path.join(output_dir, "mappers")
-        os.makedirs(mapper_dir, exist_ok=True)
-        
-        dto_classes = set()
-        
-        for feature in self.spec.get("features", []):
-            if "response" in feature:
-                response = feature["response"]
-                if response["type"] == "object":
-                    dto_classes.add(f"{self.feature_name}{feature['method'].capitalize()}Response")
-                elif response["type"] == "array" and "items" in response:
-                    if isinstance(response["items"], list):
-                        for i in range(len(response["items"])):
-                            dto_classes.add(f"{self.feature_name}{feature['method'].capitalize()}Item{i+1}")
-                    else:
-                        dto_classes.add(f"{self.feature_name}{feature['method'].capitalize()}Item")
-        
-        for dto_class in dto_classes:
-            mapper_name = f"{dto_class}Mapper"
-            file_path = os.path.join(mapper_dir, f"{mapper_name}.kt")
-            with open(file_path, "w") as f:
-                f.write(f"""package {self.base_package}.mappers
+    profiler = None
+    if args.cprofile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        if args.batch:
+            run_batch(args)
+        else:
+            run_single(args)
+    finally:
+        if profiler:
+            profiler.disable()
+            profiler.dump_stats(args.cprofile)
 
-import {self.base_package}.dtos.{dto_class}
-import {self.base_package}.domain.models.{self.feature_name}Model
 
-internal class {mapper_name} {{
-    fun {dto_class.lower()[0] + dto_class[1:]}.toDomain(): {self.feature_name}Model {{
-        return {self.feature_name}Model(
-            // TODO: Map DTO properties to domain model properties
-        )
-    }}
-}}
-""")
-            generated_files.append(file_path)
-        
-        return generated_files
-    
-    def generate_remote_datasources(self, output_dir: str) -> List[str]:
-        """Generate remote data source interface and implementation"""
-        generated_files = []
-        datasource_dir = os.path.join(output_dir, "datasources")
-        os.makedirs(datasource_dir, exist_ok=True)
-        
-        # Generate interface
-        interface_methods = []
-        impl_methods = []
-        
-        for feature in self.spec.get("features", []):
-            endpoint = feature["endpoint"].strip("/")
-            method = feature["method"].lower()
-            # method_name = f"{method}{endpoint.replace('/', '').replace('{', '').replace('}', '').capitalize()}"
-            method_name = feature["action"]
-            
-            # Determine return type
-            return_type = f"{self.feature_name}Dto"  # Default, can be adjusted based on your needs
-            
-            # Build parameters
-            params = []
-            call_params = []
-            query_params = []
-            map_query_params = ""
-            
-            if "{" in endpoint:
-                path_parts = endpoint.split("/")
-                for part in path_parts:
-                    if part.startswith("{") and part.endswith("}"):
-                        param_name = part[1:-1]
-                        params.append(f"{param_name}: String")
-                        call_params.append(param_name)
-            
-            if "queryParams" in feature:
-                for param in feature["queryParams"]:
-                    kotlin_type = self._kotlin_type(param["type"])
-                    params.append(f"{param['name']}: {kotlin_type}? = null")
-                    # call_params.append(f"{param['name']} = {param['name']}")
-                    query_params.append(f"\"{param['name']}\" to {param['name']}")
-            
-            if "request" in feature:
-                if feature["request"]["type"] == "object":
-                    params.append(f"request: {self.feature_name}{feature['method'].capitalize()}Request")
-                    call_params.append("body = request")
-            
-            if "queryParams" in feature and feature["method"] == "get":
-                map_query_params = f"queryParams = mapOf({','.join(query_params)})"
+def generator_options(args) -> GeneratorOptions:
+    return GeneratorOptions(reproducible=args.reproducible, provenance=args.provenance, compact=args.compact,
+                            page_size=args.page_size, prefetch_distance=args.prefetch_distance,
+                            fanout_concurrency=args.fanout_concurrency, network=network_settings(args))
 
-            # Interface method
-            interface_method = f"    suspend fun {method_name}({', '.join(params)}): ApiResponse<{return_type}>"
-            interface_methods.append(interface_method)
-            
-            # Implementation method
-            http_method = "get" if method.lower() == "get" else method.lower()
-            endpoint_constant = f"{feature['method'].upper()}_{endpoint.replace('/', '_').replace('-', '_').replace('{', '').replace('}', '').upper()}"
-            
-            impl_method = f"""    override suspend fun {method_name}({', '.join(params)}): ApiResponse<{return_type}> {{
-        return try {{
-            httpService.{http_method}(
-                path = {self.feature_name}ApiEndPoint.{endpoint_constant},
-                {', '.join(call_params)},
-                {map_query_params}
-            ).transformResult {{ response ->
-                val json = parseStringToJson(response)
-                ApiResponse.Success(convertJsonObjectToModel(json))
-            }}
-        }} catch (e: HttpException) {{
-            e.toApiResponse()
-        }} catch (e: Exception) {{
-            ApiResponse.Error(e)
-        }}
-    }}"""
-            impl_methods.append(impl_method)
-        
-        # Generate interface file
-        interface_file = os.path.join(datasource_dir, f"{self.feature_name}RemoteDataSource.kt")
-        doubleNewLine = '\n\n'
-        with open(interface_file, "w") as f:
-            f.write(f"""package {self.base_package}.datasources
 
-import {self.base_package}.dtos.*
-import {self.base_package}.network.ApiResponse
+def network_settings(args) -> Dict[str, Any]:
+    """Network settings given on the command line, None when the network module was not asked for"""
+    settings = {
+        key: value for key, value in (
+            ("poolSize", args.pool_size),
+            ("keepAliveSeconds", args.keep_alive_seconds),
+            ("connectTimeoutMillis", args.connect_timeout_ms),
+            ("requestTimeoutMillis", args.request_timeout_ms),
+        ) if value is not None
+    }
+    return settings if settings or args.network else None
 
-internal interface {self.feature_name}RemoteDataSource {{
-{doubleNewLine.join(interface_methods)}
-}}
-""")
-        generated_files.append(interface_file)
-        
-        # Generate implementation file
-        impl_file = os.path.join(datasource_dir, f"{self.feature_name}RemoteDataSourceImpl.kt")
-        with open(impl_file, "w") as f:
-            f.write(f"""package {self.base_package}.datasources
 
-import {self.base_package}.dtos.*
-import {self.base_package}.endpoint.{self.feature_name}ApiEndPoint
-import {self.base_package}.network.ApiResponse
-import {self.base_package}.network.HttpException
-import {self.base_package}.network.HttpService
+def core_output(args) -> str:
+    return args.core_output or os.path.join(args.output, "core")
 
-internal class {self.feature_name}RemoteDataSourceImpl(
-    private val httpService: HttpService,
-) : {self.feature_name}RemoteDataSource {{
-{doubleNewLine.join(impl_methods)}
-}}
-""")
-        generated_files.append(impl_file)
-        
-        return generated_files
+
+def run_single(args):
+    """Generate one contract and print the generated files"""
+    hooks = ProfileHooks() if args.profile else None
+    start = time.perf_counter()
+    templates = TemplateRegistry(TEMPLATES, args.templates)
+    shared_types = None
+    if args.type_index:
+        # Other contracts stay in the index, only this one is refreshed
+        shared_types = update_type_index(args.type_index, [args.yaml], core_output(args), args.cache_dir, templates,
+                                         prune=False)
+    if args.stream or args.yaml.endswith(".jsonl"):
+        generator = StreamingKotlinCodeGenerator(args.yaml, args.feature, hooks, generator_options(args), templates,
+                                                 shared_types)
+    else:
+        with open(args.yaml, 'r') as file:
+            yaml_content = file.read()
+        generator = KotlinCodeGenerator(yaml_content, args.feature, args.cache_dir, hooks, generator_options(args),
+                                        templates, shared_types)
+    result = generator.generate_all(args.output, force=args.force)
+    changes = result.pop("changes")
+    if hooks:
+        report = hooks.report()
+        report["wall_seconds"] = round(time.perf_counter() - start, 6)
+        write_profile(args.profile, report)
     
-    def generate_repositories(self, output_dir: str) -> List[str]:
-        """Generate repository interface and implementation"""
-        generated_files = []
-        repo_dir = os.path.join(output_dir, "repositories")
-        os.makedirs(repo_dir, exist_ok=True)
-        
-        interface_methods = []
-        impl_methods = []
-        
-        for feature in self.spec.get("features", []):
-            endpoint = feature["endpoint"].strip("/")
-            method = feature["method"].lower()
-            # method_name = f"{method}{endpoint.replace('/', '').replace('{', '').replace('}', '').capitalize()}"
-            method_name = feature["action"]
-            
-            # Build parameters
-            params = []
-            call_params = []
-            
-            if "{" in endpoint:
-                path_parts = endpoint.split("/")
-                for part in path_parts:
-                    if part.startswith("{") and part.endswith("}"):
-                        param_name = part[1:-1]
-                        params.append(f"{param_name}: String")
-                        call_params.append(param_name)
-            
-            if "queryParams" in feature:
-                for param in feature["queryParams"]:
-                    kotlin_type = self._kotlin_type(param["type"])
-                    params.append(f"{param['name']}: {kotlin_type}? = null")
-                    call_params.append(f"{param['name']} = {param['name']}")
-            
-            if "request" in feature:
-                if feature["request"]["type"] == "object":
-                    params.append(f"request: {self.feature_name}{feature['method'].capitalize()}Request")
-                    call_params.append("request = request")
-            
-            # Interface method
-            interface_method = f"    suspend fun {method_name}({', '.join(params)}): State<{self.feature_name}Model, Nothing, Nothing>"
-            interface_methods.append(interface_method)
-            
-            # Implementation method
-            impl_method = f"""    override suspend fun {method_name}({', '.join(params)}): State<{self.feature_name}Model, Nothing, Nothing> {{
-        return try {{
-            when (val result = remoteDataSource.{method_name}({', '.join(call_params)})) {{
-                is ApiResponse.Error -> {{
-                    State.Error(message = result.exception.message.orEmpty())
-                }}
-                is ApiResponse.Failed -> {{
-                    State.Error(
-                        message = result.errorDetail.message,
-                        messageTitle = result.errorDetail.messageTitle,
-                        iconCode = result.errorDetail.iconCode
-                    )
-                }}
-                is ApiResponse.Success -> {{
-                    State.Success(data = result.data.toDomain())
-                }}
-            }}
-        }} catch (e: Exception) {{
-            State.Error(e.message.orEmpty())
-        }}
-    }}"""
-            impl_methods.append(impl_method)
-        
-        # Generate interface file
-        interface_file = os.path.join(repo_dir, f"{self.feature_name}Repository.kt")
-        doubleNewLine = '\n\n'
-        with open(interface_file, "w") as f:
-            f.write(f"""package {self.base_package}.repositories
+    print("Generated files:")
+    for category, files in result.items():
+        print(f"\n{category}:")
+        if isinstance(files, list):
+            for file in files:
+                print(f"  - {file}")
+        else:
+            print(f"  - {files}")
+    
+    print("\nChanges: " + ", ".join(f"{len(files)} {kind}" for kind, files in changes.items()))
+    for kind in ("added", "changed", "removed"):
+        for file in changes[kind]:
+            print(f"  {kind}: {file}")
+    if args.compact:
+        print_compact_savings(generator.compact_savings())
 
-import {self.base_package}.domain.models.{self.feature_name}Model
-import com.example.core.State
 
-interface {self.feature_name}Repository {{
-{doubleNewLine.join(interface_methods)}
-}}
-""")
-        generated_files.append(interface_file)
-        
-        # Generate implementation file
-        impl_file = os.path.join(repo_dir, f"{self.feature_name}RepositoryImpl.kt")
-        with open(impl_file, "w") as f:
-            f.write(f"""package {self.base_package}.repositories
+def print_compact_savings(savings: Dict[str, int]):
+    """Print how much smaller compact emission made the data source and repository implementations"""
+    saved_bytes = savings["full_bytes"] - savings["compact_bytes"]
+    saved_lines = savings["full_lines"] - savings["compact_lines"]
+    print(f"\nCompact emission: {savings['compact_bytes']} bytes instead of {savings['full_bytes']} "
+          f"({saved_bytes / max(savings['full_bytes'], 1) * 100:.0f}% smaller), "
+          f"{savings['compact_lines']} lines instead of {savings['full_lines']} ({saved_lines} fewer)")
 
-import {self.base_package}.datasources.{self.feature_name}RemoteDataSource
-import {self.base_package}.domain.models.{self.feature_name}Model
-import {self.base_package}.network.ApiResponse
-import com.example.core.State
 
-internal class {self.feature_name}RepositoryImpl(
-    private val remoteDataSource: {self.feature_name}RemoteDataSource,
-    private val userDataStore: UserDataStore,
-) : {self.feature_name}Repository {{
-{doubleNewLine.join(impl_methods)}
-}}
-""")
-        generated_files.append(impl_file)
-        
-        return generated_files
+
+def run_batch(args):
+    """Run --batch mode and print the aggregated summary"""
+    contract_paths = find_contracts(args.batch)
+    if not contract_paths:
+        raise SystemExit(f"No contracts match {args.batch}")
+    
+    shared_types = None
+    if args.type_index:
+        templates = TemplateRegistry(TEMPLATES, args.templates)
+        shared_types = update_type_index(args.type_index, contract_paths, core_output(args), args.cache_dir, templates)
     
-    def _kotlin_type(self, type_str: str) -> str:
-        """Map YAML types to Kotlin types"""
-        type_mapping = {
-            "string": "String",
-            "integer": "Int",
-            "boolean": "Boolean",
-            "number": "Double"
-        }
-        return type_mapping.get(type_str.lower(), type_str.capitalize())
+    try:
+        summary = generate_batch(contract_paths, args.output, workers=args.workers, force=args.force,
+                                 cache_dir=args.cache_dir, profile=bool(args.profile), options=generator_options(args),
+                                 template_dir=args.templates, shared_types=shared_types, root=contract_root(args.batch))
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if args.profile:
+        report = summary["profile"]
+        report["wall_seconds"] = summary["seconds"]
+        write_profile(args.profile, report)
+    if args.summary:
+        with open(args.summary, "w") as f:
+            json.dump(summary, f, indent=2)
     
-    def _generate_dto_class(self, class_name: str, properties: Dict[str, str]) -> str:
-        """Generate a Kotlin data class for DTO"""
-        properties_code = []
-        newLine = ',\n'
-        for name, type_str in properties.items():
-            kotlin_type = self._kotlin_type(type_str)
-            properties_code.append(f"    val {name}: {kotlin_type}")
-        
-        return f"""package {self.base_package}.dtos
+    for result in summary["results"]:
+        if result["error"]:
+            print(f"FAILED {result['contract']}: {result['error']}")
+        else:
+            print(f"{result['contract']} -> {result['output']} ({result['feature']}): "
+                  f"{result['added']} added, {result['changed']} changed, "
+                  f"{result['skipped']} skipped, {result['removed']} removed in {result['seconds']}s")
+    
+    totals = summary["totals"]
+    print(f"\n{summary['contracts']} contracts, {summary['failed']} failed, {summary['workers']} workers, "
+          f"{summary['seconds']}s: " + ", ".join(f"{count} {kind}" for kind, count in totals.items()))
+    if summary["failed"]:
+        raise SystemExit(1)
 
-/**
- * Generated on {self.timestamp}
- */
-data class {class_name}(
-{newLine.join(properties_code)}
-)
-"""
 
 
-def main():
-    parser = argparse.ArgumentParser(description='Generate Kotlin code from YAML API specification')
-    parser.add_argument('--yaml', type=str, required=True, help='Path to YAML file')
-    parser.add_argument('--feature', type=str, required=True, help='Feature name for generated code')
-    parser.add_argument('--output', type=str, default='generated', help='Output directory')
-    
-    args = parser.parse_args()
-    
-    with open(args.yaml, 'r') as file:
-        yaml_content = file.read()
+def write_profile(path: str, report: Dict[str, Any]):
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Profile written to {path}")
+
+
+def run_serve(args):
+    """Run --serve mode until interrupted or asked to shut down"""
+    server = make_server(CodegenService(args.cache_dir), args.host, args.port, verbose=True)
+    host, port = server.server_address[:2]
+    print(f"Serving code generation on http://{host}:{port} (pid {os.getpid()}), press Ctrl+C to stop")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def run_watch(args, parser):
+    """Run --watch mode: generate once, then regenerate each contract whenever it is saved"""
+    if args.batch:
+        contract_paths = find_contracts(args.batch)
+        try:
+            output_dirs = contract_output_dirs(contract_paths, args.output, contract_root(args.batch))
+        except ValueError as e:
+            parser.error(str(e))
+        jobs = [
+            (path, derive_feature_name(path), contract_output)
+            for path, contract_output in zip(contract_paths, output_dirs)
+        ]
+    elif args.yaml and args.feature:
+        jobs = [(args.yaml, args.feature, args.output)]
+    else:
+        parser.error("--watch needs --yaml and --feature, or --batch")
     
-    generator = KotlinCodeGenerator(yaml_content, args.feature)
-    result = generator.generate_all(args.output)
+    # Contract path -> (generator, output directory, last content)
+    sessions = {}
+    templates = TemplateRegistry(TEMPLATES, args.templates)
+    for contract_path, feature_name, output_dir in jobs:
+        with open(contract_path, "r") as file:
+            yaml_content = file.read()
+        generator = KotlinCodeGenerator(yaml_content, feature_name, args.cache_dir, options=generator_options(args),
+                                        templates=templates)
+        changes = generator.generate_all(output_dir, force=args.force)["changes"]
+        sessions[os.path.abspath(contract_path)] = (generator, output_dir, yaml_content)
+        print(f"{contract_path}: " + ", ".join(f"{len(files)} {kind}" for kind, files in changes.items()))
     
-    print("Generated files:")
-    for category, files in result.items():
-        print(f"\n{category}:")
-        if isinstance(files, list):
-            for file in files:
-                print(f"  - {file}")
-        else:
-            print(f"  - {files}")
+    watcher = make_watcher(list(sessions), args.poll_interval)
+    print(f"Watching {len(sessions)} contract(s) with {type(watcher).__name__}, press Ctrl+C to stop")
+    try:
+        while True:
+            for contract_path in watcher.wait():
+                generator, output_dir, previous_content = sessions[contract_path]
+                try:
+                    with open(contract_path, "r") as file:
+                        yaml_content = file.read()
+                    if yaml_content == previous_content:
+                        continue
+                    features = generator.reload(yaml_content)
+                    changes = generator.generate_all(output_dir)["changes"]
+                except CONTRACT_ERRORS as e:
+                    # Usually a half-finished edit, keep the last good state
+                    print(f"{contract_path}: not regenerated, {type(e).__name__}: {e}")
+                    continue
+                sessions[contract_path] = (generator, output_dir, yaml_content)
+                
+                print(f"{time.strftime('%H:%M:%S')} {contract_path}: features " +
+                      ", ".join(f"{len(actions)} {kind}" for kind, actions in features.items()))
+                for kind in ("added", "changed", "removed"):
+                    for file in changes[kind]:
+                        print(f"  {kind}: {file}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,384 @@
+import argparse
+from datetime import datetime
+import importlib.util
+import json
+import os
+import platform
+import random
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Dict, List
+
+import yaml
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+CODEGEN = os.path.join(os.path.dirname(TEST_DIR), "codegen.py")
+TYPES = ["string", "integer", "boolean", "number"]
+METHODS = ["get", "post", "put", "patch"]
+# Endpoints per resource, so the Retrofit generator groups features like a real contract
+ENDPOINTS_PER_RESOURCE = 8
+
+
+def load_script(name: str, file_name: str):
+    """Import a generator script by path; generate-data-layer.py is not a valid module name"""
+    spec = importlib.util.spec_from_file_location(name, os.path.join(TEST_DIR, file_name))
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def make_contract(features: int, params: int = 2, properties: int = 8, seed: int = 0) -> Dict[str, Any]:
+    """Build a synthetic contract in the features: format with the given shape"""
+    rng = random.Random(seed)
+    spec = {"version": "1.0.0", "description": f"Synthetic contract with {features} features", "features": []}
+
+    for i in range(features):
+        method = METHODS[i % len(METHODS)]
+        resource_name = f"resource{i // ENDPOINTS_PER_RESOURCE}"
+        endpoint = f"/{resource_name}/{{{resource_name}Id}}/item{i}" if method != "post" else f"/{resource_name}/item{i}"
+        properties_spec = {f"field{j}": rng.choice(TYPES) for j in range(properties)}
+        feature = {
+            "endpoint": endpoint,
+            "method": method,
+            "action": f"{method}Item{i}",
+            "description": f"Synthetic endpoint {i}",
+            "response": {"type": "object", "properties": properties_spec}
+        }
+        if method == "get":
+            feature["queryParams"] = [
+                {"name": f"param{j}", "type": rng.choice(TYPES), "required": False} for j in range(params)
+            ]
+            if i % 2:
+                feature["response"] = {"type": "array", "items": {"type": "object", "properties": properties_spec}}
+        else:
+            feature["request"] = {"type": "object", "properties": properties_spec}
+        spec["features"].append(feature)
+
+    return spec
+
+
+class StageTimer:
+    """Accumulates wall time per stage, with time spent writing files split out as its own stage.
+    
+    Also serves as the GenerationHooks of api_codegen.py generators, so their
+    stages are timed exactly as generate_all runs them.
+    """
+
+    def __init__(self):
+        self.stages = {}
+        self.files = 0
+        self.bytes = 0
+        self._write_seconds = 0.0
+        # Write time of the stage in progress, taken out of it when it finishes
+        self._stage_writes = 0.0
+
+    def run(self, stage: str, func, *args):
+        writes_before = self._write_seconds
+        start = time.perf_counter()
+        result = func(*args)
+        elapsed = time.perf_counter() - start
+        self.stages[stage] = self.stages.get(stage, 0.0) + elapsed - (self._write_seconds - writes_before)
+        return result
+
+    def timed_write(self, write):
+        """Wrap a generator's _write_file so its time and volume are recorded"""
+        def wrapper(file_path: str, content: str):
+            start = time.perf_counter()
+            write(file_path, content)
+            self._write_seconds += time.perf_counter() - start
+            self.files += 1
+            self.bytes += len(content.encode())
+        return wrapper
+
+    def stage_finished(self, stage: str, seconds: float):
+        self.stages[stage] = self.stages.get(stage, 0.0) + seconds - self._stage_writes
+        self._stage_writes = 0.0
+
+    def file_written(self, file_path: str, size: int, seconds: float):
+        self._write_seconds += seconds
+        self._stage_writes += seconds
+        self.files += 1
+        self.bytes += size
+
+    def io_finished(self, seconds: float):
+        pass
+
+    def count(self, name: str, amount: int = 1):
+        pass
+
+    def finish(self) -> Dict[str, float]:
+        self.stages["write"] = self._write_seconds
+        return self.stages
+
+
+def bench_api_codegen(module, yaml_content: str, output_dir: str) -> StageTimer:
+    """Time every stage of test/api_codegen.py as generate_all runs them, through its hooks"""
+    timer = StageTimer()
+    generator = module.KotlinCodeGenerator(yaml_content, "Bench", hooks=timer)
+    generator.generate_all(output_dir, force=True)
+    return timer
+
+
+def bench_api_codegen_stream(module, yaml_content: str, output_dir: str) -> StageTimer:
+    """Time test/api_codegen.py --stream; its stages interleave per feature, so they come from its hooks"""
+    contract_path = os.path.join(output_dir, "contract.yaml")
+    with open(contract_path, "w") as f:
+        f.write(yaml_content)
+    if tracemalloc.is_tracing():
+        # Writing the contract is setup, not part of the measured run
+        tracemalloc.reset_peak()
+    
+    hooks = module.ProfileHooks()
+    generator = module.StreamingKotlinCodeGenerator(contract_path, "Bench", hooks)
+    generator.generate_all(os.path.join(output_dir, "generated"), force=True)
+    timer = StageTimer()
+    # Write time stays inside the stages that wrote
+    timer.stages = dict(hooks.stages)
+    timer.files = hooks.files_written
+    timer.bytes = hooks.bytes_written
+    return timer
+
+
+def bench_data_layer(module, yaml_content: str, output_dir: str) -> StageTimer:
+    """Time every stage of test/generate-data-layer.py"""
+    timer = StageTimer()
+    generator = timer.run("parse", module.KotlinCodeGenerator, yaml_content)
+    generator._write_file = timer.timed_write(generator._write_file)
+    timer.run("dtos", generator.generate_dtos, output_dir)
+    timer.run("endpoints", generator.generate_endpoints, output_dir)
+    timer.run("datasources", generator.generate_remote_datasources, output_dir)
+    timer.run("repositories", generator.generate_repositories, output_dir)
+    return timer
+
+
+def fstring_datasource_method(values: Dict[str, str]) -> str:
+    """The data source method as api_codegen.py would render it with a plain f-string"""
+    return f"""    override suspend fun {values['action']}({values['signature']}): ApiResponse<{values['return_type']}> {{
+        return try {{
+            httpService.{values['http_method']}(
+                path = {values['feature_name']}ApiEndPoint.{values['endpoint_constant']},
+                {values['call_params']},
+                {values['query_params']}
+            ).transformResult {{ response ->
+                ApiResponse.Success({values['feature_name']}Json.decodeFromString<{values['return_type']}>(response))
+            }}
+        }} catch (e: HttpException) {{
+            e.toApiResponse()
+        }} catch (e: Exception) {{
+            ApiResponse.Error(e)
+        }}
+    }}"""
+
+
+def bench_templates(module, renders: int) -> Dict[str, Any]:
+    """Compare rendering a data source method through the template registry with the old f-string.
+    
+    compiled calls the template's function with the same dict as the f-string, so it
+    isolates rendering; registry adds the keyword call generators make, which builds
+    a dict of the values on every render.
+    """
+    values = {
+        "action": "getUsersById",
+        "signature": "userId: String, status: String? = null",
+        "return_type": "UserDto",
+        "http_method": "get",
+        "feature_name": "User",
+        "endpoint_constant": "GET_USERS_USERID",
+        "call_params": "userId",
+        "query_params": 'queryParams = mapOf("status" to status)',
+    }
+    registry = module.TemplateRegistry(module.TEMPLATES)
+    template = registry.get("datasource_impl_method")
+    if template.render(**values) != fstring_datasource_method(values):
+        raise AssertionError("Template and f-string renderings differ")
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        fstring_datasource_method(values)
+    fstring_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        template._function(values)
+    compiled_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(renders):
+        registry.render("datasource_impl_method", **values)
+    registry_seconds = time.perf_counter() - start
+
+    print(f"templates    {renders:>7} renders: f-string {fstring_seconds:.4f}s, compiled {compiled_seconds:.4f}s, "
+          f"registry {registry_seconds:.4f}s")
+    return {
+        "renders": renders,
+        "fstring_seconds": round(fstring_seconds, 6),
+        "compiled_seconds": round(compiled_seconds, 6),
+        "registry_seconds": round(registry_seconds, 6),
+        "compiled_vs_fstring": round(compiled_seconds / fstring_seconds, 3) if fstring_seconds else None,
+        "registry_vs_fstring": round(registry_seconds / fstring_seconds, 3) if fstring_seconds else None,
+    }
+
+
+GENERATORS = {
+    "api_codegen": ("api_codegen.py", bench_api_codegen),
+    "api_codegen_stream": ("api_codegen.py", bench_api_codegen_stream),
+    "data_layer": ("generate-data-layer.py", bench_data_layer),
+}
+
+
+# Startup measurement -> codegen.py arguments; "python" is the bare interpreter for reference
+STARTUP_COMMANDS = {
+    "python": None,
+    "help": ["--help"],
+    "module": ["module", "--help"],
+    "datalayer": ["datalayer", "--help"],
+    "retrofit": ["retrofit", "--help"],
+    "openapi": ["openapi", "--help"],
+}
+
+
+def bench_startup(runs: int) -> Dict[str, float]:
+    """Wall time of a fresh process for each entry point, the fastest of runs"""
+    startup = {}
+    for name, arguments in STARTUP_COMMANDS.items():
+        command = [sys.executable, "-c", "pass"] if arguments is None else [sys.executable, CODEGEN, *arguments]
+        best = None
+        for _ in range(runs):
+            start = time.perf_counter()
+            subprocess.run(command, stdout=subprocess.DEVNULL, check=True)
+            seconds = time.perf_counter() - start
+            best = seconds if best is None else min(best, seconds)
+        startup[name] = round(best, 6)
+        print(f"startup {name:10} {best:.4f}s")
+    return startup
+
+
+def run_benchmark(generator_names: List[str], sizes: List[int], params: int, properties: int,
+                  repeat: int = 3, memory: bool = True, template_renders: int = 0,
+                  startup_runs: int = 0) -> Dict[str, Any]:
+    """Benchmark each generator on synthetic contracts of each size"""
+    modules = {name: load_script(name, GENERATORS[name][0]) for name in generator_names}
+    runs = []
+
+    for size in sizes:
+        yaml_content = yaml.safe_dump(make_contract(size, params, properties), sort_keys=False)
+        for name in generator_names:
+            bench = GENERATORS[name][1]
+            best = None
+            for _ in range(repeat):
+                with tempfile.TemporaryDirectory() as output_dir:
+                    timer = bench(modules[name], yaml_content, output_dir)
+                stages = timer.finish()
+                if best is None or sum(stages.values()) < sum(best[0].values()):
+                    best = (stages, timer)
+
+            stages, timer = best
+            run = {
+                "generator": name,
+                "features": size,
+                "params": params,
+                "properties": properties,
+                "stages": {stage: round(seconds, 6) for stage, seconds in stages.items()},
+                "total": round(sum(stages.values()), 6),
+                "files": timer.files,
+                "bytes": timer.bytes,
+            }
+            if memory:
+                # Separate pass, tracemalloc slows everything down
+                tracemalloc.start()
+                with tempfile.TemporaryDirectory() as output_dir:
+                    bench(modules[name], yaml_content, output_dir)
+                run["peak_memory_bytes"] = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+            runs.append(run)
+            print(f"{name:18} {size:>7} features: {run['total']:.4f}s "
+                  + " ".join(f"{stage}={seconds:.4f}" for stage, seconds in run["stages"].items()))
+
+    results = {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "libyaml": bool(getattr(yaml, "__with_libyaml__", False)),
+            "repeat": repeat,
+            "max_rss_kb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+        },
+        "runs": runs
+    }
+    if template_renders:
+        module = modules.get("api_codegen") or load_script("api_codegen", GENERATORS["api_codegen"][0])
+        results["templates"] = bench_templates(module, template_renders)
+    if startup_runs:
+        results["startup"] = bench_startup(startup_runs)
+    return results
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], threshold: float, min_seconds: float = 0.001) -> List[str]:
+    """List stages and startup times that got slower than the baseline by more than threshold"""
+    previous = {(run["generator"], run["features"]): run for run in baseline.get("runs", [])}
+    regressions = []
+    for run in results["runs"]:
+        old = previous.get((run["generator"], run["features"]))
+        if old is None:
+            continue
+        timings = dict(run["stages"], total=run["total"])
+        old_timings = dict(old["stages"], total=old["total"])
+        for stage, seconds in timings.items():
+            old_seconds = old_timings.get(stage)
+            if old_seconds is None or seconds - old_seconds < min_seconds:
+                continue
+            if seconds > old_seconds * (1 + threshold):
+                regressions.append(f"{run['generator']} {run['features']} features {stage}: "
+                                   f"{old_seconds:.4f}s -> {seconds:.4f}s (+{(seconds / old_seconds - 1) * 100:.0f}%)")
+    old_startup = baseline.get("startup", {})
+    for name, seconds in results.get("startup", {}).items():
+        old_seconds = old_startup.get(name)
+        if old_seconds is None or seconds - old_seconds < min_seconds:
+            continue
+        if seconds > old_seconds * (1 + threshold):
+            regressions.append(f"startup {name}: {old_seconds:.4f}s -> {seconds:.4f}s "
+                               f"(+{(seconds / old_seconds - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description='Benchmark the Kotlin code generators on synthetic contracts')
+    parser.add_argument('--sizes', type=str, default='10,100,1000,10000', help='Comma separated feature counts (10 to 100000)')
+    parser.add_argument('--params', type=int, default=2, help='Query params per GET endpoint')
+    parser.add_argument('--properties', type=int, default=8, help='Properties per request/response schema')
+    parser.add_argument('--generator', choices=['all'] + list(GENERATORS), default='all', help='Generator to benchmark')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per size, the fastest is kept')
+    parser.add_argument('--no-memory', action='store_true', help='Skip the tracemalloc peak memory pass')
+    parser.add_argument('--template-renders', type=int, default=20000, help='Renders for the template vs f-string comparison (0 skips it)')
+    parser.add_argument('--startup-runs', type=int, default=10, help='Process launches per codegen.py startup measurement (0 skips it)')
+    parser.add_argument('--output', type=str, default='benchmark.json', help='Where to write the JSON results')
+    parser.add_argument('--baseline', type=str, help='Earlier results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown against --baseline (0.25 = 25%%)')
+
+    args = parser.parse_args(argv)
+
+    sizes = [int(size) for size in args.sizes.split(",") if size]
+    generator_names = list(GENERATORS) if args.generator == 'all' else [args.generator]
+    results = run_benchmark(generator_names, sizes, args.params, args.properties, args.repeat, not args.no_memory,
+                            args.template_renders, args.startup_runs)
+
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)
+        regressions = compare(results, baseline, args.threshold)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
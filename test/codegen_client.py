@@ -0,0 +1,116 @@
+import argparse
+import http.client
+import json
+import os
+import sys
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+DEFAULT_SERVER = "http://127.0.0.1:8765"
+SERVER_ENV = "CODEGEN_SERVER"
+
+
+def request_server(server: str, payload: Dict[str, Any], timeout: float = 300.0) -> Dict[str, Any]:
+    """POST payload to a running `api_codegen.py --serve` and return its JSON reply"""
+    url = urlsplit(server if "://" in server else f"http://{server}")
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80, timeout=timeout)
+    try:
+        connection.request("POST", "/generate", json.dumps(payload), {"Content-Type": "application/json"})
+        response = connection.getresponse()
+        body = json.loads(response.read() or b"{}")
+    finally:
+        connection.close()
+    if response.status != 200:
+        body.setdefault("error", f"HTTP {response.status}")
+    return body
+
+
+def generate_locally(payload: Dict[str, Any], cache_dir: str = None) -> Dict[str, Any]:
+    """Run the same request in this process when no server is reachable"""
+    # Imported here, a client that reaches a server never loads the generators
+    from api_spec import DEFAULT_CACHE_DIR
+    from codegen_server import CONTRACT_ERRORS, CodegenService
+    service = CodegenService(cache_dir or DEFAULT_CACHE_DIR)
+    try:
+        return service.generate(payload)
+    except CONTRACT_ERRORS as e:
+        return {"error": f"{type(e).__name__}: {e}"}
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description='Generate Kotlin code through a running codegen server, or in process without one')
+    parser.add_argument('--yaml', type=str, required=True, help='Path to YAML file')
+    parser.add_argument('--feature', type=str, required=True, help='Feature name for generated code')
+    parser.add_argument('--output', type=str, default='generated', help='Output directory')
+    parser.add_argument('--force', action='store_true', help='Ignore the manifest and render every file again')
+    parser.add_argument('--reproducible', action='store_true', help='Leave wall-clock timestamps out of generated files')
+    parser.add_argument('--provenance', action='store_true', help='Stamp generated files with a hash of their contract entries')
+    parser.add_argument('--compact', action='store_true', help='Delegate data source and repository methods to shared helpers')
+    parser.add_argument('--page-size', type=int, help='Default page size of generated paging sources')
+    parser.add_argument('--prefetch-distance', type=int, help='Default prefetch distance of generated paging sources')
+    parser.add_argument('--fanout-concurrency', type=int, help='Calls in flight at once in generated batch methods')
+    parser.add_argument('--network', action='store_true', help='Generate a tuned Ktor client and a Koin module for it')
+    parser.add_argument('--pool-size', type=int, help='Idle connections kept alive by the network module')
+    parser.add_argument('--keep-alive-seconds', type=int, help='How long idle connections are kept')
+    parser.add_argument('--connect-timeout-ms', type=int, help='Connect timeout of the network module')
+    parser.add_argument('--request-timeout-ms', type=int, help='Request timeout of the network module')
+    parser.add_argument('--templates', type=str, help='Directory of <name>.tmpl files overriding the built-in templates')
+    parser.add_argument('--server', type=str, default=os.environ.get(SERVER_ENV, DEFAULT_SERVER),
+                        help=f'Server address (default: ${SERVER_ENV} or {DEFAULT_SERVER})')
+    parser.add_argument('--no-server', action='store_true', help='Always generate in this process')
+    parser.add_argument('--json', action='store_true', help='Print the full JSON result')
+
+    args = parser.parse_args(argv)
+
+    # Same contract keys as a network block, None leaves the module to the contract
+    network = {
+        key: value for key, value in (
+            ("poolSize", args.pool_size),
+            ("keepAliveSeconds", args.keep_alive_seconds),
+            ("connectTimeoutMillis", args.connect_timeout_ms),
+            ("requestTimeoutMillis", args.request_timeout_ms),
+        ) if value is not None
+    }
+
+    # Paths are resolved here, the server may run from another directory
+    payload = {
+        "contract": os.path.abspath(args.yaml),
+        "feature": args.feature,
+        "output": os.path.abspath(args.output),
+        "force": args.force,
+        "reproducible": args.reproducible,
+        "provenance": args.provenance,
+        "compact": args.compact,
+        "page_size": args.page_size,
+        "prefetch_distance": args.prefetch_distance,
+        "fanout_concurrency": args.fanout_concurrency,
+        "network": network if network or args.network else None,
+        "templates": os.path.abspath(args.templates) if args.templates else None,
+    }
+
+    result = None
+    via = "in process"
+    if not args.no_server:
+        try:
+            result = request_server(args.server, payload)
+            via = f"server {args.server}"
+        except (OSError, ValueError):
+            # Nothing listening (or not a codegen server), fall back below
+            result = None
+    if result is None:
+        result = generate_locally(payload)
+
+    if args.json:
+        print(json.dumps(result, indent=2))
+    elif "error" in result:
+        print(f"Generation failed ({via}): {result['error']}", file=sys.stderr)
+    else:
+        changes = result["changes"]
+        print(f"Generated {result['feature']} into {result['output']} ({via}) in {result['seconds']:.3f}s: "
+              + ", ".join(f"{len(changes[kind])} {kind}" for kind in ("added", "changed", "skipped", "removed")))
+    if "error" in result:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
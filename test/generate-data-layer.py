@@ -1,14 +1,109 @@
 import yaml
+import argparse
 from string import Template
 from typing import Dict, List, Any
+import hashlib
+import json
 import os
-from datetime import datetime
+import re
+
+from kotlin_dtos import KOTLIN_KEYWORDS, DtoTable, dto_base_name
+from kotlin_templates import TemplateRegistry, generation_timestamp
+
+TEMPLATES = {
+    "dto": """
+package ${base_package}.dtos
+
+/**
+ * ${header}
+ */
+data class ${class_name}(
+${properties}
+)
+        """,
+    "dto_property": "    val ${name}: ${kotlin_type}",
+    "dto_enum": """
+package ${base_package}.dtos
+
+/**
+ * ${header}
+ */
+enum class ${class_name} {
+${constants}
+}
+""",
+    "dto_alias": """
+package ${base_package}.dtos
+
+/**
+ * ${header}
+ */
+typealias ${name} = ${class_name}
+""",
+    "endpoint_interface": """package ${base_package}.endpoints
+
+import retrofit2.http.*
+import ${base_package}.dtos.*
+
+/**
+ * ${header}
+ */
+interface ${interface_name} {
+${methods}
+}
+""",
+    "remote_datasource": """package ${base_package}.datasources
+
+import ${base_package}.endpoints.${endpoint_interface}
+import ${base_package}.dtos.*
+import javax.inject.Inject
+
+/**
+ * ${header}
+ */
+class ${class_name} @Inject constructor(
+    private val api: ${endpoint_interface}
+) : I${class_name} {
+${methods}
+}
+""",
+    "remote_datasource_method": "    override suspend fun ${method_name}(${params}) = api.${method_name}(${call_params})",
+    "repository": """package ${base_package}.repositories
+
+import ${base_package}.datasources.${datasource_interface}
+import ${base_package}.dtos.*
+import javax.inject.Inject
+
+/**
+ * ${header}
+ */
+class ${class_name} @Inject constructor(
+    private val remoteDataSource: I${datasource_interface}
+) : I${class_name} {
+${methods}
+}
+""",
+    "repository_method": "    override suspend fun ${method_name}(${params}) = remoteDataSource.${method_name}(${call_params})",
+}
 
 class KotlinCodeGenerator:
-    def __init__(self, yaml_content: str):
+    def __init__(self, yaml_content: str, reproducible: bool = False, provenance: bool = False,
+                 template_dir: str = None):
         self.spec = yaml.safe_load(yaml_content)
+        self.templates = TemplateRegistry(TEMPLATES, template_dir)
         self.base_package = "com.example.api"
-        self.timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self.timestamp = generation_timestamp()
+        self.header = self._header(reproducible, provenance)
+        self._plan_dtos()
+        
+    def _header(self, reproducible: bool, provenance: bool) -> str:
+        """Header comment text; reproducible output carries no wall-clock content"""
+        if provenance:
+            canonical = json.dumps(self.spec, sort_keys=True, default=str)
+            return f"Generated from contract sha256:{hashlib.sha256(canonical.encode()).hexdigest()[:16]}"
+        if reproducible:
+            return "Generated code, do not edit"
+        return f"Generated on {self.timestamp}"
         
     def generate_all(self, output_dir: str):
         """Generate all Kotlin files"""
@@ -35,40 +130,91 @@ class KotlinCodeGenerator:
         dto_dir = os.path.join(output_dir, "dtos")
         os.makedirs(dto_dir, exist_ok=True)
         
-        # Collect all unique response and request types
-        dto_specs = {}
+        # One class per distinct property set, the other names are typealiases of it
+        for dto_name, (class_name, properties, values) in self.dto_specs.items():
+            file_path = os.path.join(dto_dir, f"{dto_name}.kt")
+            if values is not None:
+                content = self._generate_enum_class(dto_name, values)
+            elif class_name == dto_name:
+                content = self._generate_dto_class(dto_name, properties)
+            else:
+                content = self.templates.render("dto_alias", self, name=dto_name, class_name=class_name)
+            self._write_file(file_path, content)
+            generated_files.append(file_path)
+        
+        return generated_files
+    
+    def _plan_dtos(self):
+        """Give every DTO a name unique in the contract and intern identical property sets"""
+        self.dto_table = DtoTable()
+        # id(feature) -> {role: DTO name}, the role being Response, Item or Request; Item may be a scalar type
+        self.dto_names = {}
+        # DTO name -> (name of the class generated for its shape, (name, Kotlin type) pairs, enum values or None)
+        self.dto_specs = {}
         
         for feature in self.spec.get("features", []):
+            names = self.dto_names[id(feature)] = {}
+            prefix = self._dto_prefix(feature)
+            
             # Response DTOs
             if "response" in feature:
                 response = feature["response"]
                 if response["type"] == "object":
-                    dto_name = self._get_dto_name(feature["endpoint"], feature["method"], "Response")
-                    dto_specs[dto_name] = response["properties"]
-                elif response["type"] == "array" and "items" in response:
-                    if isinstance(response["items"], list):
-                        # Handle case where items is a list of objects
-                        for i, item in enumerate(response["items"]):
-                            if item["type"] == "object":
-                                dto_name = self._get_dto_name(feature["endpoint"], feature["method"], f"Item{i+1}")
-                                dto_specs[dto_name] = item["properties"]
-                    elif response["items"]["type"] == "object":
-                        dto_name = self._get_dto_name(feature["endpoint"], feature["method"], "Item")
-                        dto_specs[dto_name] = response["items"]["properties"]
+                    self._add_dto(names, prefix, "Response", response["properties"])
+                elif response["type"] == "array":
+                    names["Item"] = self._item_type(feature, prefix, response.get("items") or "object")
             
             # Request DTOs
-            if "request" in feature and feature["request"]["type"] == "object":
-                dto_name = self._get_dto_name(feature["endpoint"], feature["method"], "Request")
-                dto_specs[dto_name] = feature["request"]["properties"]
-        
-        # Generate DTO files
-        for dto_name, properties in dto_specs.items():
-            file_path = os.path.join(dto_dir, f"{dto_name}.kt")
-            with open(file_path, "w") as f:
-                f.write(self._generate_dto_class(dto_name, properties))
-            generated_files.append(file_path)
+            if "request" in feature:
+                if feature["request"]["type"] == "object":
+                    self._add_dto(names, prefix, "Request", feature["request"]["properties"])
+                else:
+                    names["Request"] = self.dto_table.unique_name(f"{prefix}Request")
+    
+    def _item_type(self, feature: Dict[str, Any], prefix: str, items: Any) -> str:
+        """Kotlin type of the elements of an array response.
         
-        return generated_files
+        items may also be a list of schemas, one per element; the elements must
+        then share one shape, since the endpoint returns a List of a single type.
+        """
+        if not isinstance(items, list):
+            return self.dto_table.resolve(f"{prefix}Item", items, self._kotlin_type, self._define_dto)
+        item_types = [
+            self.dto_table.resolve(f"{prefix}Item", item, self._kotlin_type, self._define_dto) for item in items
+        ]
+        # Aliases of one shape are the same class
+        classes = {self.dto_specs[item_type][0] if item_type in self.dto_specs else item_type for item_type in item_types}
+        if len(classes) != 1:
+            raise ValueError(f"Items of {feature['method'].upper()} {feature['endpoint']} have different shapes: "
+                             f"{', '.join(sorted(classes))}")
+        return item_types[0]
+    
+    def _add_dto(self, names: Dict[str, str], prefix: str, role: str, properties: Dict[str, Any]):
+        name = self.dto_table.unique_name(f"{prefix}{role}")
+        names[role] = name
+        self._define_dto(name, self.dto_table.resolve_properties(name, properties, self._kotlin_type, self._define_dto))
+    
+    def _define_dto(self, name: str, properties: List[tuple], values: tuple = None):
+        """Plan a DTO class, or an enum class for nested enum values"""
+        if values is not None:
+            self.dto_specs[name] = (name, [], values)
+        else:
+            self.dto_specs[name] = (self.dto_table.intern(name, properties), properties, None)
+    
+    def _dto_prefix(self, feature: Dict[str, Any]) -> str:
+        """Name DTOs after the action, or after method and path, e.g. GET /users/{id} -> GetUsersById"""
+        if feature.get("action"):
+            return dto_base_name(feature["action"])
+        words = [feature["method"].lower()]
+        for part in feature["endpoint"].strip("/").split("/"):
+            if part.startswith("{") and part.endswith("}"):
+                words.append("By")
+                part = part[1:-1]
+            words.extend(re.split(r"[^0-9A-Za-z]+", part))
+        return dto_base_name(*words)
+    
+    def _dto_name(self, feature: Dict[str, Any], role: str) -> str:
+        return self.dto_names[id(feature)][role]
     
     def generate_endpoints(self, output_dir: str) -> List[str]:
         """Generate API endpoint interfaces"""
@@ -87,8 +233,7 @@ class KotlinCodeGenerator:
         # Generate endpoint interfaces
         for resource, features in endpoints_by_resource.items():
             file_path = os.path.join(endpoint_dir, f"{resource}.kt")
-            with open(file_path, "w") as f:
-                f.write(self._generate_endpoint_interface(resource, features))
+            self._write_file(file_path, self._generate_endpoint_interface(resource, features))
             generated_files.append(file_path)
         
         return generated_files
@@ -110,8 +255,7 @@ class KotlinCodeGenerator:
         # Generate data source classes
         for resource, features in endpoints_by_resource.items():
             file_path = os.path.join(datasource_dir, f"{resource}.kt")
-            with open(file_path, "w") as f:
-                f.write(self._generate_remote_datasource(resource, features))
+            self._write_file(file_path, self._generate_remote_datasource(resource, features))
             generated_files.append(file_path)
         
         return generated_files
@@ -133,16 +277,15 @@ class KotlinCodeGenerator:
         # Generate repository classes
         for resource, features in endpoints_by_resource.items():
             file_path = os.path.join(repo_dir, f"{resource}.kt")
-            with open(file_path, "w") as f:
-                f.write(self._generate_repository(resource, features))
+            self._write_file(file_path, self._generate_repository(resource, features))
             generated_files.append(file_path)
         
         return generated_files
     
-    def _get_dto_name(self, endpoint: str, method: str, suffix: str) -> str:
-        """Generate a DTO class name from endpoint and method"""
-        resource = endpoint.split("/")[1].capitalize()
-        return f"{resource}{method.capitalize()}{suffix}"
+    def _write_file(self, file_path: str, content: str):
+        """Write a generated file"""
+        with open(file_path, "w") as f:
+            f.write(content)
     
     def _kotlin_type(self, type_str: str) -> str:
         """Map YAML types to Kotlin types"""
@@ -154,23 +297,20 @@ class KotlinCodeGenerator:
         }
         return type_mapping.get(type_str.lower(), type_str.capitalize())
     
-    def _generate_dto_class(self, class_name: str, properties: Dict[str, str]) -> str:
-        """Generate a Kotlin data class for DTO"""
-        properties_code = []
-        for name, type_str in properties.items():
-            kotlin_type = self._kotlin_type(type_str)
-            properties_code.append(f"    val {name}: {kotlin_type}")
-        
-        return f"""
-package {self.base_package}.dtos
-
-/**
- * Generated on {self.timestamp}
- */
-data class {class_name}(
-{','.join(properties_code)}
-)
-        """
+    def _generate_dto_class(self, class_name: str, properties: List[tuple]) -> str:
+        """Generate a Kotlin data class for DTO from (name, Kotlin type) pairs"""
+        property_template = self.templates.get("dto_property")
+        properties_code = [
+            property_template.render(name=name, kotlin_type=kotlin_type)
+            for name, kotlin_type in properties
+        ]
+        return self.templates.render("dto", self, class_name=class_name, properties=','.join(properties_code))
+    
+    def _generate_enum_class(self, class_name: str, values: tuple) -> str:
+        """Generate a Kotlin enum class whose constants are the wire values"""
+        constants = [f"    {value}" if value.isidentifier() and value not in KOTLIN_KEYWORDS else f"    `{value}`"
+                     for value in values]
+        return self.templates.render("dto_enum", self, class_name=class_name, constants=',\n'.join(constants))
     
     def _generate_endpoint_interface(self, interface_name: str, features: List[Dict[str, Any]]) -> str:
         """Generate a Retrofit interface for API endpoints"""
@@ -185,11 +325,9 @@ data class {class_name}(
             if "response" in feature:
                 response = feature["response"]
                 if response["type"] == "object":
-                    dto_name = self._get_dto_name(endpoint, feature["method"], "Response")
-                    return_type = dto_name
+                    return_type = self._dto_name(feature, "Response")
                 elif response["type"] == "array":
-                    item_dto_name = self._get_dto_name(endpoint, feature["method"], "Item")
-                    return_type = f"List<{item_dto_name}>"
+                    return_type = f"List<{self._dto_name(feature, 'Item')}>"
             
             # Handle path parameters
             path_params = []
@@ -210,8 +348,7 @@ data class {class_name}(
             # Handle request body
             request_body = ""
             if "request" in feature:
-                dto_name = self._get_dto_name(endpoint, feature["method"], "Request")
-                request_body = f"\n    @Body request: {dto_name}"
+                request_body = f"\n    @Body request: {self._dto_name(feature, 'Request')}"
             
             # Combine all parameters
             all_params = path_params + query_params
@@ -229,18 +366,7 @@ data class {class_name}(
             
             methods.append(f"{method_annotation}\n{method_signature}")
         
-        return f"""package {self.base_package}.endpoints
-
-import retrofit2.http.*
-import {self.base_package}.dtos.*
-
-/**
- * Generated on {self.timestamp}
- */
-interface {interface_name} {{
-{''.join(methods)}
-}}
-"""
+        return self.templates.render("endpoint_interface", self, interface_name=interface_name, methods=''.join(methods))
     
     def _generate_remote_datasource(self, class_name: str, features: List[Dict[str, Any]]) -> str:
         """Generate a remote data source implementation"""
@@ -267,8 +393,7 @@ interface {interface_name} {{
                     params.append(f"{param['name']}: {kotlin_type}? = null")
             
             if "request" in feature:
-                dto_name = self._get_dto_name(endpoint, feature["method"], "Request")
-                params.append(f"request: {dto_name}")
+                params.append(f"request: {self._dto_name(feature, 'Request')}")
             
             # Build method call
             call_params = []
@@ -286,26 +411,19 @@ interface {interface_name} {{
             if "request" in feature:
                 call_params.append("request")
             
-            method_code = f"override suspend fun {method_name}({', '.join(params)}) = "
-            method_code += f"api.{method_name}({', '.join(call_params)})"
-            
-            methods.append(method_code)
+            methods.append(self.templates.render(
+                "remote_datasource_method",
+                method_name=method_name,
+                params=', '.join(params),
+                call_params=', '.join(call_params)
+            ))
         
-        return f"""package {self.base_package}.datasources
-
-import {self.base_package}.endpoints.{endpoint_interface}
-import {self.base_package}.dtos.*
-import javax.inject.Inject
-
-/**
- * Generated on {self.timestamp}
- */
-class {class_name} @Inject constructor(
-    private val api: {endpoint_interface}
-) : I{class_name} {{
-{''.join(f'    {method}' for method in methods)}
-}}
-"""
+        return self.templates.render(
+            "remote_datasource", self,
+            class_name=class_name,
+            endpoint_interface=endpoint_interface,
+            methods=''.join(methods)
+        )
     
     def _generate_repository(self, class_name: str, features: List[Dict[str, Any]]) -> str:
         """Generate a repository implementation"""
@@ -332,8 +450,7 @@ class {class_name} @Inject constructor(
                     params.append(f"{param['name']}: {kotlin_type}? = null")
             
             if "request" in feature:
-                dto_name = self._get_dto_name(endpoint, feature["method"], "Request")
-                params.append(f"request: {dto_name}")
+                params.append(f"request: {self._dto_name(feature, 'Request')}")
             
             # Build method call
             call_params = []
@@ -351,26 +468,19 @@ class {class_name} @Inject constructor(
             if "request" in feature:
                 call_params.append("request")
             
-            method_code = f"override suspend fun {method_name}({', '.join(params)}) = "
-            method_code += f"remoteDataSource.{method_name}({', '.join(call_params)})"
-            
-            methods.append(method_code)
+            methods.append(self.templates.render(
+                "repository_method",
+                method_name=method_name,
+                params=', '.join(params),
+                call_params=', '.join(call_params)
+            ))
         
-        return f"""package {self.base_package}.repositories
-
-import {self.base_package}.datasources.{datasource_interface}
-import {self.base_package}.dtos.*
-import javax.inject.Inject
-
-/**
- * Generated on {self.timestamp}
- */
-class {class_name} @Inject constructor(
-    private val remoteDataSource: I{datasource_interface}
-) : I{class_name} {{
-{''.join(f'    {method}' for method in methods)}
-}}
-"""
+        return self.templates.render(
+            "repository", self,
+            class_name=class_name,
+            datasource_interface=datasource_interface,
+            methods=''.join(methods)
+        )
     
     def _get_endpoint_method_name(self, endpoint: str, method: str) -> str:
         """Generate a method name from endpoint and HTTP method"""
@@ -398,9 +508,8 @@ class {class_name} @Inject constructor(
             return f"{method.lower()}{resource.capitalize()}"
 
 
-def main():
-    # Example usage
-    yaml_content = """
+# Contract generated when no --yaml is given
+EXAMPLE_CONTRACT = """
 features:
   - endpoint: /users
     method: GET
@@ -447,9 +556,24 @@ features:
         id: string
         status: string
 """
-    
-    generator = KotlinCodeGenerator(yaml_content)
-    result = generator.generate_all("generated_code")
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description='Generate a Retrofit data layer from a YAML API contract')
+    parser.add_argument('--yaml', type=str, help='Path to YAML file (default: a built-in example contract)')
+    parser.add_argument('--output', type=str, default='generated_code', help='Output directory')
+    parser.add_argument('--reproducible', action='store_true', help='Leave wall-clock timestamps out of generated files')
+    parser.add_argument('--provenance', action='store_true', help='Stamp generated files with a hash of their contract (implies --reproducible)')
+    parser.add_argument('--templates', type=str, help='Directory of <name>.tmpl files overriding the built-in templates')
+    args = parser.parse_args(argv)
+
+    if args.yaml:
+        with open(args.yaml, 'r') as f:
+            yaml_content = f.read()
+    else:
+        yaml_content = EXAMPLE_CONTRACT
+    generator = KotlinCodeGenerator(yaml_content, args.reproducible, args.provenance, args.templates)
+    result = generator.generate_all(args.output)
     print(f"Generated files: {result}")
 
 
@@ -0,0 +1,30 @@
+package com.example.api.datasources
+
+import com.example.api.network.ApiResponse
+import kotlinx.coroutines.async
+import kotlinx.coroutines.awaitAll
+import kotlinx.coroutines.coroutineScope
+import kotlinx.coroutines.sync.Semaphore
+import kotlinx.coroutines.sync.withPermit
+
+internal object UserFanOut {
+    /**
+     * Calls once per id, at most concurrency calls at a time. Succeeds with the
+     * results in id order when every call succeeds, otherwise returns the first failure.
+     */
+    @Suppress("UNCHECKED_CAST")
+    suspend fun <T> map(
+        ids: List<String>,
+        concurrency: Int,
+        call: suspend (String) -> ApiResponse<T>
+    ): ApiResponse<List<T>> = coroutineScope {
+        val permits = Semaphore(concurrency)
+        val responses = ids.map { id -> async { permits.withPermit { call(id) } } }.awaitAll()
+        val failure = responses.firstOrNull { it !is ApiResponse.Success }
+        if (failure != null) {
+            failure as ApiResponse<List<T>>
+        } else {
+            ApiResponse.Success(responses.map { (it as ApiResponse.Success<T>).data })
+        }
+    }
+}
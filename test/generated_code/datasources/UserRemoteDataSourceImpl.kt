@@ -9,15 +9,14 @@ import com.example.api.network.HttpService
 internal class UserRemoteDataSourceImpl(
     private val httpService: HttpService,
 ) : UserRemoteDataSource {
-    override suspend fun getUsers(page: Int? = null, pageSize: Int? = null, status: String? = null): ApiResponse<UserDto> {
+    override suspend fun getUsers(page: Int? = null, pageSize: Int? = null, status: String? = null): ApiResponse<List<GetUsersItem>> {
         return try {
             httpService.get(
                 path = UserApiEndPoint.GET_USERS,
                 ,
                 queryParams = mapOf("page" to page,"pageSize" to pageSize,"status" to status)
             ).transformResult { response ->
-                val json = parseStringToJson(response)
-                ApiResponse.Success(convertJsonObjectToModel(json))
+                ApiResponse.Success(UserJson.decodeFromString<List<GetUsersItem>>(response))
             }
         } catch (e: HttpException) {
             e.toApiResponse()
@@ -26,15 +25,14 @@ internal class UserRemoteDataSourceImpl(
         }
     }
 
-    override suspend fun getUsersById(userId: String): ApiResponse<UserDto> {
+    override suspend fun getUsersById(userId: String): ApiResponse<GetUsersByIdResponse> {
         return try {
             httpService.get(
                 path = UserApiEndPoint.GET_USERS_USERID,
                 userId,
                 
             ).transformResult { response ->
-                val json = parseStringToJson(response)
-                ApiResponse.Success(convertJsonObjectToModel(json))
+                ApiResponse.Success(UserJson.decodeFromString<GetUsersByIdResponse>(response))
             }
         } catch (e: HttpException) {
             e.toApiResponse()
@@ -43,15 +41,17 @@ internal class UserRemoteDataSourceImpl(
         }
     }
 
-    override suspend fun createUser(request: UserPostRequest): ApiResponse<UserDto> {
+    override suspend fun getUsersByIds(userIds: List<String>): ApiResponse<List<GetUsersByIdResponse>> =
+        UserFanOut.map(userIds, concurrency = 4) { userId -> getUsersById(userId) }
+
+    override suspend fun createUser(request: CreateUserRequest): ApiResponse<CreateUserResponse> {
         return try {
             httpService.post(
                 path = UserApiEndPoint.POST_USERS,
                 body = request,
                 
             ).transformResult { response ->
-                val json = parseStringToJson(response)
-                ApiResponse.Success(convertJsonObjectToModel(json))
+                ApiResponse.Success(UserJson.decodeFromString<CreateUserResponse>(response))
             }
         } catch (e: HttpException) {
             e.toApiResponse()
@@ -60,15 +60,14 @@ internal class UserRemoteDataSourceImpl(
         }
     }
 
-    override suspend fun updateUserById(userId: String, request: UserPutRequest): ApiResponse<UserDto> {
+    override suspend fun updateUserById(userId: String, request: UpdateUserByIdRequest): ApiResponse<UpdateUserByIdResponse> {
         return try {
             httpService.put(
                 path = UserApiEndPoint.PUT_USERS_USERID,
                 userId, body = request,
                 
             ).transformResult { response ->
-                val json = parseStringToJson(response)
-                ApiResponse.Success(convertJsonObjectToModel(json))
+                ApiResponse.Success(UserJson.decodeFromString<UpdateUserByIdResponse>(response))
             }
         } catch (e: HttpException) {
             e.toApiResponse()
@@ -77,15 +76,14 @@ internal class UserRemoteDataSourceImpl(
         }
     }
 
-    override suspend fun updateUserStatus(userId: String, request: UserPatchRequest): ApiResponse<UserDto> {
+    override suspend fun updateUserStatus(userId: String, request: UpdateUserStatusRequest): ApiResponse<UpdateUserStatusResponse> {
         return try {
             httpService.patch(
                 path = UserApiEndPoint.PATCH_USERS_USERID_STATUS,
                 userId, body = request,
                 
             ).transformResult { response ->
-                val json = parseStringToJson(response)
-                ApiResponse.Success(convertJsonObjectToModel(json))
+                ApiResponse.Success(UserJson.decodeFromString<UpdateUserStatusResponse>(response))
             }
         } catch (e: HttpException) {
             e.toApiResponse()
@@ -94,15 +92,14 @@ internal class UserRemoteDataSourceImpl(
         }
     }
 
-    override suspend fun searchUser(query: String? = null, field: String? = null): ApiResponse<UserDto> {
+    override suspend fun searchUser(query: String? = null, field: String? = null): ApiResponse<List<SearchUserItem>> {
         return try {
             httpService.get(
                 path = UserApiEndPoint.GET_USERS_SEARCH,
                 ,
                 queryParams = mapOf("query" to query,"field" to field)
             ).transformResult { response ->
-                val json = parseStringToJson(response)
-                ApiResponse.Success(convertJsonObjectToModel(json))
+                ApiResponse.Success(UserJson.decodeFromString<List<SearchUserItem>>(response))
             }
         } catch (e: HttpException) {
             e.toApiResponse()
@@ -111,15 +108,14 @@ internal class UserRemoteDataSourceImpl(
         }
     }
 
-    override suspend fun validateUserEmail(request: UserPostRequest): ApiResponse<UserDto> {
+    override suspend fun validateUserEmail(request: ValidateUserEmailRequest): ApiResponse<ValidateUserEmailResponse> {
         return try {
             httpService.post(
                 path = UserApiEndPoint.POST_USERS_VALIDATE_EMAIL,
                 body = request,
                 
             ).transformResult { response ->
-                val json = parseStringToJson(response)
-                ApiResponse.Success(convertJsonObjectToModel(json))
+                ApiResponse.Success(UserJson.decodeFromString<ValidateUserEmailResponse>(response))
             }
         } catch (e: HttpException) {
             e.toApiResponse()
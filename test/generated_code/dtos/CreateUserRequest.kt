@@ -0,0 +1,17 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * Generated code, do not edit
+ */
+@Serializable
+data class CreateUserRequest(
+    @SerialName("username") val username: String,
+    @SerialName("email") val email: String,
+    @SerialName("password") val password: String,
+    @SerialName("firstName") val firstName: String,
+    @SerialName("lastName") val lastName: String,
+    @SerialName("phoneNumber") val phoneNumber: String
+)
@@ -0,0 +1,15 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * Generated code, do not edit
+ */
+@Serializable
+data class CreateUserResponse(
+    @SerialName("id") val id: String,
+    @SerialName("username") val username: String,
+    @SerialName("email") val email: String,
+    @SerialName("createdAt") val createdAt: String
+)
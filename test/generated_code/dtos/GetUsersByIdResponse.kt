@@ -0,0 +1,21 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * Generated code, do not edit
+ */
+@Serializable
+data class GetUsersByIdResponse(
+    @SerialName("id") val id: String,
+    @SerialName("username") val username: String,
+    @SerialName("email") val email: String,
+    @SerialName("firstName") val firstName: String,
+    @SerialName("lastName") val lastName: String,
+    @SerialName("phoneNumber") val phoneNumber: String,
+    @SerialName("createdAt") val createdAt: String,
+    @SerialName("updatedAt") val updatedAt: String,
+    @SerialName("status") val status: GetUsersByIdResponseStatus,
+    @SerialName("preferences") val preferences: GetUsersByIdResponsePreferences
+)
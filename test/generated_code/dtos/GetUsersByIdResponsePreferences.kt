@@ -0,0 +1,15 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * Generated code, do not edit
+ */
+@Serializable
+data class GetUsersByIdResponsePreferences(
+    @SerialName("language") val language: String,
+    @SerialName("theme") val theme: GetUsersByIdResponsePreferencesTheme,
+    @SerialName("notifications") val notifications: GetUsersByIdResponsePreferencesNotifications,
+    @SerialName("favoriteCategories") val favoriteCategories: List<String>
+)
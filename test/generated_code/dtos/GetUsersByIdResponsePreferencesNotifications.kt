@@ -0,0 +1,13 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * Generated code, do not edit
+ */
+@Serializable
+data class GetUsersByIdResponsePreferencesNotifications(
+    @SerialName("email") val email: Boolean,
+    @SerialName("push") val push: Boolean
+)
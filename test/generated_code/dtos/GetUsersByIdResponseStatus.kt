@@ -0,0 +1,14 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * Generated code, do not edit
+ */
+@Serializable
+enum class GetUsersByIdResponseStatus {
+    @SerialName("active") ACTIVE,
+    @SerialName("inactive") INACTIVE,
+    @SerialName("suspended") SUSPENDED
+}
@@ -0,0 +1,15 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * Generated code, do not edit
+ */
+@Serializable
+data class UpdateUserByIdRequest(
+    @SerialName("firstName") val firstName: String,
+    @SerialName("lastName") val lastName: String,
+    @SerialName("email") val email: String,
+    @SerialName("phoneNumber") val phoneNumber: String
+)
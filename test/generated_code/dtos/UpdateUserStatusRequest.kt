@@ -0,0 +1,12 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * Generated code, do not edit
+ */
+@Serializable
+data class UpdateUserStatusRequest(
+    @SerialName("status") val status: String
+)
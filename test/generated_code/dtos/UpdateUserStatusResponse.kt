@@ -0,0 +1,14 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.SerialName
+import kotlinx.serialization.Serializable
+
+/**
+ * Generated code, do not edit
+ */
+@Serializable
+data class UpdateUserStatusResponse(
+    @SerialName("id") val id: String,
+    @SerialName("status") val status: String,
+    @SerialName("updatedAt") val updatedAt: String
+)
@@ -1,12 +0,0 @@
-package com.example.api.dtos
-
-/**
- * Generated on 2025-04-18 10:36:54
- */
-data class UserGetItem(
-    val id: String,
-    val username: String,
-    val email: String,
-    val fullName: String,
-    val status: String
-)
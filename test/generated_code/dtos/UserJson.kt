@@ -0,0 +1,10 @@
+package com.example.api.dtos
+
+import kotlinx.serialization.json.Json
+
+/**
+ * Generated code, do not edit
+ */
+internal val UserJson = Json {
+    ignoreUnknownKeys = true
+}
@@ -1,9 +0,0 @@
-package com.example.api.dtos
-
-/**
- * Generated on 2025-04-18 10:36:54
- */
-data class UserPostResponse(
-    val exists: Boolean,
-    val valid: Boolean
-)
@@ -1,11 +0,0 @@
-package com.example.api.dtos
-
-/**
- * Generated on 2025-04-18 10:36:54
- */
-data class UserPutRequest(
-    val firstName: String,
-    val lastName: String,
-    val email: String,
-    val phoneNumber: String
-)
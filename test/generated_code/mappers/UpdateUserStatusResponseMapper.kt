@@ -0,0 +1,12 @@
+package com.example.api.mappers
+
+import com.example.api.dtos.UpdateUserStatusResponse
+import com.example.api.domain.models.UserModel
+
+internal class UpdateUserStatusResponseMapper {
+    fun updateUserStatusResponse.toDomain(): UserModel {
+        return UserModel(
+            // TODO: Map DTO properties to domain model properties
+        )
+    }
+}
@@ -0,0 +1,34 @@
+package com.example.api.paging
+
+import androidx.paging.PagingSource
+import androidx.paging.PagingState
+import com.example.api.datasources.UserRemoteDataSource
+import com.example.api.dtos.GetUsersItem
+import com.example.api.network.ApiResponse
+
+/**
+ * Generated code, do not edit
+ */
+internal class GetUsersPagingSource(
+    private val remoteDataSource: UserRemoteDataSource,
+    private val status: String?,
+) : PagingSource<Int, GetUsersItem>() {
+
+    override fun getRefreshKey(state: PagingState<Int, GetUsersItem>): Int? =
+        state.anchorPosition?.let { anchor ->
+            state.closestPageToPosition(anchor)?.let { page -> page.prevKey?.plus(1) ?: page.nextKey?.minus(1) }
+        }
+
+    override suspend fun load(params: LoadParams<Int>): LoadResult<Int, GetUsersItem> {
+        val page = params.key ?: 1
+        return when (val result = remoteDataSource.getUsers(page = page, pageSize = params.loadSize, status = status)) {
+            is ApiResponse.Success -> LoadResult.Page(
+                data = result.data,
+                prevKey = if (page == 1) null else page - 1,
+                nextKey = if (result.data.size < params.loadSize) null else page + 1
+            )
+            is ApiResponse.Error -> LoadResult.Error(result.exception)
+            is ApiResponse.Failed -> LoadResult.Error(IllegalStateException(result.errorDetail.message))
+        }
+    }
+}
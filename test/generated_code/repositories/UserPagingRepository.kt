@@ -0,0 +1,9 @@
+package com.example.api.repositories
+
+import androidx.paging.PagingData
+import com.example.api.domain.models.UserModel
+import kotlinx.coroutines.flow.Flow
+
+interface UserPagingRepository {
+    fun getUsersPaged(status: String? = null): Flow<PagingData<UserModel>>
+}
@@ -0,0 +1,20 @@
+package com.example.api.repositories
+
+import androidx.paging.Pager
+import androidx.paging.PagingConfig
+import androidx.paging.PagingData
+import androidx.paging.map
+import com.example.api.datasources.UserRemoteDataSource
+import com.example.api.domain.models.UserModel
+import com.example.api.paging.*
+import kotlinx.coroutines.flow.Flow
+import kotlinx.coroutines.flow.map
+
+internal class UserPagingRepositoryImpl(
+    private val remoteDataSource: UserRemoteDataSource,
+) : UserPagingRepository {
+    override fun getUsersPaged(status: String?): Flow<PagingData<UserModel>> = Pager(
+        config = PagingConfig(pageSize = 20, prefetchDistance = 20, initialLoadSize = 20),
+        pagingSourceFactory = { GetUsersPagingSource(remoteDataSource, status) }
+    ).flow.map { page -> page.map { it.toDomain() } }
+}
@@ -4,17 +4,19 @@ import com.example.api.domain.models.UserModel
 import com.example.core.State
 
 interface UserRepository {
-    suspend fun getUsers(page: Int? = null, pageSize: Int? = null, status: String? = null): State<UserModel, Nothing, Nothing>
+    suspend fun getUsers(page: Int? = null, pageSize: Int? = null, status: String? = null): State<List<UserModel>, Nothing, Nothing>
 
     suspend fun getUsersById(userId: String): State<UserModel, Nothing, Nothing>
 
-    suspend fun createUser(request: UserPostRequest): State<UserModel, Nothing, Nothing>
+    suspend fun getUsersByIds(userIds: List<String>): State<List<UserModel>, Nothing, Nothing>
 
-    suspend fun updateUserById(userId: String, request: UserPutRequest): State<UserModel, Nothing, Nothing>
+    suspend fun createUser(request: CreateUserRequest): State<UserModel, Nothing, Nothing>
 
-    suspend fun updateUserStatus(userId: String, request: UserPatchRequest): State<UserModel, Nothing, Nothing>
+    suspend fun updateUserById(userId: String, request: UpdateUserByIdRequest): State<UserModel, Nothing, Nothing>
 
-    suspend fun searchUser(query: String? = null, field: String? = null): State<UserModel, Nothing, Nothing>
+    suspend fun updateUserStatus(userId: String, request: UpdateUserStatusRequest): State<UserModel, Nothing, Nothing>
 
-    suspend fun validateUserEmail(request: UserPostRequest): State<UserModel, Nothing, Nothing>
+    suspend fun searchUser(query: String? = null, field: String? = null): State<List<UserModel>, Nothing, Nothing>
+
+    suspend fun validateUserEmail(request: ValidateUserEmailRequest): State<UserModel, Nothing, Nothing>
 }
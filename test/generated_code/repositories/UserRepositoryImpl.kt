@@ -9,7 +9,7 @@ internal class UserRepositoryImpl(
     private val remoteDataSource: UserRemoteDataSource,
     private val userDataStore: UserDataStore,
 ) : UserRepository {
-    override suspend fun getUsers(page: Int? = null, pageSize: Int? = null, status: String? = null): State<UserModel, Nothing, Nothing> {
+    override suspend fun getUsers(page: Int? = null, pageSize: Int? = null, status: String? = null): State<List<UserModel>, Nothing, Nothing> {
         return try {
             when (val result = remoteDataSource.getUsers(page = page, pageSize = pageSize, status = status)) {
                 is ApiResponse.Error -> {
@@ -23,7 +23,7 @@ internal class UserRepositoryImpl(
                     )
                 }
                 is ApiResponse.Success -> {
-                    State.Success(data = result.data.toDomain())
+                    State.Success(data = result.data.map { it.toDomain() })
                 }
             }
         } catch (e: Exception) {
@@ -53,7 +53,29 @@ internal class UserRepositoryImpl(
         }
     }
 
-    override suspend fun createUser(request: UserPostRequest): State<UserModel, Nothing, Nothing> {
+    override suspend fun getUsersByIds(userIds: List<String>): State<List<UserModel>, Nothing, Nothing> {
+        return try {
+            when (val result = remoteDataSource.getUsersByIds(userIds)) {
+                is ApiResponse.Error -> {
+                    State.Error(message = result.exception.message.orEmpty())
+                }
+                is ApiResponse.Failed -> {
+                    State.Error(
+                        message = result.errorDetail.message,
+                        messageTitle = result.errorDetail.messageTitle,
+                        iconCode = result.errorDetail.iconCode
+                    )
+                }
+                is ApiResponse.Success -> {
+                    State.Success(data = result.data.map { it.toDomain() })
+                }
+            }
+        } catch (e: Exception) {
+            State.Error(e.message.orEmpty())
+        }
+    }
+
+    override suspend fun createUser(request: CreateUserRequest): State<UserModel, Nothing, Nothing> {
         return try {
             when (val result = remoteDataSource.createUser(request = request)) {
                 is ApiResponse.Error -> {
@@ -75,7 +97,7 @@ internal class UserRepositoryImpl(
         }
     }
 
-    override suspend fun updateUserById(userId: String, request: UserPutRequest): State<UserModel, Nothing, Nothing> {
+    override suspend fun updateUserById(userId: String, request: UpdateUserByIdRequest): State<UserModel, Nothing, Nothing> {
         return try {
             when (val result = remoteDataSource.updateUserById(userId, request = request)) {
                 is ApiResponse.Error -> {
@@ -97,7 +119,7 @@ internal class UserRepositoryImpl(
         }
     }
 
-    override suspend fun updateUserStatus(userId: String, request: UserPatchRequest): State<UserModel, Nothing, Nothing> {
+    override suspend fun updateUserStatus(userId: String, request: UpdateUserStatusRequest): State<UserModel, Nothing, Nothing> {
         return try {
             when (val result = remoteDataSource.updateUserStatus(userId, request = request)) {
                 is ApiResponse.Error -> {
@@ -119,7 +141,7 @@ internal class UserRepositoryImpl(
         }
     }
 
-    override suspend fun searchUser(query: String? = null, field: String? = null): State<UserModel, Nothing, Nothing> {
+    override suspend fun searchUser(query: String? = null, field: String? = null): State<List<UserModel>, Nothing, Nothing> {
         return try {
             when (val result = remoteDataSource.searchUser(query = query, field = field)) {
                 is ApiResponse.Error -> {
@@ -133,7 +155,7 @@ internal class UserRepositoryImpl(
                     )
                 }
                 is ApiResponse.Success -> {
-                    State.Success(data = result.data.toDomain())
+                    State.Success(data = result.data.map { it.toDomain() })
                 }
             }
         } catch (e: Exception) {
@@ -141,7 +163,7 @@ internal class UserRepositoryImpl(
         }
     }
 
-    override suspend fun validateUserEmail(request: UserPostRequest): State<UserModel, Nothing, Nothing> {
+    override suspend fun validateUserEmail(request: ValidateUserEmailRequest): State<UserModel, Nothing, Nothing> {
         return try {
             when (val result = remoteDataSource.validateUserEmail(request = request)) {
                 is ApiResponse.Error -> {
@@ -0,0 +1,320 @@
+import yaml
+import argparse
+import re
+import sys
+import time
+from typing import Any, Dict, List, Tuple
+
+from kotlin_dtos import dto_base_name
+
+# libyaml's C loader is several times faster than the pure-Python one; it reads JSON documents too
+SafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+# Contract types of OpenAPI primitive types; anything else is a free-form object
+PRIMITIVE_TYPES = {"string": "string", "integer": "integer", "number": "number", "boolean": "boolean"}
+JSON_MEDIA_TYPE = re.compile(r"^application/([\w.+-]+\+)?json\b")
+
+
+class ContractDumper(yaml.SafeDumper):
+    """Writes shared nested schemas out in full; contracts are read by people, not just loaders"""
+
+    def ignore_aliases(self, data):
+        return True
+
+
+class SchemaResolver:
+    """Resolves $ref and allOf in the schemas of an OpenAPI document.
+
+    Each $ref target and each allOf composition is resolved once and the result
+    is reused for every later reference, so a document resolves in time linear
+    in its size however often its components refer to each other. Resolution
+    stops at the properties of a schema; they are resolved when asked for.
+    Contract schemas converted from resolved schemas are memoized the same way.
+    """
+
+    def __init__(self, document: Dict[str, Any]):
+        self.document = document
+        # $ref string or id() of an inline schema -> resolved schema
+        self._resolved: Dict[Any, Dict[str, Any]] = {}
+        # Keys being resolved right now, to report reference cycles instead of recursing forever
+        self._resolving = set()
+        # id() of a resolved schema -> its contract schema, and the ones being converted right now
+        # with their depth in the conversion
+        self._converted: Dict[int, Any] = {}
+        self._converting: Dict[int, int] = {}
+        # Shallowest depth a cycle was cut at in the conversion in progress
+        self._cut_depth = None
+        # Schemas resolved, and lookups answered from earlier resolutions
+        self.built = 0
+        self.hits = 0
+
+    def lookup(self, ref: str) -> Any:
+        """The document node a local JSON pointer such as #/components/schemas/User points at"""
+        if not ref.startswith("#/"):
+            raise ValueError(f"Only local references are supported, not {ref}")
+        node = self.document
+        for token in ref[2:].split("/"):
+            token = token.replace("~1", "/").replace("~0", "~")
+            try:
+                node = node[int(token)] if isinstance(node, list) else node[token]
+            except (KeyError, IndexError, ValueError):
+                raise ValueError(f"Unresolvable reference {ref}") from None
+        return node
+
+    def deref(self, node: Dict[str, Any]) -> Dict[str, Any]:
+        """Follow $ref chains of a non-schema object such as a parameter or a response"""
+        seen = set()
+        while "$ref" in node:
+            if node["$ref"] in seen:
+                raise ValueError(f"Circular reference {node['$ref']}")
+            seen.add(node["$ref"])
+            node = self.lookup(node["$ref"])
+        return node
+
+    def resolve(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """schema with its $ref followed and its allOf parts merged into it"""
+        key = schema["$ref"] if "$ref" in schema else id(schema)
+        resolved = self._resolved.get(key)
+        if resolved is not None:
+            self.hits += 1
+            return resolved
+        if "$ref" not in schema and "allOf" not in schema:
+            return schema
+        if key in self._resolving:
+            raise ValueError(f"Circular schema reference {schema.get('$ref', 'in allOf')}")
+
+        self._resolving.add(key)
+        try:
+            if "$ref" in schema:
+                resolved = self.resolve(self.lookup(schema["$ref"]))
+            else:
+                resolved = {name: value for name, value in schema.items() if name != "allOf"}
+                properties = {}
+                required = []
+                for part in schema["allOf"]:
+                    part = self.resolve(part)
+                    properties.update(part.get("properties", {}))
+                    required.extend(part.get("required", []))
+                    if "type" not in resolved and "type" in part:
+                        resolved["type"] = part["type"]
+                properties.update(schema.get("properties", {}))
+                required.extend(schema.get("required", []))
+                if properties:
+                    resolved["properties"] = properties
+                    resolved.setdefault("type", "object")
+                if required:
+                    resolved["required"] = list(dict.fromkeys(required))
+        finally:
+            self._resolving.discard(key)
+        self._resolved[key] = resolved
+        self.built += 1
+        return resolved
+
+    def schema_type(self, schema: Dict[str, Any]) -> str:
+        """Contract type of a schema: a primitive, array or object"""
+        schema = self.resolve(schema)
+        schema_type = schema.get("type")
+        if isinstance(schema_type, list):
+            # OpenAPI 3.1 spells nullable as a list of types
+            schema_type = next((name for name in schema_type if name != "null"), None)
+        if schema_type in PRIMITIVE_TYPES:
+            return PRIMITIVE_TYPES[schema_type]
+        if schema_type == "array" or "items" in schema:
+            return "array"
+        return "object"
+
+    def property_schema(self, schema: Dict[str, Any]) -> Any:
+        """Contract schema of a property: a type name, or a nested object, array or enum schema.
+
+        Converted once per resolved schema. A schema nested in itself is cut
+        off where it repeats and becomes a free-form object there. Where the cut
+        lands depends on which schema the conversion started from, so a result
+        with a cut above its own schema is not memoized; converted on its own,
+        that schema would be expanded one level deeper.
+        """
+        schema = self.resolve(schema)
+        key = id(schema)
+        converted = self._converted.get(key)
+        if converted is not None:
+            self.hits += 1
+            return converted
+        depth = self._converting.get(key)
+        if depth is not None:
+            self._cut_depth = depth if self._cut_depth is None else min(self._cut_depth, depth)
+            return "object"
+        depth = self._converting[key] = len(self._converting)
+        outer_cut_depth, self._cut_depth = self._cut_depth, None
+        try:
+            converted = self._convert(schema)
+        finally:
+            del self._converting[key]
+            cut_depth = self._cut_depth
+            self._cut_depth = min((d for d in (outer_cut_depth, cut_depth) if d is not None), default=None)
+        if cut_depth is None or cut_depth >= depth:
+            self._converted[key] = converted
+        return converted
+
+    def _convert(self, schema: Dict[str, Any]) -> Any:
+        schema_type = self.schema_type(schema)
+        if schema_type == "object":
+            properties = {name: self.property_schema(prop) for name, prop in schema.get("properties", {}).items()}
+            return {"type": "object", "properties": properties} if properties else "object"
+        if schema_type == "array":
+            items = schema.get("items")
+            return {"type": "array", "items": self.property_schema(items)} if items else "array"
+        values = [value for value in schema.get("enum", []) if value is not None]
+        if schema_type == "string" and values:
+            return {"type": "string", "enum": values}
+        return schema_type
+
+    def contract_schema(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+        """Contract form of a request or response body, None when it has no typed content"""
+        converted = self.property_schema(schema)
+        if not isinstance(converted, dict) or converted["type"] not in ("object", "array"):
+            return None
+        if converted["type"] == "array" and not isinstance(converted["items"], dict):
+            # Response items are always a mapping with a type
+            converted = {"type": "array", "items": {"type": converted["items"]}}
+        return converted
+
+
+def action_name(method: str, path: str, operation: Dict[str, Any]) -> str:
+    """operationId as an identifier, else e.g. GET /users/{userId}/orders -> getUsersOrdersByUserId"""
+    operation_id = operation.get("operationId")
+    if operation_id:
+        words = [word for word in re.split(r"[^0-9A-Za-z]+", operation_id) if word]
+    else:
+        segments = [segment for segment in path.split("/") if segment]
+        words = [method] + [word for segment in segments if not segment.startswith("{")
+                            for word in re.split(r"[^0-9A-Za-z]+", segment) if word]
+        params = [segment[1:-1] for segment in segments if segment.startswith("{")]
+        if params:
+            words += ["By"] + [word for param in params for word in re.split(r"[^0-9A-Za-z]+", param) if word]
+    name = dto_base_name(*words)
+    return name[0].lower() + name[1:]
+
+
+def json_schema(resolver: SchemaResolver, body: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema of the JSON content of a request body or response, if any"""
+    for media_type, content in resolver.deref(body).get("content", {}).items():
+        if JSON_MEDIA_TYPE.match(media_type) and "schema" in content:
+            return content["schema"]
+    return None
+
+
+def success_response(responses: Dict[str, Any]) -> Dict[str, Any]:
+    """The response a generated call decodes: the lowest 2xx status, else 2XX or default"""
+    # YAML reads unquoted status codes as integers
+    responses = {str(status): response for status, response in responses.items()}
+    statuses = sorted(status for status in responses if status.isdigit() and status.startswith("2"))
+    for status in statuses + ["2XX", "default"]:
+        if status in responses:
+            return responses[status]
+    return None
+
+
+def convert_operation(resolver: SchemaResolver, path: str, method: str, operation: Dict[str, Any],
+                      shared_params: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """One contract feature for an OpenAPI operation"""
+    feature = {"endpoint": path, "method": method, "action": action_name(method, path, operation)}
+    description = operation.get("summary") or operation.get("description")
+    if description:
+        feature["description"] = " ".join(description.split())
+
+    # Operation parameters override path item parameters with the same name and location
+    params = {}
+    for param in shared_params + operation.get("parameters", []):
+        param = resolver.deref(param)
+        params[(param["name"], param["in"])] = param
+    query_params = []
+    for (name, location), param in params.items():
+        if location != "query":
+            continue
+        param_type = resolver.schema_type(param.get("schema", {}))
+        if param_type not in PRIMITIVE_TYPES.values():
+            # Contract query params are single values; a list or object has no query encoding there
+            raise ValueError(f"Query parameter {name} of {method.upper()} {path} is of type {param_type}, "
+                             f"only {', '.join(PRIMITIVE_TYPES)} query parameters are supported")
+        query_param = {
+            "name": name,
+            "type": param_type,
+            "required": bool(param.get("required", False)),
+        }
+        if param.get("description"):
+            query_param["description"] = " ".join(param["description"].split())
+        query_params.append(query_param)
+    if query_params:
+        feature["queryParams"] = query_params
+
+    if "requestBody" in operation:
+        schema = json_schema(resolver, operation["requestBody"])
+        request = resolver.contract_schema(schema) if schema is not None else None
+        if request is not None and request["type"] == "object":
+            feature["request"] = request
+    response = success_response(operation.get("responses", {}))
+    if response is not None:
+        schema = json_schema(resolver, response)
+        response = resolver.contract_schema(schema) if schema is not None else None
+        if response is not None:
+            feature["response"] = response
+    return feature
+
+
+def convert_document(document: Dict[str, Any]) -> Tuple[Dict[str, Any], SchemaResolver]:
+    """Contract for every operation of an OpenAPI 3 document, in document order"""
+    version = str(document.get("openapi", ""))
+    if not version.startswith("3."):
+        raise ValueError(f"Expected an OpenAPI 3 document, found openapi: {version or 'missing'}")
+    resolver = SchemaResolver(document)
+    info = document.get("info", {})
+    features = []
+    actions = set()
+    for path, path_item in (document.get("paths") or {}).items():
+        path_item = resolver.deref(path_item)
+        shared_params = path_item.get("parameters", [])
+        for method in HTTP_METHODS:
+            if method not in path_item:
+                continue
+            feature = convert_operation(resolver, path, method, path_item[method], shared_params)
+            if feature["action"] in actions:
+                raise ValueError(f"Duplicate action {feature['action']} for {method.upper()} {path}")
+            actions.add(feature["action"])
+            features.append(feature)
+
+    contract = {}
+    if "version" in info:
+        contract["version"] = str(info["version"])
+    if info.get("title") or info.get("description"):
+        contract["description"] = " ".join((info.get("title") or info["description"]).split())
+    contract["features"] = features
+    return contract, resolver
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description='Convert an OpenAPI 3 document into a YAML API contract')
+    parser.add_argument('openapi', type=str, help='OpenAPI 3 document, YAML or JSON')
+    parser.add_argument('--output', type=str, help='Contract file to write (default: print it)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    with open(args.openapi, 'r') as f:
+        document = yaml.load(f, Loader=SafeLoader)
+    try:
+        contract, resolver = convert_document(document)
+    except (KeyError, TypeError, ValueError) as e:
+        parser.error(f"{args.openapi}: {type(e).__name__}: {e}")
+
+    text = yaml.dump(contract, Dumper=ContractDumper, sort_keys=False, allow_unicode=True)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(text)
+        print(f"Imported {len(contract['features'])} operations from {args.openapi} into {args.output} "
+              f"({resolver.built} schemas resolved, {resolver.hits} reused) "
+              f"in {time.perf_counter() - start:.3f}s")
+    else:
+        sys.stdout.write(text)
+
+
+if __name__ == "__main__":
+    main()
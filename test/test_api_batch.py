@@ -0,0 +1,116 @@
+import os
+
+import pytest
+
+from api_batch import contract_output_dirs, contract_root, derive_feature_name, generate_batch, update_type_index, write_core_dtos
+from api_templates import TEMPLATES
+from kotlin_templates import TemplateRegistry
+
+CONTRACT = """
+features:
+  - endpoint: /users/{userId}
+    method: get
+    action: getUser
+    response: {type: object, properties: {id: string, name: string}}
+"""
+
+
+def write_contract(path, content=CONTRACT):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return str(path)
+
+
+def test_feature_name_comes_from_the_file_name():
+    assert derive_feature_name("contracts/user-profile_contract.yaml") == "UserProfile"
+    assert derive_feature_name("orders.yml") == "Orders"
+
+
+def test_contract_root_stops_at_the_first_pattern():
+    assert contract_root(os.path.join("contracts", "**", "*.yaml")) == "contracts"
+    assert contract_root("*.yaml") == "."
+
+
+def test_contract_output_dirs_keep_same_named_contracts_apart(tmp_path):
+    paths = [str(tmp_path / "a" / "user.yaml"), str(tmp_path / "b" / "user.yaml")]
+    output_dirs = contract_output_dirs(paths, "out", str(tmp_path))
+    assert output_dirs == [os.path.join("out", "a", "user"), os.path.join("out", "b", "user")]
+
+    with pytest.raises(ValueError):
+        contract_output_dirs([str(tmp_path / "user.yaml"), str(tmp_path / "user.yml")], "out")
+
+
+def test_batch_generates_each_contract_into_its_own_directory(tmp_path):
+    paths = [write_contract(tmp_path / "in" / "a" / "user.yaml"), write_contract(tmp_path / "in" / "b" / "user.yaml")]
+    summary = generate_batch(paths, str(tmp_path / "out"), workers=1, root=str(tmp_path / "in"))
+    assert summary["contracts"] == 2 and summary["failed"] == 0
+    for name in ("a", "b"):
+        assert (tmp_path / "out" / name / "user" / "UserApiEndPoint.kt").exists()
+
+
+def test_batch_reports_a_broken_contract_and_keeps_going(tmp_path):
+    paths = [write_contract(tmp_path / "good.yaml"), write_contract(tmp_path / "bad.yaml", "features: [")]
+    summary = generate_batch(paths, str(tmp_path / "out"), workers=1)
+    assert summary["failed"] == 1
+    errors = {os.path.basename(result["contract"]): result["error"] for result in summary["results"]}
+    assert errors["good.yaml"] is None
+    assert errors["bad.yaml"]
+
+
+USER_CONTRACT = """
+features:
+  - endpoint: /users/{userId}
+    method: get
+    action: getUser
+    response: {type: object, properties: {id: string, name: string}}
+"""
+
+ORDER_CONTRACT = """
+features:
+  - endpoint: /orders/{orderId}/owner
+    method: get
+    action: getOwner
+    response: {type: object, properties: {id: string, name: string}}
+  - endpoint: /orders/{orderId}
+    method: get
+    action: getOrder
+    response: {type: object, properties: {id: string, total: number}}
+"""
+
+SHARED_SHAPE = (("id", "String"), ("name", "String"))
+
+
+def test_shapes_of_several_contracts_are_shared(tmp_path, capsys):
+    paths = [write_contract(tmp_path / "user.yaml", USER_CONTRACT), write_contract(tmp_path / "order.yaml", ORDER_CONTRACT)]
+    index_path = str(tmp_path / "index" / "types.json")
+    shared = update_type_index(index_path, paths, str(tmp_path / "core"))
+    assert shared == {SHARED_SHAPE: "com.example.api.core.dtos.GetOwnerResponse"}
+    assert (tmp_path / "core" / "dtos" / "GetOwnerResponse.kt").exists()
+
+    # Unchanged contracts are not read again
+    update_type_index(index_path, paths, str(tmp_path / "core"))
+    assert "0 re-read" in capsys.readouterr().out.splitlines()[-1]
+
+
+def test_core_dtos_only_remove_what_they_wrote(tmp_path):
+    templates = TemplateRegistry(TEMPLATES)
+    dto_dir = tmp_path / "dtos"
+    dto_dir.mkdir()
+    handwritten = dto_dir / "Money.kt"
+    handwritten.write_text("data class Money(val cents: Long)\n")
+
+    changes = write_core_dtos({SHARED_SHAPE: "UserDto"}, str(tmp_path), templates)
+    assert changes["added"] == [str(dto_dir / "UserDto.kt")]
+    changes = write_core_dtos({(("id", "String"),): "IdDto"}, str(tmp_path), templates)
+    assert changes["removed"] == [str(dto_dir / "UserDto.kt")]
+    assert sorted(path.name for path in dto_dir.glob("*.kt")) == ["IdDto.kt", "Money.kt"]
+    assert not list(dto_dir.glob("*.tmp"))
+
+
+def test_core_dtos_without_a_manifest_remove_nothing(tmp_path):
+    dto_dir = tmp_path / "dtos"
+    dto_dir.mkdir()
+    (dto_dir / "Old.kt").write_text("class Old\n")
+    changes = write_core_dtos({}, str(tmp_path), TemplateRegistry(TEMPLATES))
+    assert changes["removed"] == []
+    assert (dto_dir / "Old.kt").exists()
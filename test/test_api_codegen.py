@@ -0,0 +1,114 @@
+import os
+
+from api_generator import KotlinCodeGenerator
+from api_ir import GeneratorOptions
+
+USERS_CONTRACT = """
+features:
+  - endpoint: /users
+    method: get
+    action: getUsers
+    response: {type: array, items: {type: object, properties: {id: string, name: string}}}
+  - endpoint: /users/{userId}
+    method: get
+    action: getUsersById
+    response: {type: object, properties: {id: string, name: string}}
+"""
+
+# USERS_CONTRACT with getUsersById removed and createUser added
+EDITED_CONTRACT = """
+features:
+  - endpoint: /users
+    method: get
+    action: getUsers
+    response: {type: array, items: {type: object, properties: {id: string, name: string}}}
+  - endpoint: /users
+    method: post
+    action: createUser
+    request: {type: object, properties: {name: string}}
+    response: {type: object, properties: {id: string}}
+"""
+
+
+def generate(yaml_content, output_dir, feature_name="User", **kwargs):
+    generator = KotlinCodeGenerator(yaml_content, feature_name, options=GeneratorOptions(reproducible=True))
+    return generator.generate_all(str(output_dir), **kwargs)["changes"]
+
+
+def test_second_run_skips_unchanged_files(tmp_path):
+    first = generate(USERS_CONTRACT, tmp_path)
+    assert first["added"] and not first["changed"]
+    mtimes = {path: os.stat(path).st_mtime_ns for path in first["added"]}
+
+    second = generate(USERS_CONTRACT, tmp_path)
+    assert not second["added"] and not second["changed"] and not second["removed"]
+    assert sorted(second["skipped"]) == sorted(first["added"])
+    assert {path: os.stat(path).st_mtime_ns for path in first["added"]} == mtimes
+
+
+def test_edited_file_is_rendered_again(tmp_path):
+    changes = generate(USERS_CONTRACT, tmp_path)
+    edited = next(path for path in changes["added"] if path.endswith("UserRepositoryImpl.kt"))
+    with open(edited, "a") as f:
+        f.write("// local edit\n")
+
+    changes = generate(USERS_CONTRACT, tmp_path)
+    assert changes["changed"] == [edited]
+    with open(edited, "r") as f:
+        assert "// local edit" not in f.read()
+
+
+def test_removed_feature_deletes_its_files(tmp_path):
+    generate(USERS_CONTRACT, tmp_path)
+    removed_dto = tmp_path / "dtos" / "GetUsersByIdResponse.kt"
+    assert removed_dto.exists()
+
+    changes = generate(EDITED_CONTRACT, tmp_path)
+    assert str(removed_dto) in changes["removed"]
+    assert not removed_dto.exists()
+    assert (tmp_path / "dtos" / "CreateUserResponse.kt").exists()
+    assert (tmp_path / "dtos" / "GetUsersItem.kt").exists()
+
+
+def test_stale_files_owned_by_another_feature_are_kept(tmp_path):
+    # Both features write dtos/GetUsersByIdResponse.kt; Order must not delete what User still records
+    generate(USERS_CONTRACT, tmp_path, feature_name="User")
+    generate(USERS_CONTRACT, tmp_path, feature_name="Order")
+    shared = tmp_path / "dtos" / "GetUsersByIdResponse.kt"
+
+    changes = generate(EDITED_CONTRACT, tmp_path, feature_name="Order")
+    assert str(shared) not in changes["removed"]
+    assert shared.exists()
+    assert (tmp_path / ".codegen-manifest.User.json").exists()
+
+
+def test_files_not_in_the_manifest_are_never_removed(tmp_path):
+    generate(USERS_CONTRACT, tmp_path)
+    handwritten = tmp_path / "dtos" / "Handwritten.kt"
+    handwritten.write_text("class Handwritten\n")
+
+    changes = generate(EDITED_CONTRACT, tmp_path)
+    assert str(handwritten) not in changes["removed"]
+    assert handwritten.exists()
+
+
+def test_force_renders_every_file(tmp_path):
+    first = generate(USERS_CONTRACT, tmp_path)
+    changes = generate(USERS_CONTRACT, tmp_path, force=True)
+    # Identical content is not rewritten, but every file was rendered and compared
+    assert sorted(changes["skipped"]) == sorted(first["added"])
+
+
+def test_manifest_of_another_generator_version_is_ignored(tmp_path):
+    first = generate(USERS_CONTRACT, tmp_path)
+    manifest = tmp_path / ".codegen-manifest.User.json"
+    manifest.write_text(manifest.read_text().replace('"generator"', '"generator": "0", "old"', 1))
+    edited = next(path for path in first["added"] if path.endswith("UserRepositoryImpl.kt"))
+    with open(edited, "a") as f:
+        f.write("// local edit\n")
+
+    changes = generate(USERS_CONTRACT, tmp_path)
+    # Nothing recorded by an older generator is trusted, every file is rendered and compared
+    assert changes["changed"] == [edited]
+    assert sorted(changes["skipped"] + changes["changed"]) == sorted(first["added"])
+    assert '"generator": "0"' not in manifest.read_text()
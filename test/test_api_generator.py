@@ -0,0 +1,259 @@
+import os
+
+import pytest
+import yaml
+
+from api_generator import KotlinCodeGenerator
+from api_ir import ContractIR, GeneratorOptions, parse_network
+
+
+def feature(**entry):
+    """A GET /users/{userId} contract entry, with entry overriding or adding keys"""
+    base = {"endpoint": "/users/{userId}", "method": "get", "action": "getUserById",
+            "response": {"type": "object", "properties": {"id": "string", "name": "string"}}}
+    base.update(entry)
+    return base
+
+
+def list_feature(**entry):
+    """A paginated GET /users contract entry"""
+    base = {"endpoint": "/users", "method": "get", "action": "getUsers",
+            "queryParams": [{"name": "page", "type": "integer"}, {"name": "limit", "type": "integer"},
+                            {"name": "q", "type": "string"}],
+            "response": {"type": "array", "items": {"type": "object", "properties": {"id": "string"}}}}
+    base.update(entry)
+    return base
+
+
+def compile_features(*features):
+    return ContractIR({"features": list(features)}, "User").features
+
+
+def generate(tmp_path, *features, **options):
+    """Generate a contract and return relative path -> content of every Kotlin file"""
+    contract = yaml.safe_dump({"features": list(features)}, sort_keys=False)
+    generator = KotlinCodeGenerator(contract, "User", options=GeneratorOptions(reproducible=True, **options))
+    generator.generate_all(str(tmp_path))
+    files = {}
+    for directory, _, names in os.walk(tmp_path):
+        for name in names:
+            if name.endswith(".kt"):
+                path = os.path.join(directory, name)
+                with open(path, "r") as f:
+                    files[os.path.relpath(path, tmp_path)] = f.read()
+    return files
+
+
+def test_page_and_size_params_are_detected():
+    [users] = compile_features(list_feature())
+    assert (users.paging.page_param, users.paging.size_param, users.paging.first_page) == ("page", "limit", 1)
+    assert users.paging.item_type == "GetUsersItem"
+
+
+@pytest.mark.parametrize("entry", [
+    {"paging": False},
+    {"queryParams": [{"name": "page", "type": "string"}, {"name": "limit", "type": "integer"}]},
+    {"response": {"type": "object", "properties": {"id": "string"}}},
+    {"method": "post"},
+])
+def test_endpoints_that_do_not_page(entry):
+    [users] = compile_features(list_feature(**entry))
+    assert users.paging is None
+
+
+def test_paging_block_names_params_and_sizes():
+    [users] = compile_features(list_feature(
+        queryParams=[{"name": "offsetPage", "type": "integer"}, {"name": "count", "type": "integer"}],
+        paging={"pageParam": "offsetPage", "sizeParam": "count", "firstPage": 0, "pageSize": 10}))
+    paging = users.paging
+    assert (paging.page_param, paging.size_param, paging.first_page, paging.page_size) == ("offsetPage", "count", 0, 10)
+
+
+def test_paging_source_and_repository_are_generated(tmp_path):
+    files = generate(tmp_path, list_feature(), page_size=50)
+    source = files[os.path.join("paging", "GetUsersPagingSource.kt")]
+    assert "remoteDataSource.getUsers(page = page, limit = params.loadSize, q = q)" in source
+    assert "val page = params.key ?: 1" in source
+    repository = files[os.path.join("repositories", "UserPagingRepositoryImpl.kt")]
+    assert "PagingConfig(pageSize = 50, prefetchDistance = 50, initialLoadSize = 50)" in repository
+    assert "fun getUsersPaged(q: String?)" in repository
+
+
+def test_contracts_without_paging_get_no_paging_files(tmp_path):
+    files = generate(tmp_path, list_feature(paging=False))
+    assert not any("Paging" in path for path in files)
+
+
+CACHING = os.path.join("repositories", "UserCachingRepository.kt")
+
+
+def update_user(**entry):
+    update = {"method": "put", "action": "updateUser", "request": {"type": "object", "properties": {"name": "string"}}}
+    return feature(**{**update, **entry})
+
+
+def test_mutations_invalidate_resources_with_a_cached_get(tmp_path):
+    # The mutation comes first; its override waits for the cached GET of users
+    files = generate(tmp_path, update_user(), feature(cache={"ttlSeconds": 30}))
+    caching = files[CACHING]
+    assert 'private val getUserByIdCache = cache<UserModel>("users", ttlMillis = 30000L' in caching
+    assert 'if (result is State.Success) invalidate("users")' in caching
+    assert caching.index("override suspend fun updateUser") < caching.index("override suspend fun getUserById")
+
+
+def test_mutations_of_uncached_resources_are_not_overridden(tmp_path):
+    orders = dict(endpoint="/orders/{orderId}", action="updateOrder")
+    files = generate(tmp_path, feature(cache=True), update_user(**orders))
+    assert "updateOrder" not in files[CACHING]
+
+
+def test_contracts_without_cached_gets_get_no_caching_repository(tmp_path):
+    assert CACHING not in generate(tmp_path, feature(), update_user())
+
+
+def test_invalidates_false_opts_a_mutation_out(tmp_path):
+    files = generate(tmp_path, feature(cache=True), update_user(invalidates=False))
+    assert "updateUser" not in files[CACHING]
+
+
+@pytest.mark.parametrize("invalidates", [True, False])
+def test_invalidates_is_rejected_on_gets(invalidates):
+    with pytest.raises(ValueError, match="invalidates is only supported"):
+        compile_features(feature(invalidates=invalidates))
+
+
+def test_cache_is_rejected_on_mutations_and_unknown_key_params():
+    with pytest.raises(ValueError, match="only supported on GET"):
+        compile_features(update_user(cache=True))
+    with pytest.raises(ValueError, match="keyParams"):
+        compile_features(feature(cache={"keyParams": ["missing"]}))
+
+
+COALESCING = os.path.join("datasources", "UserCoalescingRemoteDataSource.kt")
+
+
+def test_flagged_gets_share_in_flight_calls(tmp_path):
+    entry = feature(coalesce=True, queryParams=[{"name": "expand", "type": "boolean"}])
+    files = generate(tmp_path, entry, list_feature())
+    coalescing = files[COALESCING]
+    assert ('coalesce(listOf<Any?>("getUserById", userId, expand)) { delegate.getUserById(userId, expand) }'
+            in coalescing)
+    # Only flagged endpoints are decorated, the rest go straight to the delegate
+    assert "getUsers" not in coalescing
+
+
+def test_contracts_without_coalesced_gets_get_no_coalescing_datasource(tmp_path):
+    assert COALESCING not in generate(tmp_path, feature())
+
+
+def test_coalesce_is_rejected_on_mutations():
+    with pytest.raises(ValueError, match="coalesce is only supported on GET"):
+        compile_features(update_user(coalesce=True))
+
+
+DATASOURCE = os.path.join("datasources", "UserRemoteDataSourceImpl.kt")
+
+
+def order(**entry):
+    return feature(endpoint="/orders/{orderId}", action="getOrder", **entry)
+
+
+def test_gets_by_id_fan_out_by_default(tmp_path):
+    files = generate(tmp_path, feature(), fanout_concurrency=8)
+    assert ("UserFanOut.map(userIds, concurrency = 8) { userId -> getUserById(userId) }" in files[DATASOURCE])
+    assert os.path.join("datasources", "UserFanOut.kt") in files
+
+
+def test_batch_block_names_a_bulk_endpoint(tmp_path):
+    files = generate(tmp_path, order(batch={"bulkEndpoint": "/orders/bulk", "bulkMethod": "POST", "idsParam": "orderIds"}))
+    datasource = files[DATASOURCE]
+    assert "override suspend fun getOrderBatch(orderIds: List<String>)" in datasource
+    assert "path = UserApiEndPoint.POST_ORDERS_BULK" in datasource
+    assert 'body = mapOf("orderIds" to orderIds)' in datasource
+    # Bulk endpoints need no fan-out helper
+    assert os.path.join("datasources", "UserFanOut.kt") not in files
+
+
+def test_batch_false_and_other_endpoints_get_no_batch_variant():
+    features = compile_features(feature(batch=False), list_feature(),
+                                feature(endpoint="/users/{userId}/orders/{orderId}", action="getUserOrder"))
+    assert [entry.batch for entry in features] == [None, None, None]
+
+
+@pytest.mark.parametrize("batch, message", [
+    ({"concurrency": 0}, "concurrency of getOrder must be a positive integer"),
+    ({"concurrency": "4"}, "concurrency of getOrder must be a positive integer"),
+    ({"concurrency": True}, "concurrency of getOrder must be a positive integer"),
+    ({"bulkEndpoint": "/orders/bulk", "bulkMethod": "put"}, "bulkMethod of getOrder must be get or post"),
+    ({"bulkEndpoint": "/orders/bulk", "idsParam": "order ids"}, "idsParam of getOrder must be an identifier"),
+    ({"bulkEndpoint": "/orders/bulk", "idsParam": 3}, "idsParam of getOrder must be an identifier"),
+])
+def test_invalid_batch_blocks_are_errors(batch, message):
+    with pytest.raises(ValueError, match=message):
+        compile_features(order(batch=batch))
+
+
+HTTP_CLIENT = os.path.join("network", "UserHttpClient.kt")
+
+
+def test_network_block_is_merged_over_the_command_line_and_defaults():
+    network = parse_network({"poolSize": 8}, {"poolSize": 2, "keepAliveSeconds": 60})
+    assert (network.pool_size, network.keep_alive_seconds, network.max_requests) == (8, 60, 64)
+    assert parse_network(None, None) is None
+    assert parse_network(False, {"poolSize": 2}) is None
+    assert parse_network(None, {}).pool_size == 5
+
+
+@pytest.mark.parametrize("config, message", [
+    ({"poolSize": 0}, "poolSize must be a positive integer"),
+    ({"poolSize": True}, "poolSize must be a positive integer"),
+    ({"http2": "yes"}, "http2 must be true or false"),
+    ({"retries": 3}, "Unknown network settings: retries"),
+])
+def test_invalid_network_settings_are_errors(config, message):
+    with pytest.raises(ValueError, match=message):
+        parse_network(config)
+
+
+def test_network_module_is_generated_on_request(tmp_path):
+    assert HTTP_CLIENT not in generate(tmp_path / "plain", feature())
+    files = generate(tmp_path / "tuned", feature(), network={"compression": False, "http2": False})
+    client = files[HTTP_CLIENT]
+    assert "connectionPool(ConnectionPool(5, 300, TimeUnit.SECONDS))" in client
+    assert "ContentEncoding" not in client
+    assert "Protocol.HTTP_2" not in client
+    assert "val userNetworkModule" in files[os.path.join("di", "UserNetworkModule.kt")]
+
+
+CONDITIONAL = os.path.join("datasources", "UserConditionalRemoteDataSource.kt")
+VALIDATOR_STORE = os.path.join("datasources", "UserValidatorStore.kt")
+
+
+def test_conditional_gets_revalidate_through_the_store(tmp_path):
+    files = generate(tmp_path, feature(conditional=True, queryParams=[{"name": "expand", "type": "boolean"}]),
+                     list_feature())
+    conditional = files[CONDITIONAL]
+    assert 'key = listOf<Any?>("getUserById", userId, expand).toString()' in conditional
+    assert 'path = UserApiEndPoint.GET_USERS_USERID.replace("{userId}", userId.encodeURLPathPart())' in conditional
+    assert 'query = mapOf("expand" to expand)' in conditional
+    assert "getUsers" not in conditional
+    assert "private val maxEntries: Int = 100" in files[VALIDATOR_STORE]
+
+
+def test_failed_conditional_gets_use_the_given_error_mapping(tmp_path):
+    conditional = generate(tmp_path, feature(conditional=True))[CONDITIONAL]
+    assert "private val mapError: suspend (HttpResponse) -> ApiResponse<*>," in conditional
+    assert "else -> mapError(response) as ApiResponse<T>" in conditional
+    # No exception type of the app is assumed
+    assert "HttpException(" not in conditional.replace("HttpException(...)", "")
+    assert "import com.example.api.network.HttpException" not in conditional
+
+
+def test_contracts_without_conditional_gets_get_no_validator_store(tmp_path):
+    files = generate(tmp_path, feature())
+    assert CONDITIONAL not in files and VALIDATOR_STORE not in files
+
+
+def test_conditional_is_rejected_on_mutations():
+    with pytest.raises(ValueError, match="conditional is only supported on GET"):
+        compile_features(update_user(conditional=True))
@@ -0,0 +1,59 @@
+import os
+
+import pytest
+
+from api_spec import iter_features, load_spec, prune_spec_cache
+
+CONTRACT = """
+network: {poolSize: 4}
+features:
+  - {endpoint: /users, method: get, action: getUsers}
+  - {endpoint: /users, method: post, action: createUser}
+"""
+
+
+def cached_parses(cache_dir):
+    return sorted(name for name in os.listdir(cache_dir) if name.endswith(".pickle"))
+
+
+def test_identical_content_is_parsed_once(tmp_path):
+    first = load_spec(CONTRACT, str(tmp_path))
+    assert len(cached_parses(tmp_path)) == 1
+    again = load_spec(CONTRACT, str(tmp_path))
+    assert again == first
+    assert len(cached_parses(tmp_path)) == 1
+
+
+def test_an_unreadable_cache_entry_is_parsed_again(tmp_path):
+    load_spec(CONTRACT, str(tmp_path))
+    [name] = cached_parses(tmp_path)
+    (tmp_path / name).write_bytes(b"not a pickle")
+    assert load_spec(CONTRACT, str(tmp_path))["features"][0]["action"] == "getUsers"
+
+
+def test_prune_keeps_the_most_recently_used_parses(tmp_path):
+    for i in range(4):
+        path = tmp_path / f"{i}.pickle"
+        path.write_bytes(b"")
+        os.utime(path, ns=(i * 10**9, i * 10**9))
+    (tmp_path / "notes.txt").write_text("kept")
+
+    prune_spec_cache(str(tmp_path), max_entries=2)
+    assert cached_parses(tmp_path) == ["2.pickle", "3.pickle"]
+    assert (tmp_path / "notes.txt").exists()
+
+
+def test_contract_must_be_a_mapping():
+    with pytest.raises(ValueError, match="mapping"):
+        load_spec("- just\n- a list\n")
+    with pytest.raises(ValueError, match="mapping"):
+        load_spec("")
+
+
+def test_features_stream_with_their_settings(tmp_path):
+    path = tmp_path / "user.yaml"
+    path.write_text(CONTRACT)
+    settings = {}
+    actions = [feature["action"] for feature in iter_features(str(path), settings)]
+    assert actions == ["getUsers", "createUser"]
+    assert settings == {"network": {"poolSize": 4}}
@@ -0,0 +1,119 @@
+import os
+
+import pytest
+
+from api_generator import KotlinCodeGenerator
+from api_ir import GeneratorOptions
+from api_streaming import StreamingKotlinCodeGenerator
+
+TEST_DIR = os.path.dirname(os.path.abspath(__file__))
+CONTRACT = os.path.join(TEST_DIR, "api_contract.yaml")
+
+
+def read_tree(root):
+    """Relative path -> content of every generated Kotlin file under root"""
+    files = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            if name.endswith(".kt"):
+                path = os.path.join(directory, name)
+                with open(path, "r") as f:
+                    files[os.path.relpath(path, root)] = f.read()
+    return files
+
+
+def leftovers(root):
+    """Temporary section files left anywhere under root"""
+    return [name for _, _, names in os.walk(root) for name in names if name.endswith(".tmp")]
+
+
+@pytest.mark.parametrize("options", [
+    {"reproducible": True},
+    {"reproducible": True, "compact": True},
+    {"provenance": True, "network": {}},
+])
+def test_streaming_output_matches_in_memory_output(tmp_path, options):
+    with open(CONTRACT, "r") as f:
+        yaml_content = f.read()
+    KotlinCodeGenerator(yaml_content, "User", options=GeneratorOptions(**options)).generate_all(str(tmp_path / "memory"))
+    StreamingKotlinCodeGenerator(CONTRACT, "User", options=GeneratorOptions(**options)).generate_all(str(tmp_path / "stream"))
+
+    in_memory = read_tree(tmp_path / "memory")
+    streamed = read_tree(tmp_path / "stream")
+    assert sorted(streamed) == sorted(in_memory)
+    for rel_path, content in in_memory.items():
+        assert streamed[rel_path] == content, rel_path
+
+
+def test_streaming_run_skips_files_of_the_in_memory_run(tmp_path):
+    with open(CONTRACT, "r") as f:
+        yaml_content = f.read()
+    options = GeneratorOptions(reproducible=True)
+    first = KotlinCodeGenerator(yaml_content, "User", options=options).generate_all(str(tmp_path))["changes"]
+
+    changes = StreamingKotlinCodeGenerator(CONTRACT, "User", options=options).generate_all(str(tmp_path))["changes"]
+    assert not changes["changed"] and not changes["removed"]
+    assert sorted(changes["skipped"]) == sorted(first["added"])
+
+
+def test_jsonl_contract_streams_like_yaml(tmp_path):
+    features = [
+        '{"endpoint": "/users", "method": "get", "action": "getUsers", "response": {"type": "object", "properties": {"id": "string"}}}',
+        '{"endpoint": "/users", "method": "post", "action": "createUser", "request": {"type": "object", "properties": {"name": "string"}}}',
+    ]
+    jsonl = tmp_path / "user.jsonl"
+    jsonl.write_text("\n".join(features) + "\n")
+    yaml_contract = tmp_path / "user.yaml"
+    yaml_contract.write_text("features:\n" + "".join(f"  - {feature}\n" for feature in features))
+    options = GeneratorOptions(reproducible=True)
+    StreamingKotlinCodeGenerator(str(jsonl), "User", options=options).generate_all(str(tmp_path / "jsonl"))
+    StreamingKotlinCodeGenerator(str(yaml_contract), "User", options=options).generate_all(str(tmp_path / "yaml"))
+    assert read_tree(tmp_path / "jsonl") == read_tree(tmp_path / "yaml")
+
+
+def test_failed_run_leaves_no_partial_files(tmp_path):
+    contract = tmp_path / "user.yaml"
+    contract.write_text("features:\n  - {endpoint: /users, method: get, action: getUsers}\n  - {method: get, action: broken}\n")
+    with pytest.raises(KeyError):
+        StreamingKotlinCodeGenerator(str(contract), "User").generate_all(str(tmp_path / "out"))
+    assert leftovers(tmp_path / "out") == []
+    assert not (tmp_path / "out" / "UserApiEndPoint.kt").exists()
+
+
+def test_invalidations_before_their_cached_get_stream_like_in_memory(tmp_path):
+    contract = tmp_path / "user.yaml"
+    contract.write_text("""
+features:
+  - {endpoint: "/users/{userId}", method: put, action: updateUser, request: {type: object, properties: {name: string}}}
+  - {endpoint: "/orders/{orderId}", method: delete, action: deleteOrder}
+  - {endpoint: "/users/{userId}", method: get, action: getUserById, cache: true,
+     response: {type: object, properties: {id: string}}}
+""")
+    options = GeneratorOptions(reproducible=True)
+    KotlinCodeGenerator(contract.read_text(), "User", options=options).generate_all(str(tmp_path / "memory"))
+    StreamingKotlinCodeGenerator(str(contract), "User", options=options).generate_all(str(tmp_path / "stream"))
+    assert read_tree(tmp_path / "stream") == read_tree(tmp_path / "memory")
+    caching = read_tree(tmp_path / "stream")[os.path.join("repositories", "UserCachingRepository.kt")]
+    assert "updateUser" in caching and "deleteOrder" not in caching
+
+
+@pytest.mark.parametrize("network", ["{poolSize: 0}", "{unknownSetting: 1}"])
+def test_invalid_network_block_leaves_no_partial_files(tmp_path, network):
+    # The block comes after the features, when every section is already open
+    contract = tmp_path / "user.yaml"
+    contract.write_text(f"features:\n  - {{endpoint: /users, method: get, action: getUsers}}\nnetwork: {network}\n")
+    with pytest.raises(ValueError, match="network"):
+        StreamingKotlinCodeGenerator(str(contract), "User").generate_all(str(tmp_path / "out"))
+    assert leftovers(tmp_path / "out") == []
+
+
+def test_network_module_streams_like_in_memory(tmp_path):
+    contract = tmp_path / "user.yaml"
+    contract.write_text("features:\n  - {endpoint: /users, method: get, action: getUsers}\n"
+                        "network: {poolSize: 8, http2: false}\n")
+    options = GeneratorOptions(reproducible=True)
+    KotlinCodeGenerator(contract.read_text(), "User", options=options).generate_all(str(tmp_path / "memory"))
+    StreamingKotlinCodeGenerator(str(contract), "User", options=options).generate_all(str(tmp_path / "stream"))
+    streamed = read_tree(tmp_path / "stream")
+    assert streamed == read_tree(tmp_path / "memory")
+    assert "connectionPool(ConnectionPool(8, " in streamed[os.path.join("network", "UserHttpClient.kt")]
@@ -0,0 +1,76 @@
+import http.client
+import json
+import threading
+
+import pytest
+
+from codegen_server import CodegenService, make_server
+
+CONTRACT = """
+features:
+  - {endpoint: /users, method: get, action: getUsers, response: {type: object, properties: {id: string}}}
+"""
+
+
+@pytest.fixture
+def server():
+    service = CodegenService(cache_dir=None)
+    server = make_server(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def request(server, method, path, body=None, headers=None):
+    """Send a request and return (status, decoded JSON body)"""
+    connection = http.client.HTTPConnection("127.0.0.1", server.server_address[1], timeout=10)
+    headers = {"Content-Type": "application/json", **(headers or {})}
+    try:
+        connection.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = connection.getresponse()
+        return response.status, json.loads(response.read())
+    finally:
+        connection.close()
+
+
+def test_generate_and_status(server, tmp_path):
+    contract = tmp_path / "user.yaml"
+    contract.write_text(CONTRACT)
+    body = {"contract": str(contract), "feature": "User", "output": str(tmp_path / "out"), "reproducible": True}
+    status, result = request(server, "POST", "/generate", body)
+    assert status == 200
+    assert result["changes"]["added"]
+
+    status, result = request(server, "POST", "/generate", body)
+    assert status == 200 and not result["changes"]["added"] and result["changes"]["skipped"]
+    status, result = request(server, "GET", "/status")
+    assert status == 200 and result["requests"] == 2 and result["sessions"] == 1
+
+
+def test_cross_origin_and_foreign_host_requests_are_refused(server):
+    assert request(server, "GET", "/status", headers={"Origin": "https://example.com"})[0] == 403
+    assert request(server, "GET", "/status", headers={"Host": "attacker.example:8765"})[0] == 403
+    assert request(server, "GET", "/status", headers={"Host": f"localhost:{server.server_address[1]}"})[0] == 200
+
+
+def test_post_bodies_must_be_json_objects_naming_a_contract(server):
+    assert request(server, "POST", "/generate", {}, {"Content-Type": "text/plain"})[0] == 415
+    status, result = request(server, "POST", "/generate", {"feature": "User"})
+    assert status == 400 and "contract" in result["error"]
+
+
+def test_contract_errors_are_reported(server, tmp_path):
+    status, result = request(server, "POST", "/generate", {"contract": str(tmp_path / "missing.yaml"), "feature": "User"})
+    assert status == 500
+    assert result["error"].startswith("FileNotFoundError")
+
+
+def test_unexpected_errors_are_reported_too(server, monkeypatch):
+    def generate(self, body):
+        raise RuntimeError("generator bug")
+    monkeypatch.setattr(CodegenService, "generate", generate)
+    status, result = request(server, "POST", "/generate", {"contract": "user.yaml", "feature": "User"})
+    assert status == 500
+    assert result == {"error": "RuntimeError: generator bug"}
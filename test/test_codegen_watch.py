@@ -0,0 +1,67 @@
+import pytest
+import yaml
+
+from api_generator import KotlinCodeGenerator
+from api_ir import GeneratorOptions
+from codegen_watch import InotifyWatcher, PollingWatcher
+
+CONTRACT = """
+features:
+  - {endpoint: /users, method: get, action: getUsers, response: {type: object, properties: {id: string}}}
+  - {endpoint: /users, method: post, action: createUser, response: {type: object, properties: {id: string}}}
+"""
+
+EDITED = """
+features:
+  - {endpoint: /users, method: get, action: getUsers, response: {type: object, properties: {id: string, name: string}}}
+  - {endpoint: "/users/{userId}", method: delete, action: deleteUser}
+"""
+
+
+def test_polling_watcher_reports_changed_files(tmp_path):
+    watched, other = tmp_path / "user.yaml", tmp_path / "order.yaml"
+    watched.write_text("a")
+    other.write_text("a")
+    watcher = PollingWatcher([str(watched), str(other)], interval=0.01)
+    assert watcher.wait(timeout=0) == []
+
+    watched.write_text("a longer edit")
+    assert watcher.wait(timeout=1) == [str(watched)]
+    assert watcher.wait(timeout=0) == []
+
+
+def test_inotify_watcher_sees_saves_by_rename(tmp_path):
+    watched = tmp_path / "user.yaml"
+    watched.write_text("a")
+    try:
+        watcher = InotifyWatcher([str(watched)], debounce=0.01)
+    except (OSError, AttributeError, TypeError):
+        pytest.skip("inotify is not available")
+    try:
+        (tmp_path / "unrelated.yaml").write_text("b")
+        assert watcher.wait(timeout=0.1) == []
+        # Editors often write a temporary file and rename it over the original
+        (tmp_path / "user.yaml.swp").write_text("edited")
+        (tmp_path / "user.yaml.swp").rename(watched)
+        assert watcher.wait(timeout=1) == [str(watched)]
+    finally:
+        watcher.close()
+
+
+def test_reload_reports_feature_changes(tmp_path):
+    generator = KotlinCodeGenerator(CONTRACT, "User", options=GeneratorOptions(reproducible=True))
+    features = generator.reload(EDITED)
+    assert features == {"added": ["deleteUser"], "changed": ["getUsers"], "removed": ["createUser"]}
+
+
+def test_invalid_edit_keeps_the_last_good_contract(tmp_path):
+    generator = KotlinCodeGenerator(CONTRACT, "User", options=GeneratorOptions(reproducible=True))
+    generator.generate_all(str(tmp_path))
+    with pytest.raises(yaml.YAMLError):
+        generator.reload("features: [")
+    with pytest.raises(ValueError):
+        generator.reload("features:\n  - {endpoint: /users, method: get, action: getUsers}\nnetwork: {poolSize: -1}\n")
+
+    assert [feature.action for feature in generator.ir.features] == ["getUsers", "createUser"]
+    changes = generator.generate_all(str(tmp_path))["changes"]
+    assert not changes["added"] and not changes["changed"] and not changes["removed"]
@@ -0,0 +1,51 @@
+import re
+
+import pytest
+
+import codegen
+
+data_layer = codegen.load_command("retrofit")
+
+
+def generate(yaml_content, output_dir):
+    generator = data_layer.KotlinCodeGenerator(yaml_content, reproducible=True)
+    generator.generate_all(str(output_dir))
+    return generator
+
+
+def referenced_dtos(output_dir):
+    """DTO names used by the generated endpoint interfaces"""
+    content = "".join(path.read_text() for path in (output_dir / "endpoints").iterdir())
+    return set(re.findall(r"\b(?:Get|Post|Put|Patch|Delete)\w*(?:Response|Request|Item)\b", content))
+
+
+def test_example_contract_defines_every_dto_it_uses(tmp_path):
+    generate(data_layer.EXAMPLE_CONTRACT, tmp_path)
+    defined = {path.stem for path in (tmp_path / "dtos").iterdir()}
+    assert "GetUsersItem" in referenced_dtos(tmp_path)
+    assert referenced_dtos(tmp_path) <= defined
+
+
+def test_scalar_items_need_no_dto(tmp_path):
+    generate("""
+features:
+  - endpoint: /tags
+    method: get
+    response: {type: array, items: {type: string}}
+""", tmp_path)
+    assert "): List<String>" in (tmp_path / "endpoints" / "TagsEndpoints.kt").read_text()
+    assert not (tmp_path / "dtos").exists() or not list((tmp_path / "dtos").iterdir())
+
+
+def test_items_of_different_shapes_are_an_error():
+    with pytest.raises(ValueError, match="different shapes"):
+        data_layer.KotlinCodeGenerator("""
+features:
+  - endpoint: /users
+    method: get
+    response:
+      type: array
+      items:
+        - {type: object, properties: {id: string}}
+        - {type: object, properties: {name: string}}
+""")
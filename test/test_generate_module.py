@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+import codegen
+from kotlin_templates import TemplateRegistry
+
+generate_module = codegen.load_command("module")
+
+
+def test_plan_renders_from_the_given_registry(tmp_path):
+    (tmp_path / "data_build_gradle.tmpl").write_text("// data of ${module_name}\n")
+    registry = TemplateRegistry(generate_module.TEMPLATES, str(tmp_path))
+    _, files = generate_module.plan_module("feature_login", "com.yourpay", ("data", "domain"), registry)
+    assert files["data/build.gradle.kts"] == "// data of feature_login\n"
+    assert files["domain/build.gradle.kts"] == generate_module.templates.render("domain_build_gradle",
+                                                                                 module_name="feature_login")
+
+
+def test_templates_option_leaves_the_built_in_registry_alone(tmp_path):
+    overrides = tmp_path / "templates"
+    overrides.mkdir()
+    (overrides / "data_build_gradle.tmpl").write_text("// overridden\n")
+    built_in = generate_module.templates
+
+    generate_module.main(["feature_login", "com.yourpay", "--path", str(tmp_path / "out"), "--layers", "data",
+                          "--templates", str(overrides)])
+    assert (tmp_path / "out" / "feature_login" / "data" / "build.gradle.kts").read_text() == "// overridden\n"
+    assert generate_module.templates is built_in
+    _, files = generate_module.plan_module("feature_login", "com.yourpay", ("data",))
+    assert files["data/build.gradle.kts"] != "// overridden\n"
+
+
+def write_manifest(tmp_path, manifest):
+    path = tmp_path / "modules.json"
+    path.write_text(json.dumps(manifest))
+    return str(path)
+
+
+def test_manifest_modules_inherit_the_default_package(tmp_path):
+    path = write_manifest(tmp_path, {"package": "com.yourpay", "modules": [
+        "feature_login", {"name": "feature_card", "package": "com.cards", "layers": ["data", "domain"]}]})
+    assert generate_module.load_manifest(path) == [
+        {"name": "feature_login", "package": "com.yourpay", "layers": list(generate_module.LAYERS)},
+        {"name": "feature_card", "package": "com.cards", "layers": ["data", "domain"]},
+    ]
+
+
+@pytest.mark.parametrize("modules, message", [
+    (["feature_login"], "needs a name and a package"),
+    ([{"name": "feature_login", "package": "com.yourpay", "layers": ["ui"]}], "unknown layers"),
+    ([{"name": "features/login", "package": "com.yourpay"}], "single Gradle project name"),
+    ([{"name": "..", "package": "com.yourpay"}], "single Gradle project name"),
+])
+def test_invalid_manifest_entries_are_errors(tmp_path, modules, message):
+    with pytest.raises(ValueError, match=message):
+        generate_module.load_manifest(write_manifest(tmp_path, modules))
+
+
+def test_modules_are_created_and_included_once(tmp_path):
+    settings = tmp_path / "settings.gradle.kts"
+    settings.write_text('include(":app")')
+    modules = [{"name": "feature_login", "package": "com.yourpay", "layers": ["data", "domain"]}]
+
+    summary = generate_module.create_kmp_modules(modules, str(tmp_path / "features"), str(settings))
+    assert summary["includes"] == [":features:feature_login:data", ":features:feature_login:domain"]
+    build = tmp_path / "features" / "feature_login" / "data" / "build.gradle.kts"
+    assert 'project(":features:feature_login:domain")' in build.read_text()
+    assert (tmp_path / "features" / "feature_login" / "domain" / "src" / "commonMain" / "kotlin" / "com" /
+            "yourpay" / "domain" / "model").is_dir()
+
+    again = generate_module.create_kmp_modules(modules, str(tmp_path / "features"), str(settings))
+    assert again["created"] == [] and again["skipped"] == [str(tmp_path / "features" / "feature_login")]
+    assert settings.read_text().count("include(") == 3
+
+
+def test_nested_module_names_are_rejected_before_anything_is_written(tmp_path):
+    modules = [{"name": "feature_login", "package": "com.yourpay"}, {"name": "group/feature_card", "package": "com.yourpay"}]
+    with pytest.raises(ValueError, match="group/feature_card"):
+        generate_module.create_kmp_modules(modules, str(tmp_path))
+    assert list(tmp_path.iterdir()) == []
@@ -0,0 +1,119 @@
+from api_ir import ContractIR
+from kotlin_dtos import DtoTable, enum_constant, property_name
+
+
+def scalar_type(type_str):
+    return type_str.capitalize()
+
+
+def resolve(table, name, schema):
+    """Resolve a schema and return its type with the (name, properties, values) of every class defined"""
+    defined = []
+    kotlin_type = table.resolve(name, schema, scalar_type, lambda *args: defined.append(args))
+    return kotlin_type, defined
+
+
+def test_unique_name_adds_the_lowest_free_suffix():
+    table = DtoTable()
+    assert table.unique_name("UserResponse") == "UserResponse"
+    assert table.unique_name("UserResponse") == "UserResponse2"
+    assert table.unique_name("UserResponse") == "UserResponse3"
+    assert table.unique_name("UserResponse2") == "UserResponse22"
+
+
+def test_intern_aliases_repeated_shapes_only():
+    table = DtoTable()
+    shape = [("id", "String"), ("name", "String")]
+    assert table.intern("GetUserResponse", shape) == "GetUserResponse"
+    assert table.intern("UpdateUserResponse", list(shape)) == "GetUserResponse"
+    # Same properties in another order are another shape
+    assert table.intern("RenamedUserResponse", list(reversed(shape))) == "RenamedUserResponse"
+    assert table.aliases == {"UpdateUserResponse": "GetUserResponse"}
+
+
+def test_nested_objects_are_defined_before_their_parents():
+    table = DtoTable()
+    schema = {"type": "object", "properties": {"address": {"type": "object", "properties": {"city": "string"}}}}
+    kotlin_type, defined = resolve(table, "User", schema)
+    assert kotlin_type == "User"
+    assert [name for name, _, _ in defined] == ["UserAddress", "User"]
+    assert defined[1][1] == [("address", "UserAddress")]
+
+
+def test_repeated_sub_schemas_and_enums_resolve_once():
+    table = DtoTable()
+    status = {"type": "string", "enum": ["active", "inactive"]}
+    first, defined = resolve(table, "UserStatus", status)
+    again, defined_again = resolve(table, "OrderStatus", dict(status))
+    assert first == again == "UserStatus"
+    assert [name for name, _, _ in defined] == ["UserStatus"]
+    assert defined_again == []
+
+
+def test_enum_name_taken_by_a_class_gets_a_suffix():
+    table = DtoTable()
+    table.unique_name("UserStatus")
+    kotlin_type, defined = resolve(table, "UserStatus", {"type": "string", "enum": ["on", "off"]})
+    assert kotlin_type == "UserStatus2"
+    assert defined == [("UserStatus2", [], ("on", "off"))]
+
+
+def test_contract_gives_every_endpoint_a_unique_dto_name():
+    spec = {"features": [
+        {"endpoint": "/users", "method": "get", "action": "getUser",
+         "response": {"type": "object", "properties": {"id": "string"}}},
+        {"endpoint": "/users/{userId}", "method": "get", "action": "getUser",
+         "response": {"type": "object", "properties": {"id": "string", "name": "string"}}},
+        {"endpoint": "/accounts", "method": "get", "action": "getAccount",
+         "response": {"type": "object", "properties": {"id": "string"}}},
+    ]}
+    ir = ContractIR(spec, "User")
+    names = [feature.response_type for feature in ir.features]
+    assert names == ["GetUserResponse", "GetUserResponse2", "GetAccountResponse"]
+    # The account response has the shape of the first user response and is generated as its alias
+    assert ir.dtos["GetAccountResponse"].class_name == "GetUserResponse"
+    assert ir.dtos["GetUserResponse2"].class_name == "GetUserResponse2"
+
+
+def test_shared_shapes_come_from_the_core_package():
+    shape = (("id", "String"),)
+    spec = {"features": [
+        {"endpoint": "/users", "method": "get", "action": "getUser",
+         "response": {"type": "object", "properties": {"id": "string"}}},
+    ]}
+    ir = ContractIR(spec, "User", {shape: "IdDto"})
+    dto = ir.features[0].dtos[0]
+    assert dto.shared_class == "IdDto"
+
+
+NESTED_SPEC = {"features": [{
+    "endpoint": "/users/{userId}", "method": "get", "action": "getUserById",
+    "response": {"type": "object", "properties": {
+        "id": "string",
+        "status": {"type": "string", "enum": ["active", "in-active", "2fa"]},
+        "address": {"type": "object", "properties": {"city": "string"}},
+        "tags": {"type": "array", "items": {"type": "object", "properties": {"label": "string"}}},
+    }},
+}]}
+
+
+def test_nested_schemas_become_typed_classes_in_the_contract():
+    ir = ContractIR(NESTED_SPEC, "User")
+    dtos = ir.features[0].dtos
+    assert [dto.name for dto in dtos] == [
+        "GetUserByIdResponseStatus", "GetUserByIdResponseAddress", "GetUserByIdResponseTagsItem", "GetUserByIdResponse"]
+    assert dtos[0].values == ("active", "in-active", "2fa")
+    assert dtos[-1].properties == [
+        ("id", "String"), ("status", "GetUserByIdResponseStatus"), ("address", "GetUserByIdResponseAddress"),
+        ("tags", "List<GetUserByIdResponseTagsItem>")]
+
+
+def test_enum_constants_are_valid_kotlin_names():
+    assert [enum_constant(value) for value in ("active", "in-active", "2fa", "")] == ["ACTIVE", "IN_ACTIVE", "_2FA", "EMPTY"]
+
+
+def test_property_names_are_camel_case_and_escaped_where_needed():
+    assert property_name("created_at") == "createdAt"
+    assert property_name("first-name") == "firstName"
+    assert property_name("class") == "`class`"
+    assert property_name("2fa") == "`2fa`"
@@ -0,0 +1,52 @@
+import pytest
+
+from kotlin_templates import TemplateRegistry, compile_template
+
+DEFAULTS = {
+    "dto": "data class ${name}(${fields})",
+    "price": "$$${amount}",
+}
+
+
+def test_placeholders_come_from_values_then_source():
+    registry = TemplateRegistry(DEFAULTS)
+    assert registry.render("dto", name="User", fields="val id: String") == "data class User(val id: String)"
+    assert registry.render("dto", {"name": "User", "fields": ""}, fields="val id: String") == \
+        "data class User(val id: String)"
+    assert registry.render("price", amount=3) == "$3"
+
+
+def test_missing_value_names_the_template_and_placeholder():
+    with pytest.raises(KeyError, match=r"dto needs a value for \$fields"):
+        TemplateRegistry(DEFAULTS).render("dto", name="User")
+
+
+def test_invalid_placeholder_is_reported_with_its_line():
+    with pytest.raises(ValueError, match="broken on line 2"):
+        compile_template("broken", "fine\n$ oops")
+
+
+def test_overrides_replace_known_templates_only(tmp_path):
+    (tmp_path / "dto.tmpl").write_text("class ${name}")
+    (tmp_path / "unknown.tmpl").write_text("ignored")
+    (tmp_path / "price.txt").write_text("ignored")
+    registry = TemplateRegistry(DEFAULTS, str(tmp_path))
+    assert registry.overrides == {"dto": "class ${name}"}
+    assert registry.render("dto", name="User") == "class User"
+    assert registry.render("price", amount=1) == "$1"
+
+
+def test_fingerprint_changes_with_the_overrides(tmp_path):
+    plain = TemplateRegistry(DEFAULTS).fingerprint()
+    assert TemplateRegistry(dict(DEFAULTS)).fingerprint() == plain
+    (tmp_path / "dto.tmpl").write_text("class ${name}")
+    assert TemplateRegistry(DEFAULTS, str(tmp_path)).fingerprint() != plain
+
+
+def test_compilations_are_shared_per_name_and_source():
+    first = compile_template("first", "value ${x}")
+    assert compile_template("first", "value ${x}") is first
+    second = compile_template("second", "value ${x}")
+    assert second is not first
+    with pytest.raises(KeyError, match="second needs"):
+        second.render()
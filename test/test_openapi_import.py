@@ -0,0 +1,119 @@
+import pytest
+
+from openapi_import import SchemaResolver, convert_document
+
+NAMED = {"type": "object", "required": ["name"], "properties": {"name": {"type": "string"}}}
+DOCUMENT = {
+    "openapi": "3.0.3",
+    "info": {"title": "Users", "version": "1.2.0"},
+    "paths": {
+        "/users/{userId}": {
+            "parameters": [{"$ref": "#/components/parameters/UserId"}],
+            "get": {
+                "operationId": "getUser",
+                "parameters": [{"name": "expand", "in": "query", "schema": {"type": "boolean"}}],
+                "responses": {200: {"$ref": "#/components/responses/User"}},
+            },
+        },
+    },
+    "components": {
+        "parameters": {"UserId": {"name": "userId", "in": "path", "required": True, "schema": {"type": "string"}}},
+        "responses": {
+            "User": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/User"}}}},
+        },
+        "schemas": {
+            "Named": NAMED,
+            "User": {
+                "allOf": [
+                    {"$ref": "#/components/schemas/Named"},
+                    {"type": "object", "required": ["id"], "properties": {
+                        "id": {"type": "string"},
+                        "status": {"type": "string", "enum": ["active", "blocked", None]},
+                        "manager": {"$ref": "#/components/schemas/User"},
+                        "friends": {"type": "array", "items": {"$ref": "#/components/schemas/User"}},
+                    }},
+                ],
+            },
+            "Loop": {"$ref": "#/components/schemas/Loop"},
+        },
+    },
+}
+
+
+def test_ref_is_followed_and_resolved_once():
+    resolver = SchemaResolver(DOCUMENT)
+    first = resolver.resolve({"$ref": "#/components/schemas/Named"})
+    again = resolver.resolve({"$ref": "#/components/schemas/Named"})
+    assert first is again is NAMED
+    assert resolver.hits == 1
+
+
+def test_all_of_merges_properties_and_required():
+    resolver = SchemaResolver(DOCUMENT)
+    user = resolver.resolve({"$ref": "#/components/schemas/User"})
+    assert user["type"] == "object"
+    assert list(user["properties"]) == ["name", "id", "status", "manager", "friends"]
+    assert user["required"] == ["name", "id"]
+
+
+def test_self_reference_is_cut_where_it_repeats():
+    resolver = SchemaResolver(DOCUMENT)
+    user = resolver.property_schema({"$ref": "#/components/schemas/User"})
+    properties = user["properties"]
+    assert properties["name"] == "string"
+    assert properties["status"] == {"type": "string", "enum": ["active", "blocked"]}
+    assert properties["manager"] == "object"
+    assert properties["friends"] == {"type": "array", "items": "object"}
+
+
+def test_circular_ref_chain_is_an_error():
+    resolver = SchemaResolver(DOCUMENT)
+    with pytest.raises(ValueError, match="Circular"):
+        resolver.resolve({"$ref": "#/components/schemas/Loop"})
+
+
+def test_unresolvable_and_remote_refs_are_errors():
+    resolver = SchemaResolver(DOCUMENT)
+    with pytest.raises(ValueError, match="Unresolvable"):
+        resolver.resolve({"$ref": "#/components/schemas/Missing"})
+    with pytest.raises(ValueError, match="local"):
+        resolver.resolve({"$ref": "other.yaml#/components/schemas/User"})
+
+
+def test_document_becomes_a_contract():
+    contract, _ = convert_document(DOCUMENT)
+    assert contract["version"] == "1.2.0"
+    assert contract["description"] == "Users"
+    [feature] = contract["features"]
+    assert feature["endpoint"] == "/users/{userId}"
+    assert feature["action"] == "getUser"
+    assert feature["queryParams"] == [{"name": "expand", "type": "boolean", "required": False}]
+    assert feature["response"]["type"] == "object"
+    assert list(feature["response"]["properties"]) == ["name", "id", "status", "manager", "friends"]
+
+
+def test_cut_results_are_not_reused_out_of_context():
+    document = {"components": {"schemas": {
+        "Author": {"type": "object", "properties": {"name": {"type": "string"},
+                                                    "book": {"$ref": "#/components/schemas/Book"}}},
+        "Book": {"type": "object", "properties": {"title": {"type": "string"},
+                                                  "author": {"$ref": "#/components/schemas/Author"}}},
+    }}}
+    resolver = SchemaResolver(document)
+    author = resolver.property_schema({"$ref": "#/components/schemas/Author"})
+    # Inside Author, Book's author is where the cycle is cut
+    assert author["properties"]["book"]["properties"]["author"] == "object"
+
+    book = resolver.property_schema({"$ref": "#/components/schemas/Book"})
+    # On its own, Book is not the cut version converted inside Author: its author is expanded
+    assert book["properties"]["author"]["properties"]["name"] == "string"
+    assert resolver.property_schema({"$ref": "#/components/schemas/Book"}) is book
+
+
+@pytest.mark.parametrize("schema", [{"type": "array", "items": {"type": "string"}}, {"type": "object"}])
+def test_list_and_object_query_params_are_errors(schema):
+    document = {"openapi": "3.0.3", "paths": {"/users": {"get": {
+        "operationId": "getUsers", "parameters": [{"name": "ids", "in": "query", "schema": schema}],
+    }}}}
+    with pytest.raises(ValueError, match="Query parameter ids of GET /users"):
+        convert_document(document)